@@ -43,6 +43,61 @@ CREATE INDEX IF NOT EXISTS idx_transactions_source_file ON transactions(source_f
 CREATE INDEX IF NOT EXISTS idx_transactions_confidence ON transactions(confidence);
 CREATE INDEX IF NOT EXISTS idx_transactions_updated_at ON transactions(updated_at);
 
+-- Income statement expense bucket (see migrations/add_transactions_expense_bucket.sql)
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS expense_bucket VARCHAR(8) GENERATED ALWAYS AS (
+    CASE WHEN amount < 0 THEN
+        CASE
+            WHEN LOWER(COALESCE(accounting_category, '')) LIKE '%material%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%inventory%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%manufacturing%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%production%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%supplier%' THEN 'cogs'
+            ELSE 'opex'
+        END
+    END
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_expense_bucket
+ON transactions(expense_bucket) INCLUDE (usd_equivalent, amount)
+WHERE expense_bucket IS NOT NULL;
+
+-- Balance sheet buckets (see migrations/add_transactions_balance_buckets.sql)
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS asset_bucket VARCHAR(32) GENERATED ALWAYS AS (
+    CASE
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%cash%' THEN 'cash'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%receivable%' THEN 'receivable'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%inventory%' THEN 'inventory'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%equipment%' THEN 'equipment'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%asset%' THEN 'other_asset'
+        WHEN amount > 0 AND LOWER(COALESCE(description, '')) LIKE '%deposit%' THEN 'current_asset'
+    END
+) STORED;
+
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS liability_bucket VARCHAR(32) GENERATED ALWAYS AS (
+    CASE WHEN amount < 0 THEN
+        CASE
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%payable%' THEN 'payable'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%loan%' THEN 'loan'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%debt%' THEN 'debt'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%liability%' THEN 'other_liability'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%tax%' THEN 'tax'
+            WHEN LOWER(COALESCE(description, '')) LIKE '%payment%' THEN 'current_liability'
+        END
+    END
+) STORED;
+
+-- Partial covering indexes: only classified rows, with the summed columns included
+CREATE INDEX IF NOT EXISTS idx_transactions_asset_bucket
+ON transactions(asset_bucket) INCLUDE (usd_equivalent, amount)
+WHERE asset_bucket IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_liability_bucket
+ON transactions(liability_bucket) INCLUDE (usd_equivalent, amount)
+WHERE liability_bucket IS NOT NULL;
+
 -- ===============================================
 -- INVOICES TABLE
 -- ===============================================
@@ -86,6 +141,18 @@ CREATE INDEX IF NOT EXISTS idx_invoices_status ON invoices(payment_status);
 CREATE INDEX IF NOT EXISTS idx_invoices_linked_tx ON invoices(linked_transaction_id);
 CREATE INDEX IF NOT EXISTS idx_invoices_updated_at ON invoices(updated_at);
 
+-- Numeric invoice total (see migrations/add_invoices_total_amount_num.sql)
+ALTER TABLE invoices
+ADD COLUMN IF NOT EXISTS total_amount_num NUMERIC GENERATED ALWAYS AS (
+    CASE
+        WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$' THEN total_amount::text::numeric
+    END
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_invoices_date_total_amount_num
+ON invoices(date, total_amount_num)
+WHERE total_amount_num IS NOT NULL;
+
 -- ===============================================
 -- INVOICE EMAIL LOG TABLE
 -- ===============================================
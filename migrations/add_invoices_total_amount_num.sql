@@ -0,0 +1,19 @@
+-- Migration: Numeric invoice total
+-- Description: Validates invoices.total_amount once, when the row is written,
+--              into a generated numeric column. The charts, monthly P&L and
+--              financial-ratios invoice queries then read total_amount_num
+--              instead of running a regex over total_amount::text on every
+--              row of every request. Values that are not plain non-negative
+--              numbers (including NaN and '') are left NULL.
+-- Date: 2026-10-18
+
+ALTER TABLE invoices
+ADD COLUMN IF NOT EXISTS total_amount_num NUMERIC GENERATED ALWAYS AS (
+    CASE
+        WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$' THEN total_amount::text::numeric
+    END
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_invoices_date_total_amount_num
+ON invoices(date, total_amount_num)
+WHERE total_amount_num IS NOT NULL;
@@ -0,0 +1,42 @@
+-- Migration: Precomputed balance sheet buckets on transactions
+-- Description: Stores the asset / liability classification used by
+--              /api/reports/balance-sheet/simple as generated columns so the
+--              report groups by a short indexed column instead of evaluating
+--              LOWER(COALESCE(...)) LIKE '%...%' on every row of every request.
+--              CASE order matches the original report priority.
+-- Date: 2026-10-18
+
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS asset_bucket VARCHAR(32) GENERATED ALWAYS AS (
+    CASE
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%cash%' THEN 'cash'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%receivable%' THEN 'receivable'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%inventory%' THEN 'inventory'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%equipment%' THEN 'equipment'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%asset%' THEN 'other_asset'
+        WHEN amount > 0 AND LOWER(COALESCE(description, '')) LIKE '%deposit%' THEN 'current_asset'
+    END
+) STORED;
+
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS liability_bucket VARCHAR(32) GENERATED ALWAYS AS (
+    CASE WHEN amount < 0 THEN
+        CASE
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%payable%' THEN 'payable'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%loan%' THEN 'loan'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%debt%' THEN 'debt'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%liability%' THEN 'other_liability'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%tax%' THEN 'tax'
+            WHEN LOWER(COALESCE(description, '')) LIKE '%payment%' THEN 'current_liability'
+        END
+    END
+) STORED;
+
+-- Partial covering indexes: only classified rows, with the summed columns included
+CREATE INDEX IF NOT EXISTS idx_transactions_asset_bucket
+ON transactions(asset_bucket) INCLUDE (usd_equivalent, amount)
+WHERE asset_bucket IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_liability_bucket
+ON transactions(liability_bucket) INCLUDE (usd_equivalent, amount)
+WHERE liability_bucket IS NOT NULL;
@@ -0,0 +1,13 @@
+-- Migration: Covering index for the charts-data transaction scan
+-- Description: /api/reports/charts-data filters transactions on
+--              amount IS NOT NULL plus a date range and an optional
+--              classified_entity match, and reads only amount and
+--              accounting_category. With those columns INCLUDEd the scan
+--              can be index-only instead of a sequential scan of the table.
+--              Built CONCURRENTLY so writes are not blocked - run this file
+--              outside a transaction block.
+-- Date: 2026-10-18
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tx_date_amount_entity
+ON transactions(date, classified_entity) INCLUDE (amount, accounting_category)
+WHERE amount IS NOT NULL;
@@ -0,0 +1,11 @@
+-- Migration: Trigram index for cash-like transaction descriptions
+-- Description: Lets the cash flow report's beginning-cash lookup
+--              (LOWER(COALESCE(description, classified_entity, '')) ~ '(cash|bank|deposit)')
+--              use an index instead of a sequential scan with per-row LOWER + LIKE
+-- Date: 2026-10-18
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Expression must match the report predicate exactly for the planner to use it
+CREATE INDEX IF NOT EXISTS idx_transactions_description_trgm
+ON transactions USING gin (LOWER(COALESCE(description, classified_entity, '')) gin_trgm_ops);
@@ -0,0 +1,26 @@
+-- Migration: Precomputed expense bucket on transactions
+-- Description: Classifies outflows as cost of goods ('cogs') or operating
+--              expense ('opex') in a generated column, so the opex section of
+--              /api/reports/income-statement/simple filters on one indexed
+--              column instead of five LOWER(...) NOT LIKE '%...%' predicates
+--              per row. Inflows are left NULL.
+-- Date: 2026-10-18
+
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS expense_bucket VARCHAR(8) GENERATED ALWAYS AS (
+    CASE WHEN amount < 0 THEN
+        CASE
+            WHEN LOWER(COALESCE(accounting_category, '')) LIKE '%material%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%inventory%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%manufacturing%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%production%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%supplier%' THEN 'cogs'
+            ELSE 'opex'
+        END
+    END
+) STORED;
+
+-- Partial covering index: only outflows, with the summed columns included
+CREATE INDEX IF NOT EXISTS idx_transactions_expense_bucket
+ON transactions(expense_bucket) INCLUDE (usd_equivalent, amount)
+WHERE expense_bucket IS NOT NULL;
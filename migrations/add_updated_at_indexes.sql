@@ -0,0 +1,16 @@
+-- Migration: updated_at indexes for the report cache versions
+-- Description: Every cached report request first reads the data version,
+--              MAX(updated_at) over transactions (and, for charts-data,
+--              invoices). With a btree on updated_at each MAX is a single
+--              index seek instead of a sequential scan of the table.
+--              migration/postgresql_schema.sql already creates both;
+--              this covers databases built before it did. Built
+--              CONCURRENTLY so writes are not blocked - run this file
+--              outside a transaction block.
+-- Date: 2026-10-18
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_updated_at
+ON transactions(updated_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_invoices_updated_at
+ON invoices(updated_at);
@@ -0,0 +1,35 @@
+-- Migration: Materialized monthly P&L aggregates
+-- Description: /api/reports/monthly-pl reads whole closed months from this
+--              view instead of re-aggregating 12-36 months of transactions
+--              and invoices on every call; only the partial months at the
+--              edges of the requested range (and the current month) are
+--              scanned live. The reporting API refreshes it CONCURRENTLY
+--              every MONTHLY_PL_REFRESH_SECONDS (300s), which needs the
+--              unique index below. Until this runs the endpoint aggregates
+--              everything live, as before.
+-- Date: 2026-10-18
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS monthly_pl_mv AS
+SELECT
+    date_trunc('month', transaction_date)::date AS month_start,
+    EXTRACT(YEAR FROM transaction_date) AS year,
+    EXTRACT(MONTH FROM transaction_date) AS month_number,
+    COALESCE(SUM(amount) FILTER (WHERE amount > 0), 0) AS total_revenue,
+    COALESCE(-SUM(amount) FILTER (WHERE amount < 0), 0) AS total_expenses,
+    SUM(amount) AS net_profit,
+    COUNT(*) AS transaction_count
+FROM (
+    SELECT date::date AS transaction_date, amount
+    FROM transactions
+    WHERE amount::text != 'NaN' AND amount IS NOT NULL
+
+    UNION ALL
+
+    SELECT date::date AS transaction_date, total_amount_num::float8 AS amount
+    FROM invoices
+    WHERE total_amount_num IS NOT NULL
+) combined_data
+GROUP BY 1, 2, 3;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_monthly_pl_mv_month_start
+ON monthly_pl_mv(month_start);
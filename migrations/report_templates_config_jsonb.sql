@@ -0,0 +1,10 @@
+-- Migration: JSONB report template configs
+-- Description: report_templates tables created before template_config was
+--              declared JSONB store it as TEXT, which the templates endpoint
+--              has to json-parse on every request. Converting the column lets
+--              psycopg2 return the config as a dict. The statement is a no-op
+--              on tables that are already JSONB.
+-- Date: 2026-10-18
+
+ALTER TABLE report_templates
+ALTER COLUMN template_config TYPE JSONB USING template_config::jsonb;
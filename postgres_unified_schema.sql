@@ -209,6 +209,7 @@ CREATE INDEX IF NOT EXISTS idx_transactions_entity ON transactions(entity);
 CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
 CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions(amount);
 CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at);
+CREATE INDEX IF NOT EXISTS idx_transactions_updated_at ON transactions(updated_at);
 
 -- Crypto pricing indexes
 CREATE INDEX IF NOT EXISTS idx_crypto_historic_prices_symbol ON crypto_historic_prices(symbol);
@@ -219,6 +220,7 @@ CREATE INDEX IF NOT EXISTS idx_invoices_status ON invoices(status);
 CREATE INDEX IF NOT EXISTS idx_invoices_client_id ON invoices(client_id);
 CREATE INDEX IF NOT EXISTS idx_invoices_due_date ON invoices(due_date);
 CREATE INDEX IF NOT EXISTS idx_invoices_created_at ON invoices(created_at);
+CREATE INDEX IF NOT EXISTS idx_invoices_updated_at ON invoices(updated_at);
 CREATE INDEX IF NOT EXISTS idx_invoices_crypto_currency ON invoices(crypto_currency);
 
 CREATE INDEX IF NOT EXISTS idx_payment_transactions_invoice_id ON payment_transactions(invoice_id);
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels for the reporting endpoints
+
+Pure float arithmetic shared by the statement builders. When numba is
+installed the kernels are compiled with @njit (cached on disk, so the compile
+cost is paid once per deployment); otherwise they run as plain Python, or as
+vectorized NumPy where a per-element loop would be slow interpreted.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def dmpl_kernel(revenue, expenses):
+    """
+    Simplified DMPL equity walk
+
+    Beginning equity is estimated as 80% of current earnings.
+
+    Returns:
+        (net_income, beginning_equity, ending_equity, equity_growth_pct, roe_pct)
+    """
+    net_income = revenue - expenses
+    beginning_equity = net_income * 0.8
+    ending_equity = beginning_equity + net_income
+    if beginning_equity != 0.0:
+        equity_growth = (ending_equity - beginning_equity) / beginning_equity * 100.0
+        roe = net_income / beginning_equity * 100.0
+    else:
+        equity_growth = 0.0
+        roe = 0.0
+    return net_income, beginning_equity, ending_equity, equity_growth, roe
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def variance_kernel(current, previous):
+        """
+        Element-wise change between aligned float64 amount arrays
+
+        With no previous amount the change is 100% (0% when the current amount
+        isn't positive).
+
+        Returns:
+            (absolute, percentage) arrays
+        """
+        n = current.shape[0]
+        absolute = np.empty(n)
+        percentage = np.empty(n)
+        for i in range(n):
+            absolute[i] = current[i] - previous[i]
+            base = abs(previous[i])
+            if base != 0.0:
+                percentage[i] = absolute[i] * 100.0 / base
+            elif current[i] > 0.0:
+                percentage[i] = 100.0
+            else:
+                percentage[i] = 0.0
+        return absolute, percentage
+else:
+    def variance_kernel(current, previous):
+        """NumPy version of variance_kernel for installs without numba"""
+        absolute = current - previous
+        base = np.abs(previous)
+        percentage = np.where(current > 0, 100.0, 0.0)
+        np.divide(absolute * 100, base, out=percentage, where=base != 0)
+        return absolute, percentage
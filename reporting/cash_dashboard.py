@@ -14,10 +14,12 @@ import os
 import sys
 import logging
 import decimal
+import heapq
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict, OrderedDict
+from operator import itemgetter
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -29,6 +31,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Columns the per-entity flow ranking may be ordered by
+ENTITY_FLOW_ORDER_COLUMNS = ('total_inflows', 'total_outflows', 'net_flow', 'transaction_count')
+
+
 class CashDashboard:
     """Generates comprehensive cash position analytics for executive decision making"""
 
@@ -110,7 +116,8 @@ class CashDashboard:
                     ORDER BY date, amount DESC
                 """
 
-            transactions = self.db.execute_query(query, tuple(params), fetch_all=True)
+            # Stream the rows - every transaction up to the date is folded into running totals
+            transactions = self.db.iter_query(query, tuple(params))
 
             # Calculate cash position
             total_cash = Decimal('0')
@@ -118,9 +125,11 @@ class CashDashboard:
             cash_by_currency = defaultdict(lambda: Decimal('0'))
             inflows = Decimal('0')
             outflows = Decimal('0')
-            transaction_count = len(transactions)
+            transaction_count = 0
 
             for txn in transactions:
+                transaction_count += 1
+
                 # Safe decimal conversion with validation
                 try:
                     usd_equiv = txn.get('usd_equivalent')
@@ -210,9 +219,28 @@ class CashDashboard:
         Returns:
             Dict with daily cash positions and trend analysis
         """
+        return self.get_cash_trends_multi(windows=(days,), entity=entity)[days]
+
+    def get_cash_trends_multi(self, windows: Tuple[int, ...] = (7, 30),
+                              entity: Optional[str] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Get cash position trends for several trailing windows from one query
+
+        Daily positions are built once for the longest window; each shorter
+        window is its trailing days, so the 7 and 30-day trends share a scan.
+
+        Args:
+            windows: Window lengths in days
+            entity: Specific entity to analyze
+
+        Returns:
+            Dict mapping each window length to its trend analysis (same shape
+            as get_cash_trend)
+        """
         start_time = datetime.now()
 
         try:
+            days = max(windows)
             today = date.today()
             start_date = today - timedelta(days=days-1)  # Include today
 
@@ -259,11 +287,11 @@ class CashDashboard:
                     ORDER BY date
                 """
 
-            all_transactions = self.db.execute_query(query, tuple(params), fetch_all=True)
+            # Stream the rows - only the running total per day is kept
+            all_transactions = self.db.iter_query(query, tuple(params))
 
             # Calculate running cash position for each day
             daily_positions = OrderedDict()
-            daily_changes = []
 
             # Pre-populate all dates with zero positions
             for i in range(days):
@@ -313,68 +341,80 @@ class CashDashboard:
                 if prev_position is not None:
                     daily_change = data['cash_position'] - prev_position
                     data['daily_change'] = daily_change
-                    daily_changes.append(daily_change)
                 prev_position = data['cash_position']
 
-            # Calculate trend metrics
-            current_position = list(daily_positions.values())[-1]['cash_position']
-            starting_position = list(daily_positions.values())[0]['cash_position']
-            total_change = current_position - starting_position
-            total_change_percent = (total_change / starting_position * 100) if starting_position != 0 else 0
-
-            avg_daily_change = sum(daily_changes) / len(daily_changes) if daily_changes else 0
-
-            # Calculate burn rate (negative average for cash burn)
-            burn_rate_daily = -avg_daily_change if avg_daily_change < 0 else 0
-            burn_rate_monthly = burn_rate_daily * 30
-
-            # Calculate runway (days until cash runs out at current burn rate)
-            runway_days = None
-            if burn_rate_daily > 0 and current_position > 0:
-                runway_days = int(current_position / burn_rate_daily)
-
-            # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
-
-            trend_analysis = {
-                'period': {
-                    'days': days,
-                    'start_date': start_date.strftime('%Y-%m-%d'),
-                    'end_date': today.strftime('%Y-%m-%d')
-                },
-                'entity_filter': entity,
-
-                'current_metrics': {
-                    'current_cash_position': current_position,
-                    'starting_cash_position': starting_position,
-                    'total_change': total_change,
-                    'total_change_percent': round(total_change_percent, 2),
-                    'avg_daily_change': round(avg_daily_change, 2)
-                },
-
-                'burn_rate_analysis': {
-                    'daily_burn_rate': round(burn_rate_daily, 2),
-                    'monthly_burn_rate': round(burn_rate_monthly, 2),
-                    'runway_days': runway_days,
-                    'is_burning_cash': burn_rate_daily > 0
-                },
-
-                'daily_positions': list(daily_positions.values()),
-
-                'trend_direction': 'increasing' if avg_daily_change > 0 else 'decreasing' if avg_daily_change < 0 else 'stable',
-
-                'generated_at': datetime.now().isoformat(),
-                'generation_time_ms': generation_time_ms
-            }
-
-            logger.info(f"Cash trend calculated: {days} days, ${total_change:,.2f} change ({total_change_percent:.1f}%)")
-            return trend_analysis
+            positions = list(daily_positions.values())
+            trends = {}
+            for window in windows:
+                window_positions = [dict(position) for position in positions[-window:]]
+                window_positions[0]['daily_change'] = 0.0
+                trends[window] = self._summarize_cash_trend(window_positions, window, today, entity, start_time)
+            return trends
 
         except Exception as e:
             logger.error(f"Error calculating cash trend: {e}")
             raise
 
+    def _summarize_cash_trend(self, daily_positions: List[Dict[str, Any]], days: int, today: date,
+                              entity: Optional[str], start_time: datetime) -> Dict[str, Any]:
+        """Trend, burn rate and runway metrics for one window of daily positions"""
+        daily_changes = [data['daily_change'] for data in daily_positions[1:]]
+
+        # Calculate trend metrics
+        current_position = daily_positions[-1]['cash_position']
+        starting_position = daily_positions[0]['cash_position']
+        total_change = current_position - starting_position
+        total_change_percent = (total_change / starting_position * 100) if starting_position != 0 else 0
+
+        avg_daily_change = sum(daily_changes) / len(daily_changes) if daily_changes else 0
+
+        # Calculate burn rate (negative average for cash burn)
+        burn_rate_daily = -avg_daily_change if avg_daily_change < 0 else 0
+        burn_rate_monthly = burn_rate_daily * 30
+
+        # Calculate runway (days until cash runs out at current burn rate)
+        runway_days = None
+        if burn_rate_daily > 0 and current_position > 0:
+            runway_days = int(current_position / burn_rate_daily)
+
+        # Calculate generation time
+        end_time = datetime.now()
+        generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+
+        trend_analysis = {
+            'period': {
+                'days': days,
+                'start_date': daily_positions[0]['date'],
+                'end_date': today.strftime('%Y-%m-%d')
+            },
+            'entity_filter': entity,
+
+            'current_metrics': {
+                'current_cash_position': current_position,
+                'starting_cash_position': starting_position,
+                'total_change': total_change,
+                'total_change_percent': round(total_change_percent, 2),
+                'avg_daily_change': round(avg_daily_change, 2)
+            },
+
+            'burn_rate_analysis': {
+                'daily_burn_rate': round(burn_rate_daily, 2),
+                'monthly_burn_rate': round(burn_rate_monthly, 2),
+                'runway_days': runway_days,
+                'is_burning_cash': burn_rate_daily > 0
+            },
+
+            'daily_positions': daily_positions,
+
+            'trend_direction': 'increasing' if avg_daily_change > 0 else 'decreasing' if avg_daily_change < 0 else 'stable',
+
+            'generated_at': datetime.now().isoformat(),
+            'generation_time_ms': generation_time_ms
+        }
+
+        logger.info(f"Cash trend calculated: {days} days, ${total_change:,.2f} change ({total_change_percent:.1f}%)")
+        return trend_analysis
+
     def get_cash_flow_velocity(self, days: int = 30, entity: Optional[str] = None) -> Dict[str, Any]:
         """
         Calculate cash flow velocity metrics (how fast money moves in/out)
@@ -490,17 +530,19 @@ class CashDashboard:
             volatility = variance ** 0.5
 
             # Top flow categories
-            top_inflow_categories = sorted(
-                [(cat, float(flows['inflows'])) for cat, flows in category_flows.items()
-                 if flows['inflows'] > 0],
-                key=lambda x: x[1], reverse=True
-            )[:5]
-
-            top_outflow_categories = sorted(
-                [(cat, float(flows['outflows'])) for cat, flows in category_flows.items()
-                 if flows['outflows'] > 0],
-                key=lambda x: x[1], reverse=True
-            )[:5]
+            top_inflow_categories = heapq.nlargest(
+                5,
+                ((cat, float(flows['inflows'])) for cat, flows in category_flows.items()
+                 if flows['inflows'] > 0),
+                key=itemgetter(1)
+            )
+
+            top_outflow_categories = heapq.nlargest(
+                5,
+                ((cat, float(flows['outflows'])) for cat, flows in category_flows.items()
+                 if flows['outflows'] > 0),
+                key=itemgetter(1)
+            )
 
             # Calculate generation time
             end_time = datetime.now()
@@ -706,6 +748,80 @@ class CashDashboard:
             logger.error(f"Error calculating entity cash comparison: {e}")
             raise
 
+    def get_entity_flow_ranking(self, order_by: str = 'total_inflows',
+                                limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Rank entities by inflows, outflows, net flow or transaction count
+
+        Sorting and the top-N cut happen in the database, so only the returned
+        rows leave it; the entity counts come from one aggregate over the same
+        grouping.
+
+        Args:
+            order_by: Column to rank by (one of ENTITY_FLOW_ORDER_COLUMNS)
+            limit: Number of entities to return (all when None)
+
+        Returns:
+            Dict with 'entities' (ranked rows), 'total_entities' and
+            'profitable_entities' (entities with a positive net flow)
+        """
+        if order_by not in ENTITY_FLOW_ORDER_COLUMNS:
+            raise ValueError(f"Cannot rank entities by {order_by!r}")
+
+        if self.db.db_type == 'postgresql':
+            placeholder = '%s'
+            nan_filter = "AND amount::text != 'NaN'"
+        else:
+            placeholder = '?'
+            nan_filter = ''
+
+        entity_flows = f"""
+            SELECT
+                classified_entity AS entity,
+                SUM(CASE WHEN COALESCE(usd_equivalent, amount) > 0
+                         THEN COALESCE(usd_equivalent, amount) ELSE 0 END) AS total_inflows,
+                SUM(CASE WHEN COALESCE(usd_equivalent, amount) < 0
+                         THEN COALESCE(usd_equivalent, amount) ELSE 0 END) AS total_outflows,
+                SUM(COALESCE(usd_equivalent, amount)) AS net_flow,
+                COUNT(*) AS transaction_count
+            FROM transactions
+            WHERE classified_entity IS NOT NULL
+                AND classified_entity != ''
+                AND amount IS NOT NULL {nan_filter}
+            GROUP BY classified_entity
+        """
+
+        ranking_query = f"SELECT * FROM ({entity_flows}) entity_flows ORDER BY {order_by} DESC, entity"
+        params = None
+        if limit is not None:
+            ranking_query += f" LIMIT {placeholder}"
+            params = (int(limit),)
+
+        counts_query = f"""
+            SELECT
+                COUNT(*) AS total_entities,
+                SUM(CASE WHEN net_flow > 0 THEN 1 ELSE 0 END) AS profitable_entities
+            FROM ({entity_flows}) entity_flows
+        """
+
+        rows = self.db.execute_query(ranking_query, params, fetch_all=True) or []
+        counts = self.db.execute_query(counts_query, fetch_one=True)
+
+        return {
+            'entities': [
+                {
+                    'entity': row['entity'],
+                    'total_inflows': float(row['total_inflows'] or 0),
+                    'total_outflows': float(row['total_outflows'] or 0),
+                    'net_flow': float(row['net_flow'] or 0),
+                    'transaction_count': int(row['transaction_count'] or 0)
+                }
+                for row in rows
+            ],
+            'total_entities': int(counts['total_entities'] or 0) if counts else 0,
+            'profitable_entities': int(counts['profitable_entities'] or 0) if counts else 0
+        }
+
 
 # Convenience functions for quick access
 def get_quick_cash_position(entity: Optional[str] = None) -> Dict[str, Any]:
@@ -300,8 +300,7 @@ class FinancialStatementsGenerator:
                     accounting_category,
                     currency
                 FROM transactions
-                WHERE date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-                AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
+                WHERE date >= ? AND date <= ?
                 AND amount > 0
                 ORDER BY date, amount DESC
             """
@@ -396,8 +395,7 @@ class FinancialStatementsGenerator:
                     accounting_category,
                     currency
                 FROM transactions
-                WHERE date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-                AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
+                WHERE date >= ? AND date <= ?
                 AND amount < 0
                 AND (
                     LOWER(accounting_category) LIKE ? OR
@@ -500,8 +498,7 @@ class FinancialStatementsGenerator:
                         accounting_category,
                         currency
                     FROM transactions
-                    WHERE date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-                    AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
+                    WHERE date >= ? AND date <= ?
                     AND amount < 0
                     AND ({exclusion_conditions})
                     ORDER BY date, amount
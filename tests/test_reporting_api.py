@@ -58,6 +58,10 @@ def _install_stubs():
     # Stub reporting.financial_statements for income-statement endpoint
     fs_mod = types.ModuleType('reporting.financial_statements')
     class FinancialStatementsGenerator:
+        def __init__(self):
+            from DeltaCFOAgent.web_ui import reporting_api
+            self.db = reporting_api.db_manager
+
         def generate_income_statement(self, period_id=None, start_date=None, end_date=None, comparison_period_id=None, include_details=False):
             return {'summary': {'revenue': 1000.0, 'expenses': 200.0, 'net_income': 800.0}}
     fs_mod.FinancialStatementsGenerator = FinancialStatementsGenerator
@@ -105,18 +109,22 @@ class TestReportingAPI(unittest.TestCase):
         # Monkeypatch db_manager.execute_query for the simple endpoint
         def fake_execute_query(query, params=None, fetch_one=False, fetch_all=False):
             text = (query or '').lower()
+            if fetch_one:
+                return {'health_check': 1}
+            if 'asset_bucket' in text:
+                return [{'bucket': 'estimated', 'total': 300.0, 'count': 1}]
             if 'where amount > 0' in text:
                 return [
+                    {'category': '__TOTAL__', 'total': 1000.0, 'count': 10},
                     {'category': 'Sales', 'total': 700.0, 'count': 7},
                     {'category': 'Other', 'total': 300.0, 'count': 3},
                 ]
             if 'where amount < 0' in text:
                 return [
+                    {'category': '__TOTAL__', 'total': 200.0, 'count': 7},
                     {'category': 'General & Administrative', 'total': 150.0, 'count': 5},
                     {'category': 'R&D', 'total': 50.0, 'count': 2},
                 ]
-            if fetch_one:
-                return {'health_check': 1}
             return []
 
         reporting_api.db_manager.execute_query = fake_execute_query  # type: ignore
@@ -135,6 +143,593 @@ class TestReportingAPI(unittest.TestCase):
         self.assertIn('operating_income', stmt)
         self.assertIn('revenue', stmt)
         self.assertGreaterEqual(stmt.get('revenue', {}).get('total', 0), 0)
+        self.assertEqual(stmt['revenue']['total'], 1000.0)
+        self.assertEqual([c['category'] for c in stmt['revenue']['categories']], ['Sales', 'Other'])
+        self.assertEqual(stmt['summary_metrics']['transaction_count'], 17)
+
+    def test_reports_bundle(self):
+        resp = self.client.get('/api/reports/bundle')
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()
+        self.assertTrue(data.get('success'))
+        statements = data.get('statements', {})
+        self.assertEqual(set(statements), {'income_statement', 'balance_sheet', 'cash_flow', 'dmpl'})
+        self.assertEqual(statements['income_statement']['revenue']['total'], 1000.0)
+        self.assertEqual(statements['balance_sheet']['assets']['total'], 300.0)
+
+    def test_render_pdf_runs_in_worker_pool(self):
+        # Any picklable callable goes through the pool; reportlab is stubbed here
+        self.assertEqual(self.reporting_api._render_pdf(sorted, {'b': 1, 'a': 2}), ['a', 'b'])
+        pool = self.reporting_api._pdf_pool
+        self.assertIsNotNone(pool)
+        # workers come from a forkserver, never a fork of the web process
+        self.assertEqual(pool._mp_context.get_start_method(), 'forkserver')
+        self.assertEqual(pool._max_workers, self.reporting_api.PDF_RENDER_WORKERS)
+
+    def test_render_pdf_timeout_frees_the_worker(self):
+        import time
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from unittest import mock
+        with mock.patch.object(self.reporting_api, 'REPORT_TIMEOUT_SECONDS', 0.5):
+            with self.assertRaises(FutureTimeoutError):
+                self.reporting_api._render_pdf(time.sleep, 30)
+        self.assertIsNone(self.reporting_api._pdf_pool)
+        # the next export gets a fresh pool
+        self.assertEqual(self.reporting_api._render_pdf(sorted, [2, 1]), [1, 2])
+
+    def test_statement_pdf_does_not_load_the_database(self):
+        import subprocess
+        code = ("import sys, DeltaCFOAgent.web_ui.statement_pdf; "
+                "print(any(m.endswith('database') for m in sys.modules))")
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), 'False')
+
+    def test_gather_shares_one_deadline(self):
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            slow = [pool.submit(release.wait, 5) for _ in range(3)]
+            started = time.monotonic()
+            with self.assertRaises(FutureTimeoutError):
+                self.reporting_api._gather(*slow, timeout=0.3)
+            self.assertLess(time.monotonic() - started, 0.8)  # not 0.3s per future
+
+            def fail():
+                raise ValueError('query failed')
+
+            started = time.monotonic()
+            with self.assertRaises(ValueError):
+                self.reporting_api._gather(pool.submit(release.wait, 5), pool.submit(fail), timeout=5)
+            self.assertLess(time.monotonic() - started, 1)
+            release.set()
+            self.assertEqual(self.reporting_api._gather(pool.submit(sum, [1, 2]), pool.submit(len, 'ab')), [3, 2])
+
+    def test_pdf_response_headers(self):
+        with self.app.test_request_context():
+            resp = self.reporting_api._pdf_response(b'%PDF-1.4', 'report.pdf')
+        self.assertEqual(resp.mimetype, 'application/pdf')
+        self.assertEqual(resp.headers['Content-Disposition'], 'attachment; filename="report.pdf"')
+        self.assertEqual(resp.headers['Content-Length'], '8')
+        self.assertEqual(resp.get_data(), b'%PDF-1.4')
+
+    def test_period_comparison_single_category_scan(self):
+        queries = []
+
+        def period_rows(query, params=None, fetch_one=False, fetch_all=False):
+            if fetch_one:
+                # empty-window probe finds rows; no data version
+                return {'found': 1} if 'LIMIT 1' in query else None
+            queries.append(query)
+            empty = {'revenue': 0.0, 'revenue_count': 0, 'expenses': 0.0, 'expense_count': 0}
+
+            def row(category, cur, prev):
+                return {'category': category,
+                        **{f'cur_{k}': v for k, v in {**empty, **cur}.items()},
+                        **{f'prev_{k}': v for k, v in {**empty, **prev}.items()}}
+
+            return [
+                row('Sales', {'revenue': 500.0, 'revenue_count': 2}, {'revenue': 400.0, 'revenue_count': 1}),
+                row('Rent', {'expenses': 200.0, 'expense_count': 1}, {}),
+                row(None, {'expenses': 250.0, 'expense_count': 2}, {}),
+                row(self.reporting_api.TOTAL_ROW_LABEL,
+                    {'revenue': 500.0, 'revenue_count': 2, 'expenses': 450.0, 'expense_count': 3},
+                    {'revenue': 400.0, 'revenue_count': 1}),
+            ]
+
+        self.reporting_api.db_manager.execute_query = period_rows  # type: ignore
+        resp = self.client.get(
+            '/api/reports/period-comparison?current_start_date=2024-02-01&current_end_date=2024-02-29'
+            '&previous_start_date=2024-01-01&previous_end_date=2024-01-31'
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(queries), 1)  # one scan for both periods
+        comparison = resp.get_json()['comparison']
+        self.assertEqual(comparison['previous_period']['data']['transaction_count'], 1)
+        current = comparison['current_period']['data']
+        self.assertEqual(current['total_revenue'], 500.0)
+        self.assertEqual(current['total_expenses'], 450.0)
+        self.assertEqual(current['transaction_count'], 5)
+        self.assertEqual([c['category'] for c in current['expense_categories']], ['General & Administrative', 'Rent'])
+        self.assertEqual(comparison['variance_analysis']['revenue_change']['absolute'], 100.0)
+        self.assertEqual(comparison['variance_analysis']['category_variance']['revenue'], [
+            {'category': 'Sales', 'current': 500.0, 'previous': 400.0, 'absolute': 100.0, 'percentage': 25.0}
+        ])
+
+    def test_period_comparison_reuses_cached_periods(self):
+        scans = []
+
+        def versioned(query, params=None, fetch_one=False, fetch_all=False):
+            if 'max(updated_at)' in (query or '').lower():
+                return {'version': 'v1'}
+            if fetch_one:
+                return {'found': 1}
+            scans.append(params)
+            return [{'category': 'Sales', 'cur_revenue': 100.0, 'cur_revenue_count': 1, 'cur_expenses': 0.0,
+                     'cur_expense_count': 0, 'prev_revenue': 0.0, 'prev_revenue_count': 0, 'prev_expenses': 0.0,
+                     'prev_expense_count': 0}]
+
+        self.reporting_api.db_manager.execute_query = versioned  # type: ignore
+        self.reporting_api._period_data_cache.clear()
+        url = ('/api/reports/period-comparison?current_start_date=2024-02-01&current_end_date=2024-02-29'
+               '&previous_start_date=2024-01-01&previous_end_date=2024-01-31')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(len(scans), 1)
+
+    def test_period_comparison_failed_scan_not_cached(self):
+        calls = []
+
+        def failing(query, params=None, fetch_one=False, fetch_all=False):
+            calls.append(query)
+            if 'max(updated_at)' in (query or '').lower():
+                return {'version': 'v1'}
+            if fetch_one:
+                return {'found': 1}
+            raise RuntimeError('connection reset')
+
+        self.reporting_api.db_manager.execute_query = failing  # type: ignore
+        self.reporting_api._period_data_cache.clear()
+        url = ('/api/reports/period-comparison?current_start_date=2024-02-01&current_end_date=2024-02-29'
+               '&previous_start_date=2024-01-01&previous_end_date=2024-01-31')
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 500)
+        self.assertIn('connection reset', resp.get_json()['error'])
+        self.assertEqual(self.client.get(url).status_code, 500)
+        self.assertEqual(len([q for q in calls if 'WITH cats' in q]), 2)  # the failure was not cached
+
+    def test_period_comparison_failed_probe_is_an_error(self):
+        def failing_probe(query, params=None, fetch_one=False, fetch_all=False):
+            if 'LIMIT 1' in query:
+                raise RuntimeError('probe failed')
+            return None
+
+        self.reporting_api.db_manager.execute_query = failing_probe  # type: ignore
+        resp = self.client.get(
+            '/api/reports/period-comparison?current_start_date=2024-02-01&current_end_date=2024-02-29'
+            '&comparison_type=month_over_month'
+        )
+        self.assertEqual(resp.status_code, 500)
+        self.assertIn('probe failed', resp.get_json()['error'])
+
+    def test_period_comparison_empty_windows_skip_scan(self):
+        queries = []
+
+        def empty(query, params=None, fetch_one=False, fetch_all=False):
+            queries.append(query)
+            return None
+
+        self.reporting_api.db_manager.execute_query = empty  # type: ignore
+        resp = self.client.get(
+            '/api/reports/period-comparison?current_start_date=2030-02-01&current_end_date=2030-02-28'
+            '&comparison_type=month_over_month'
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(queries), 2)  # data version + probe, no aggregate scan
+        current = resp.get_json()['comparison']['current_period']['data']
+        self.assertEqual((current['total_revenue'], current['transaction_count']), (0.0, 0))
+        self.assertEqual(current['revenue_categories'], [])
+
+    def test_period_comparison_shifts(self):
+        for comparison_type, previous in (
+            ('month_over_month', ('2024-02-29', '2024-02-29')),
+            ('quarter_over_quarter', ('2023-12-31', '2023-12-31')),
+            ('year_over_year', ('2023-03-31', '2023-03-31')),
+        ):
+            resp = self.client.get(
+                '/api/reports/period-comparison?current_start_date=2024-03-31&current_end_date=2024-03-31'
+                f'&comparison_type={comparison_type}'
+            )
+            self.assertEqual(resp.status_code, 200)
+            period = resp.get_json()['comparison']['previous_period']
+            self.assertEqual((period['start_date'], period['end_date']), previous)
+
+    def test_entity_flow_ranking_in_sql(self):
+        queries = []
+
+        def flows(query, params=None, fetch_one=False, fetch_all=False):
+            queries.append((query, params))
+            if fetch_one:
+                return {'total_entities': 5, 'profitable_entities': 3}
+            return [{'entity': 'Delta LLC', 'total_inflows': 900, 'total_outflows': -100,
+                     'net_flow': 800, 'transaction_count': 4}]
+
+        dashboard = self.reporting_api.CashDashboard()
+        dashboard.db = types.SimpleNamespace(db_type='sqlite', execute_query=flows)
+        ranking = dashboard.get_entity_flow_ranking('net_flow', limit=1)
+        self.assertIn('ORDER BY net_flow DESC', queries[0][0])
+        self.assertEqual(queries[0][1], (1,))
+        self.assertEqual(ranking['entities'][0]['net_flow'], 800.0)
+        self.assertEqual((ranking['total_entities'], ranking['profitable_entities']), (5, 3))
+        with self.assertRaises(ValueError):
+            dashboard.get_entity_flow_ranking('amount; DROP TABLE transactions')
+
+    def test_cash_trends_multi_single_scan(self):
+        from datetime import date, timedelta
+        queries = []
+        today = date.today()
+
+        def txns(query, params=None, fetch_one=False, fetch_all=False):
+            queries.append(query)
+            return [{'date': (today - timedelta(days=20)).isoformat(), 'amount': 1000, 'usd_equivalent': None},
+                    {'date': (today - timedelta(days=3)).isoformat(), 'amount': -300, 'usd_equivalent': None}]
+
+        dashboard = self.reporting_api.CashDashboard()
+        dashboard.db = types.SimpleNamespace(db_type='sqlite', iter_query=lambda query, params=None: iter(txns(query)))
+        trends = dashboard.get_cash_trends_multi(windows=(7, 30))
+        self.assertEqual(len(queries), 1)
+        week, month = trends[7], trends[30]
+        self.assertEqual(len(week['daily_positions']), 7)
+        self.assertEqual(week['daily_positions'][1:], month['daily_positions'][-6:])
+        self.assertEqual(week['period']['start_date'], (today - timedelta(days=6)).isoformat())
+        self.assertEqual(week['current_metrics']['total_change'], -300.0)
+        self.assertEqual(month['current_metrics']['starting_cash_position'], 0.0)
+        self.assertEqual(dashboard.get_cash_trend(days=7)['current_metrics'], week['current_metrics'])
+
+    def test_cash_dashboard_queries_run_on_report_pool(self):
+        import threading
+        from unittest import mock
+        threads = []
+
+        def record(result):
+            def call(*args, **kwargs):
+                threads.append(threading.current_thread().name)
+                return result
+            return call
+
+        dashboard_cls = self.reporting_api.CashDashboard
+        with mock.patch.object(dashboard_cls, 'get_current_cash_position', record({'total_cash_usd': 1.0})), \
+                mock.patch.object(dashboard_cls, 'get_cash_trends_multi', record({7: 'week', 30: 'month'})), \
+                mock.patch.object(dashboard_cls, 'get_entity_cash_comparison', record({'entity_details': {}})):
+            resp = self.client.get('/api/reports/cash-dashboard')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['data']['trends'], {'7_days': 'week', '30_days': 'month'})
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(all(name.startswith('ReportWorker') for name in threads))
+
+    def test_income_statement_runs_under_statement_timeout(self):
+        import sys
+        import threading
+        from unittest import mock
+        seen = []
+
+        def generate(generator, **kwargs):
+            seen.append((threading.current_thread().name, generator.db._session.statement_timeout_ms))
+            return {'summary': {'revenue': 1.0}}
+
+        generator_cls = sys.modules['reporting.financial_statements'].FinancialStatementsGenerator
+        with mock.patch.object(generator_cls, 'generate_income_statement', generate):
+            resp = self.client.get('/api/reports/income-statement')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(seen), 1)
+        self.assertTrue(seen[0][0].startswith('StatementWorker'))
+        self.assertEqual(seen[0][1], self.reporting_api.REPORT_TIMEOUT_SECONDS * 1000)
+
+    def test_cash_trend_served_from_statement_cache(self):
+        from unittest import mock
+        calls = []
+
+        def trend(*args, **kwargs):
+            calls.append(kwargs)
+            return {'period': {'days': 30},
+                    'daily_points': [{'date': '2024-01-01', 'inflows': 5.0, 'outflows': -2.0, 'net_flow': 3.0}]}
+
+        def versioned(query, params=None, fetch_one=False, fetch_all=False):
+            return {'version': 'v1'}
+
+        self.reporting_api.db_manager.execute_query = versioned  # type: ignore
+        self.reporting_api._statement_cache.clear()
+        with mock.patch.object(self.reporting_api.CashDashboard, 'get_cash_trend', trend):
+            first = self.client.get('/api/reports/cash-trend?days=30')
+            etag = first.headers['ETag'].strip('"')
+            again = self.client.get('/api/reports/cash-trend?days=30', headers={'If-None-Match': f'"{etag}"'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(len(calls), 1)
+        chart = first.get_json()['data']['chart_data']
+        self.assertEqual(chart['labels'], ['2024-01-01'])
+        self.assertEqual([d['data'] for d in chart['datasets']], [[5.0], [2.0], [3.0]])
+        self.assertEqual(chart['datasets'][2]['type'], 'line')
+
+    def test_category_variance(self):
+        variance = self.reporting_api._category_variance(
+            [{'category': 'A', 'amount': 150.0}, {'category': 'B', 'amount': 20.0}],
+            [{'category': 'A', 'amount': 100.0}, {'category': 'C', 'amount': 40.0}]
+        )
+        self.assertEqual([v['category'] for v in variance], ['A', 'B', 'C'])
+        self.assertEqual((variance[0]['absolute'], variance[0]['percentage']), (50.0, 50.0))
+        self.assertEqual((variance[1]['absolute'], variance[1]['percentage']), (20.0, 100.0))
+        self.assertEqual((variance[2]['absolute'], variance[2]['percentage']), (-40.0, -100.0))
+
+    def test_cached_statement_gzip_and_etag(self):
+        import gzip
+        import json
+        fake = self.reporting_api.db_manager.execute_query
+
+        def versioned(query, params=None, fetch_one=False, fetch_all=False):
+            if 'max(updated_at)' in (query or '').lower():
+                return {'version': 'v1'}
+            return fake(query, params, fetch_one, fetch_all)
+
+        self.reporting_api.db_manager.execute_query = versioned  # type: ignore
+        self.reporting_api._statement_cache.clear()
+
+        resp = self.client.get('/api/reports/bundle', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers.get('Content-Encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', resp.headers.get('Vary', ''))
+        data = json.loads(gzip.decompress(resp.get_data()))
+        self.assertTrue(data['success'])
+
+        etag = resp.headers['ETag'].strip('"')
+        again = self.client.get('/api/reports/bundle', headers={'Accept-Encoding': 'gzip', 'If-None-Match': f'"{etag}"'})
+        self.assertEqual(again.status_code, 304)
+
+        plain = self.client.get('/api/reports/bundle')
+        self.assertIsNone(plain.headers.get('Content-Encoding'))
+        self.assertTrue(plain.get_json()['success'])
+
+    def test_parse_date_formats(self):
+        from datetime import date
+        parse = self.reporting_api._parse_date
+        self.assertEqual(parse('2024-01-31'), date(2024, 1, 31))
+        self.assertEqual(parse('1/31/2024'), date(2024, 1, 31))
+        self.assertIsNone(parse('31/01/2024'))
+        self.assertIsNone(parse('01/31/2024x'))
+
+    def test_bad_iso_dates_return_json_400(self):
+        resp = self.client.get('/api/reports/cash-dashboard?start_date=01/31/2024')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json()['error'], 'Invalid start_date format. Use YYYY-MM-DD')
+
+        resp = self.client.get('/api/reports/monthly-pl?start_date=2024-01-01&end_date=BAD')
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.get_json()['success'])
+        self.assertIn('Invalid end_date format', resp.get_json()['error'])
+
+    def test_monthly_margins(self):
+        margins = self.reporting_api._monthly_margins([
+            {'month': '2024-01', 'revenue': 200, 'expenses': 50},
+            {'month': '2024-02', 'revenue': 0, 'expenses': 10},
+        ])
+        self.assertEqual([m['month'] for m in margins], ['Jan 2024', 'Feb 2024'])
+        self.assertEqual(margins[0]['net_income'], 150.0)
+        self.assertEqual(margins[0]['margin_percent'], 75.0)
+        self.assertEqual(margins[1]['margin_percent'], 0.0)
+        self.assertEqual(self.reporting_api._monthly_margins([]), [])
+
+    def test_json_dumps_numpy_and_decimal(self):
+        import json
+        from decimal import Decimal
+        import numpy as np
+        body = self.reporting_api._json_dumps({'a': Decimal('1.5'), 'b': np.float64(2.25), 'c': np.int64(3)})
+        self.assertEqual(json.loads(body), {'a': 1.5, 'b': 2.25, 'c': 3})
+
+    def test_safe_query_prepared_and_failure(self):
+        calls = []
+
+        class FakeDB:
+            def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
+                calls.append(('query', query))
+                raise RuntimeError('boom')
+
+            def execute_prepared(self, query, params=None, fetch_one=False, fetch_all=False, name=None):
+                calls.append(('prepared', name))
+                return [{'x': 1}]
+
+        self.assertEqual(self.reporting_api._safe_query(FakeDB(), 'SELECT 1', fetch_all=True, name='s_v1'), [{'x': 1}])
+        self.assertEqual(self.reporting_api._safe_query(FakeDB(), 'SELECT 1'), {})
+        self.assertEqual(calls, [('prepared', 's_v1'), ('query', 'SELECT 1')])
+
+    def test_as_dicts(self):
+        import sqlite3
+        rows = [{'id': 1}]
+        self.assertIs(self.reporting_api._as_dicts(rows), rows)
+        conn = sqlite3.connect(':memory:')
+        conn.row_factory = sqlite3.Row
+        sqlite_rows = conn.execute("SELECT 1 AS id").fetchall()
+        self.assertEqual(self.reporting_api._as_dicts(sqlite_rows), [{'id': 1}])
+        self.assertEqual(self.reporting_api._as_dicts(None), [])
+        conn.close()
+
+    def test_entities_list_passes_dict_rows_through(self):
+        from unittest import mock
+        rows = [{'entity': 'Alpha', 'transaction_count': 3}]
+        self.reporting_api.db_manager.execute_query = lambda *args, **kwargs: rows  # type: ignore
+        with mock.patch.object(self.reporting_api, '_as_dicts', wraps=self.reporting_api._as_dicts) as as_dicts:
+            resp = self.client.get('/api/reports/entities')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIs(as_dicts.call_args[0][0], rows)
+        self.assertEqual(resp.get_json()['data'], {'entities': rows, 'total_entities': 1})
+
+    def test_template_config(self):
+        config = {'report_type': 'dashboard'}
+        self.assertIs(self.reporting_api._template_config(config), config)
+        self.assertEqual(self.reporting_api._template_config('{"report_type": "dashboard"}'), config)
+        self.assertEqual(self.reporting_api._template_config(b'{"report_type": "dashboard"}'), config)
+        self.assertEqual(self.reporting_api._template_config('not json'), {})
+        self.assertEqual(self.reporting_api._template_config(None), {})
+
+    def test_template_insert_returns_id(self):
+        from unittest import mock
+        calls = []
+
+        def fake_execute_query(query, params=None, fetch_one=False, fetch_all=False):
+            calls.append((query, fetch_one))
+            return {'id': 42}
+
+        with mock.patch.object(self.reporting_api.db_manager, 'execute_query', fake_execute_query):
+            resp = self.client.post('/api/reports/templates', json={'name': 'Monthly', 'config': {}})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()
+        self.assertEqual(data['id'], 42)
+        self.assertIn('created_at', data)
+        self.assertEqual(len(calls), 1)
+        self.assertIn('RETURNING id', calls[0][0])
+        self.assertTrue(calls[0][1])
+
+    def test_monthly_pl_rows(self):
+        from decimal import Decimal
+        monthly_pl, totals = self.reporting_api._monthly_pl_rows([
+            {'year': 2025, 'month_number': 1, 'total_revenue': Decimal('100.5'), 'total_expenses': 40,
+             'net_profit': Decimal('60.5'), 'transaction_count': 3},
+            {'year': 2025, 'month_number': 2, 'total_revenue': 0.0, 'total_expenses': 10.0,
+             'net_profit': -10.0, 'transaction_count': 0},
+        ])
+        self.assertEqual([m['month'] for m in monthly_pl], ['Jan 2025', 'Feb 2025'])
+        self.assertEqual(monthly_pl[1], {'month': 'Feb 2025', 'year': 2025, 'month_number': 2, 'revenue': 0.0,
+                                         'expenses': 10.0, 'profit': -10.0, 'transaction_count': 0})
+        self.assertEqual(totals, {'total_revenue': 100.5, 'total_expenses': 50.0, 'total_profit': 50.5})
+        self.assertEqual(self.reporting_api._monthly_pl_rows([]),
+                         ([], {'total_revenue': 0.0, 'total_expenses': 0.0, 'total_profit': 0.0}))
+
+    def test_monthly_pl_split(self):
+        from datetime import date
+        split = self.reporting_api._monthly_pl_split
+        today = date(2024, 6, 15)
+        self.assertEqual(split(date(2024, 1, 10), date(2024, 4, 30), today), (date(2024, 2, 1), date(2024, 5, 1)))
+        self.assertEqual(split(date(2024, 1, 1), date(2024, 3, 15), today), (date(2024, 1, 1), date(2024, 3, 1)))
+        # the current month is always aggregated live
+        self.assertEqual(split(date(2024, 4, 1), date(2024, 6, 30), today), (date(2024, 4, 1), date(2024, 6, 1)))
+        self.assertIsNone(split(date(2024, 6, 1), date(2024, 6, 30), today))
+        self.assertIsNone(split(date(2024, 3, 2), date(2024, 3, 30), today))
+
+    def test_data_date_range_cached(self):
+        from datetime import date
+        from unittest import mock
+        rows = [None, {'min_date': date(2023, 1, 5), 'max_date': date(2024, 6, 30)}]
+        calls = []
+
+        def fake_execute_query(query, params=None, fetch_one=False, fetch_all=False):
+            calls.append(query)
+            return rows[len(calls) - 1]
+
+        with mock.patch.object(self.reporting_api.db_manager, 'execute_query', fake_execute_query):
+            self.assertIsNone(self.reporting_api._data_date_range())
+            expected = (date(2023, 1, 5), date(2024, 6, 30))
+            self.assertEqual(self.reporting_api._data_date_range(), expected)
+            self.assertEqual(self.reporting_api._data_date_range(), expected)
+        self.assertEqual(len(calls), 2)
+
+    def test_monthly_pl_without_total_amount_num(self):
+        from unittest import mock
+        prepared = []
+
+        def record_prepared(query, params=None, fetch_one=False, fetch_all=False, name=None):
+            prepared.append((name, query))
+            return []
+
+        self.reporting_api._statement_cache.clear()
+        with mock.patch.object(self.reporting_api, '_has_column', return_value=False), \
+                mock.patch.object(self.reporting_api.db_manager, 'execute_prepared', record_prepared):
+            resp = self.client.get('/api/reports/monthly-pl?start_date=2024-01-01&end_date=2024-03-31')
+        self.assertEqual(resp.status_code, 200)
+        (name, query), = [p for p in prepared if p[0].startswith('monthly_pl')]
+        self.assertEqual(name, 'monthly_pl_legacy_v1')
+        self.assertNotIn('total_amount_num', query)
+
+    def test_charts_data_failed_query_not_cached(self):
+        def failing(query, params=None, fetch_one=False, fetch_all=False):
+            if fetch_one:
+                return {'version': 'v1'}
+            raise RuntimeError('no such column')
+
+        self.reporting_api.db_manager.execute_query = failing  # type: ignore
+        self.reporting_api._statement_cache.clear()
+        resp = self.client.get('/api/reports/charts-data')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.cache_control.no_store)
+
+    def test_monthly_pl_mv_probe_caches_only_hits(self):
+        from unittest import mock
+        rows = [{'present': False}, {'present': True}]
+        calls = []
+
+        def probe(query, params=None, fetch_one=False, fetch_all=False):
+            calls.append(query)
+            return rows[len(calls) - 1]
+
+        api = self.reporting_api
+        api._known_columns.discard(('monthly_pl_mv', None))
+        api._missing_columns.clear()
+        with mock.patch.object(api.db_manager, 'db_type', 'postgresql'), \
+                mock.patch.object(api.db_manager, 'execute_query', probe):
+            self.assertFalse(api._has_monthly_pl_mv())
+            self.assertFalse(api._has_monthly_pl_mv())
+            # the miss expires, and a view created meanwhile is found
+            api._missing_columns.clear()
+            self.assertTrue(api._has_monthly_pl_mv())
+            self.assertTrue(api._has_monthly_pl_mv())
+        self.assertEqual(len(calls), 2)
+        api._known_columns.discard(('monthly_pl_mv', None))
+
+    def test_monthly_pl_refresh_only_by_lock_owner(self):
+        from unittest import mock
+
+        class Stop(Exception):
+            pass
+
+        def run_loop(locked, ticks=2):
+            executed = []
+
+            class Cursor:
+                def __enter__(self):
+                    return self
+
+                def __exit__(self, *exc):
+                    return False
+
+                def execute(self, query, params=None):
+                    executed.append(query)
+
+                def fetchone(self):
+                    return (locked,)
+
+            conn = mock.Mock()
+            conn.cursor.return_value = Cursor()
+            sleeps = [None] * ticks + [Stop()]
+            with mock.patch.object(self.reporting_api, '_has_monthly_pl_mv', return_value=True), \
+                    mock.patch.object(self.reporting_api.db_manager, 'open_dedicated_connection', return_value=conn), \
+                    mock.patch.object(self.reporting_api.time, 'sleep', side_effect=sleeps):
+                with self.assertRaises(Stop):
+                    self.reporting_api._refresh_monthly_pl_mv(interval=0)
+            return executed
+
+        owner = run_loop(True)
+        self.assertEqual(sum('pg_try_advisory_lock' in q for q in owner), 1)
+        self.assertEqual(sum('REFRESH MATERIALIZED VIEW' in q for q in owner), 2)
+        other = run_loop(False)
+        self.assertEqual(sum('pg_try_advisory_lock' in q for q in other), 2)
+        self.assertFalse(any('REFRESH MATERIALIZED VIEW' in q for q in other))
+
+    def test_month_label(self):
+        from datetime import date
+        label = self.reporting_api._month_label
+        self.assertEqual(label('2025-10'), 'Oct 2025')
+        self.assertEqual(label(date(2025, 3, 1)), 'Mar 2025')
+        self.assertEqual(label('2025-13'), '2025-13')
+        self.assertEqual(label(None), 'Unknown')
 
     def test_income_statement_full(self):
         resp = self.client.post('/api/reports/income-statement', json={'include_details': False})
@@ -143,6 +738,24 @@ class TestReportingAPI(unittest.TestCase):
         self.assertTrue(data.get('success'))
         self.assertIn('statement', data)
 
+    def test_income_statement_stream_ndjson(self):
+        import json
+        resp = self.client.get('/api/reports/income-statement?stream=1')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        self.assertEqual(lines[-1]['type'], 'statement')
+        self.assertEqual(lines[-1]['statement']['summary']['revenue'], 1000.0)
+
+    def test_emit_ndjson_transaction_lines(self):
+        import json
+        statement = {'revenue': {'total': 10.0, 'transactions': [{'id': 'a'}, {'id': 'b'}]}, 'net_income': {'amount': 10.0}}
+        lines = [json.loads(line) for line in self.reporting_api._emit_ndjson(statement)]
+        self.assertEqual([l['id'] for l in lines[:-1]], ['a', 'b'])
+        self.assertEqual(lines[0]['section'], 'revenue')
+        self.assertEqual(lines[-1]['statement']['revenue'], {'total': 10.0})
+        self.assertIn('transactions', statement['revenue'])
+
     def test_income_statement_bad_start_date_post(self):
         resp = self.client.post('/api/reports/income-statement', json={'start_date': 'BADDATE', 'end_date': '2024-01-31'})
         self.assertEqual(resp.status_code, 400)
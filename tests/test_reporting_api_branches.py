@@ -5,24 +5,37 @@ Plan:
   * POST include_details=True handled.
   * Error path: db error returns 500 with error message.
   * Empty DB returns zeroed totals and empty categories.
+- Entity summary ratios, tiers and system totals computed by SQLite.
+- Entity trends for every top entity fetched with one grouped query.
+- Balance sheet and simple income statement on a database created before
+  the bucket columns existed: init_database adds them, and the inline CASE
+  fallback gives the same result.
 """
 
+import importlib
 import os
+import sqlite3
 import sys
+import tempfile
 import unittest
+from unittest import mock
 from flask import Flask
 
 
 class TestReportingAPIBranches(unittest.TestCase):
     def setUp(self):
-        # Force SQLite mode
+        # Force SQLite mode, on a database of this test's own
+        self.tmpdir = tempfile.TemporaryDirectory()
         os.environ['DB_TYPE'] = 'sqlite'
-        os.environ['SQLITE_DB_PATH'] = 'test_reporting_branches.sqlite'
+        os.environ['SQLITE_DB_PATH'] = os.path.join(self.tmpdir.name, 'test_reporting_branches.sqlite')
+        self.package = importlib.import_module('DeltaCFOAgent.web_ui')
+        self.saved_modules = {name: getattr(self.package, name, None) for name in ('database', 'reporting_api')}
         for mod in list(sys.modules.keys()):
             if mod.startswith('DeltaCFOAgent.web_ui.reporting_api') or mod.startswith('DeltaCFOAgent.web_ui.database'):
                 sys.modules.pop(mod)
-        from DeltaCFOAgent.web_ui import reporting_api  # type: ignore
-        self.rp = reporting_api
+        # import_module rather than "from ... import" - the package attribute
+        # would hand back the module (and db_manager) an earlier test loaded
+        self.rp = importlib.import_module('DeltaCFOAgent.web_ui.reporting_api')
         self.rp.db_manager.db_type = 'sqlite'
         self.rp.db_manager.init_database()
         self.app = Flask(__name__)
@@ -32,6 +45,14 @@ class TestReportingAPIBranches(unittest.TestCase):
     def tearDown(self):
         os.environ.pop('DB_TYPE', None)
         os.environ.pop('SQLITE_DB_PATH', None)
+        # Hand the previously loaded modules back so later suites don't pick
+        # up a manager pointing at the removed temp database
+        for name, module in self.saved_modules.items():
+            if module is None:
+                continue
+            sys.modules[f'DeltaCFOAgent.web_ui.{name}'] = module
+            setattr(self.package, name, module)
+        self.tmpdir.cleanup()
 
     def test_get_dates_mmddyyyy(self):
         resp = self.client.get('/api/reports/income-statement?start_date=01/01/2024&end_date=01/31/2024')
@@ -68,6 +89,126 @@ class TestReportingAPIBranches(unittest.TestCase):
         self.assertIn('revenue', stmt)
         self.assertIn('operating_expenses', stmt)
 
+    def test_entity_summary_metrics_from_sql(self):
+        db = self.rp.db_manager
+        rows = [('es-1', '2024-01-05', 500.0, 'Alpha'), ('es-2', '2024-01-06', -100.0, 'Alpha'),
+                ('es-3', '2024-01-07', 50.0, 'Beta'), ('es-4', '2024-01-08', -80.0, 'Beta')]
+        for row in rows:
+            db.execute_query(
+                "INSERT INTO transactions (transaction_id, date, amount, classified_entity) VALUES (?, ?, ?, ?)", row
+            )
+        resp = self.client.get('/api/reports/entity-summary?period=all_time&min_transactions=1')
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.get_json()['data']
+        alpha, beta = data['entities']
+        self.assertEqual(alpha['entity'], 'Alpha')
+        self.assertEqual(alpha['financial_metrics']['profit_margin_percent'], 80.0)
+        self.assertEqual(alpha['financial_metrics']['roi_percent'], 400.0)
+        self.assertEqual(alpha['performance_analysis']['performance_tier'], 'High')
+        self.assertEqual(beta['performance_analysis']['risk_level'], 'High')
+        self.assertEqual(beta['performance_analysis']['profitability_status'], 'Loss-making')
+        totals = data['system_metrics']['system_totals']
+        self.assertEqual(totals['total_revenue'], 550.0)
+        self.assertEqual(totals['total_transactions'], 4)
+        self.assertEqual(data['system_metrics']['total_entities'], 2)
+        self.assertEqual(data['system_metrics']['profitable_entities'], 1)
+        self.assertEqual(data['system_metrics']['high_risk_entities'], 1)
+        self.assertEqual(data['chart_data']['performance_distribution']['data'], [1, 0, 0, 1])
+        rankings = data['rankings']
+        self.assertEqual([e['entity'] for e in rankings['top_profit_entities']], ['Alpha', 'Beta'])
+        self.assertEqual([e['entity'] for e in rankings['underperforming_entities']], ['Beta'])
+
+    def test_entity_trends_single_query(self):
+        from unittest import mock
+        db = self.rp.db_manager
+        rows = [('et-1', '2024-01-05', 100.0, 'Gamma'), ('et-2', '2024-02-06', 300.0, 'Gamma'),
+                ('et-3', '2024-02-07', -50.0, 'Delta')]
+        prepared = []
+        real_prepared = type(db).execute_prepared.__get__(db)
+
+        def record_prepared(query, *args, **kwargs):
+            prepared.append(query)
+            return real_prepared(query, *args, **kwargs)
+
+        for row in rows:
+            db.execute_query(
+                "INSERT INTO transactions (transaction_id, date, amount, classified_entity) VALUES (?, ?, ?, ?)", row
+            )
+        with mock.patch.object(db, 'execute_prepared', record_prepared):
+            resp = self.client.get('/api/reports/entity-summary?period=custom&start_date=2024-01-01'
+                                   '&end_date=2024-12-31&min_transactions=1')
+
+        self.assertEqual(resp.status_code, 200)
+        trends = resp.get_json()['data']['trend_analysis']
+        self.assertEqual([m['profit'] for m in trends['Gamma']['monthly_data']], [100.0, 300.0])
+        self.assertEqual(trends['Gamma']['trend_direction'], 'up')
+        self.assertEqual(trends['Delta']['months_analyzed'], 1)
+        self.assertEqual(len([q for q in prepared if 'substr(date, 1, 7)' in q]), 1)
+
+    def _use_legacy_database(self):
+        """Point the manager at a transactions table without the generated bucket columns"""
+        path = os.path.join(self.tmpdir.name, 'legacy.sqlite')
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE transactions (transaction_id TEXT PRIMARY KEY, date TEXT, description TEXT, "
+            "amount REAL, currency TEXT, usd_equivalent REAL, classified_entity TEXT, accounting_category TEXT, "
+            "created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.executemany(
+            "INSERT INTO transactions (transaction_id, date, description, amount, accounting_category) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [('bs-1', '01/05/2024', 'Opening', 1000.0, 'Cash'), ('bs-2', '01/06/2024', 'Vendor', -200.0, 'Accounts Payable'),
+             ('bs-3', '01/07/2024', 'Bank loan', -300.0, 'Loan')]
+        )
+        conn.commit()
+        conn.close()
+        self.rp.db_manager.connection_config['database'] = path
+
+    def _balance_sheet(self):
+        resp = self.client.get('/api/reports/balance-sheet/simple')
+        self.assertEqual(resp.status_code, 200)
+        stmt = resp.get_json()['statement']
+        assets = {c['category']: c['amount'] for c in stmt['assets']['current_assets']['categories']}
+        liabilities = {c['category']: c['amount'] for c in stmt['liabilities']['current_liabilities']['categories']}
+        return assets, liabilities
+
+    def test_balance_sheet_simple_upgraded_db(self):
+        self._use_legacy_database()
+        self.rp.db_manager.init_database()
+        columns = {row['name'] for row in self.rp.db_manager.execute_query(
+            "SELECT name FROM pragma_table_xinfo('transactions')", fetch_all=True)}
+        self.assertTrue({'asset_bucket', 'liability_bucket', 'expense_bucket'} <= columns)
+        assets, liabilities = self._balance_sheet()
+        self.assertEqual(assets, {'Caixa e Equivalentes': 1000.0})
+        self.assertEqual(liabilities, {'Contas a Pagar': 200.0, 'Empréstimos': 300.0})
+
+    def test_balance_sheet_simple_without_bucket_columns(self):
+        self._use_legacy_database()
+        with mock.patch.object(self.rp.db_manager, 'execute_prepared', wraps=self.rp.db_manager.execute_prepared) as prepared:
+            assets, liabilities = self._balance_sheet()
+        self.assertEqual(assets, {'Caixa e Equivalentes': 1000.0})
+        self.assertEqual(liabilities, {'Contas a Pagar': 200.0, 'Empréstimos': 300.0})
+        names = [call.kwargs.get('name') for call in prepared.call_args_list]
+        self.assertIn('bs_assets_legacy_v1', names)
+        self.assertIn('bs_liabilities_legacy_v1', names)
+
+    def _opex_total(self):
+        resp = self.client.get('/api/reports/income-statement/simple')
+        self.assertEqual(resp.status_code, 200)
+        return resp.get_json()['statement']['operating_expenses']['total']
+
+    def test_income_statement_simple_upgraded_db(self):
+        self._use_legacy_database()
+        self.rp.db_manager.init_database()
+        self.assertEqual(self._opex_total(), 500.0)
+
+    def test_income_statement_simple_without_expense_bucket(self):
+        self._use_legacy_database()
+        with mock.patch.object(self.rp.db_manager, 'execute_prepared', wraps=self.rp.db_manager.execute_prepared) as prepared:
+            self.assertEqual(self._opex_total(), 500.0)
+        self.assertIn('pl_opex_legacy_v1', [call.kwargs.get('name') for call in prepared.call_args_list])
+
 
 if __name__ == '__main__':
     unittest.main()
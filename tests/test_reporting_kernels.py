@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from DeltaCFOAgent.reporting._kernels import dmpl_kernel, variance_kernel  # type: ignore
+
+
+class TestDMPLKernel(unittest.TestCase):
+    def test_equity_walk(self):
+        net_income, beginning, ending, growth, roe = dmpl_kernel(1000.0, 600.0)
+        self.assertAlmostEqual(net_income, 400.0)
+        self.assertAlmostEqual(beginning, 320.0)
+        self.assertAlmostEqual(ending, 720.0)
+        self.assertAlmostEqual(growth, 125.0)
+        self.assertAlmostEqual(roe, 125.0)
+
+    def test_zero_equity(self):
+        self.assertEqual(dmpl_kernel(500.0, 500.0), (0.0, 0.0, 0.0, 0.0, 0.0))
+
+    def test_loss(self):
+        net_income, beginning, ending, growth, roe = dmpl_kernel(100.0, 300.0)
+        self.assertAlmostEqual(net_income, -200.0)
+        self.assertAlmostEqual(beginning, -160.0)
+        self.assertAlmostEqual(ending, -360.0)
+        self.assertAlmostEqual(growth, 125.0)
+        self.assertAlmostEqual(roe, 125.0)
+
+
+class TestVarianceKernel(unittest.TestCase):
+    def _variance(self, current, previous):
+        absolute, percentage = variance_kernel(np.array(current, dtype=float), np.array(previous, dtype=float))
+        return absolute.tolist(), percentage.tolist()
+
+    def test_change_against_previous(self):
+        absolute, percentage = self._variance([150.0, 50.0], [100.0, 200.0])
+        self.assertEqual(absolute, [50.0, -150.0])
+        self.assertEqual(percentage, [50.0, -75.0])
+
+    def test_negative_previous_uses_its_magnitude(self):
+        absolute, percentage = self._variance([-50.0, -300.0], [-100.0, -200.0])
+        self.assertEqual(absolute, [50.0, -100.0])
+        self.assertEqual(percentage, [50.0, -50.0])
+
+    def test_zero_or_missing_previous(self):
+        # categories absent from the previous period are aligned as 0.0
+        absolute, percentage = self._variance([80.0, 0.0, -20.0], [0.0, 0.0, 0.0])
+        self.assertEqual(absolute, [80.0, 0.0, -20.0])
+        self.assertEqual(percentage, [100.0, 0.0, 0.0])
+
+    def test_empty(self):
+        self.assertEqual(self._variance([], []), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -164,12 +164,142 @@ class TestWebUIDatabaseSQLite(unittest.TestCase):
         finally:
             self.manager.execute_query = original  # type: ignore
 
+    def test_execute_prepared_falls_back_on_sqlite(self):
+        self.manager.execute_query("INSERT INTO t (name, qty) VALUES (?, ?)", ("prep", 3))
+        row = self.manager.execute_prepared(
+            "SELECT qty FROM t WHERE name=?", ("prep",), fetch_one=True
+        )
+        self.assertEqual(row[0], 3)
+
+    def test_iter_query_streams_rows(self):
+        self.manager.execute_many(
+            "INSERT INTO t (name, qty) VALUES (?, ?)",
+            [("a", 1), ("b", 2), ("c", 3)],
+        )
+        rows = self.manager.iter_query("SELECT qty FROM t WHERE qty >= ? ORDER BY qty", (2,), batch=1)
+        self.assertEqual([row[0] for row in rows], [2, 3])
+
+        # Stopping early releases the connection
+        early = self.manager.iter_query("SELECT qty FROM t ORDER BY qty")
+        self.assertEqual(next(early)[0], 1)
+        early.close()
+        self.assertEqual(self.manager.execute_query("SELECT COUNT(*) FROM t", fetch_one=True)[0], 3)
+
+    def test_prepared_statement_translation(self):
+        name, sql, count = self.dbmod._prepared_statement(
+            "SELECT * FROM t WHERE name = %s AND note LIKE '%%x%%' AND d <= %s::date"
+        )
+        self.assertTrue(name.startswith('stmt_'))
+        self.assertEqual(sql, "SELECT * FROM t WHERE name = $1 AND note LIKE '%x%' AND d <= $2::date")
+        self.assertEqual(count, 2)
+
+    def test_prepared_statement_skips_quoted_literals(self):
+        _, sql, count = self.dbmod._prepared_statement(
+            "SELECT * FROM t WHERE note LIKE '%sales%' AND name = %s AND tag = '%%s' AND q = 'it''s %s'"
+        )
+        self.assertEqual(sql, "SELECT * FROM t WHERE note LIKE '%sales%' AND name = $1 AND tag = '%s' AND q = 'it''s %s'")
+        self.assertEqual(count, 1)
+
+    def test_execute_prepared_rejects_param_count_mismatch(self):
+        self.manager.db_type = 'postgresql'
+        with self.assertRaises(ValueError):
+            self.manager.execute_prepared("SELECT * FROM t WHERE name = %s AND qty = %s", ("only-one",))
+
+    def test_init_schema_normalizes_transaction_dates(self):
+        self.manager.init_database()
+        self.manager.execute_many(
+            "INSERT INTO transactions (transaction_id, date, amount) VALUES (?, ?, ?)",
+            [("t1", "03/15/2024", 10.0), ("t2", "2024-02-01", 5.0)],
+        )
+        self.manager.init_database()
+        rows = self.manager.execute_query(
+            "SELECT date FROM transactions WHERE date >= ? AND date <= ? ORDER BY date",
+            ("2024-01-01", "2024-12-31"), fetch_all=True
+        )
+        self.assertEqual([row[0] for row in rows], ["2024-02-01", "2024-03-15"])
+        index = self.manager.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_transactions_date'",
+            fetch_one=True
+        )
+        self.assertIsNotNone(index)
+
+    def test_init_schema_indexes_updated_at(self):
+        self.manager.init_database()
+        for table in ("transactions", "invoices"):
+            plan = self.manager.execute_query(f"EXPLAIN QUERY PLAN SELECT MAX(updated_at) FROM {table}", fetch_all=True)
+            self.assertIn(f"idx_{table}_updated_at", " ".join(row[3] for row in plan))
+
+    def test_transaction_dates_stay_iso_on_write(self):
+        self.manager.init_database()
+        self.manager.execute_query(
+            "INSERT OR REPLACE INTO transactions (transaction_id, date, amount) VALUES (?, ?, ?)",
+            ("t1", "03/15/2024", 10.0)
+        )
+        self.manager.execute_query(
+            "INSERT INTO transactions (transaction_id, date, amount) VALUES (?, ?, ?)",
+            ("t2", "2024-02-01", 5.0)
+        )
+        self.manager.execute_query("UPDATE transactions SET date = ? WHERE transaction_id = ?", ("12/31/2023", "t2"))
+        rows = self.manager.execute_query(
+            "SELECT transaction_id, date FROM transactions ORDER BY transaction_id", fetch_all=True
+        )
+        self.assertEqual([tuple(row) for row in rows], [("t1", "2024-03-15"), ("t2", "2023-12-31")])
+
+    def test_warmup_is_noop_on_sqlite(self):
+        self.assertEqual(self.manager.warmup(n=4), 0)
+
     def test_health_check(self):
         status = self.manager.health_check()
         self.assertEqual(status.get('db_type'), 'sqlite')
         self.assertIn(status.get('status'), ('healthy', 'unhealthy'))
         self.assertIsNone(status.get('error')) if status.get('status') == 'healthy' else None
 
+    def test_statement_timeout_is_noop_on_sqlite(self):
+        with self.manager.statement_timeout(5):
+            self.assertEqual(self.manager._session.statement_timeout_ms, 5000)
+            row = self.manager.execute_query("SELECT 1 AS one", fetch_one=True)
+        self.assertEqual(row['one'], 1)
+        self.assertIsNone(self.manager._session.statement_timeout_ms)
+
+    def test_statement_timeout_sets_local_timeout_on_postgresql(self):
+        from contextlib import contextmanager
+        from unittest import mock
+        executed = []
+
+        class FakeCursor:
+            def execute(self, query, params=None):
+                executed.append((query, params))
+
+            def fetchone(self):
+                return {'one': 1}
+
+            def close(self):
+                pass
+
+        class FakeConn:
+            def cursor(self, cursor_factory=None):
+                return FakeCursor()
+
+            def commit(self):
+                pass
+
+            def rollback(self):
+                pass
+
+        @contextmanager
+        def fake_connection():
+            yield FakeConn()
+
+        self.manager.db_type = 'postgresql'
+        with mock.patch.object(self.manager, 'get_connection', fake_connection):
+            self.manager.execute_query("SELECT 1 AS one", fetch_one=True)
+            with self.manager.statement_timeout(2.5):
+                self.manager.execute_query("SELECT 1 AS one", fetch_one=True)
+        self.assertEqual(executed[0][0], "SELECT 1 AS one")
+        self.assertEqual(executed[1], ("SET LOCAL statement_timeout = %s", (2500,)))
+        self.assertEqual(executed[2][0], "SELECT 1 AS one")
+        self.assertEqual(len(executed), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,39 @@
+import time
+import unittest
+
+from DeltaCFOAgent.web_ui.report_cache import TTLCache  # type: ignore
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get_set_and_default(self):
+        cache = TTLCache(ttl=60, maxsize=4)
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get('missing', 'dflt'), 'dflt')
+        cache.set('k', {'v': 1})
+        self.assertEqual(cache.get('k'), {'v': 1})
+
+    def test_expiry(self):
+        cache = TTLCache(ttl=0.01)
+        cache.set('k', 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('k'))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # 'a' becomes most recently used
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_clear(self):
+        cache = TTLCache()
+        cache.set('k', 1)
+        cache.clear()
+        self.assertIsNone(cache.get('k'))
+
+
+if __name__ == '__main__':
+    unittest.main()
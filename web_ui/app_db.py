@@ -458,8 +458,7 @@ def create_background_job(job_type: str, total_items: int, created_by: str = 'sy
             conn.close()
 
     except Exception as e:
-        print(f"ERROR: Failed to create background job: {e}")
-        traceback.print_exc()
+        logger.exception(f"Failed to create background job: {e}")
         return None
 
 def add_job_item(job_id: str, item_name: str, item_path: str = None) -> int:
@@ -737,8 +736,7 @@ def process_invoice_batch_job(job_id: str):
 
     except Exception as e:
         error_msg = f"Job processing error: {str(e)}"
-        print(f"[ERROR] Job {job_id} failed: {error_msg}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"Job {job_id} failed: {error_msg}")
 
         update_job_progress(job_id, status='failed', error_message=error_msg)
 
@@ -1111,8 +1109,7 @@ def update_transaction_field(transaction_id: str, field: str, value: str, user:
         return (True, updated_confidence)
 
     except Exception as e:
-        print(f"ERROR: Error updating transaction field: {e}")
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"Error updating transaction field: {e}")
         try:
             conn.close()
         except:
@@ -1198,8 +1195,7 @@ Return only the JSON object, no additional text.
         print(f"ERROR: Response was: {response_text}")
         return {}
     except Exception as e:
-        print(f"ERROR: Failed to extract entity patterns: {e}")
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"Failed to extract entity patterns: {e}")
         return {}
 
 def get_claude_analyzed_similar_descriptions(context: Dict, claude_client) -> List[str]:
@@ -1794,9 +1790,7 @@ def get_claude_analyzed_similar_descriptions(context: Dict, claude_client) -> Li
             conn.close()
 
     except Exception as e:
-        import traceback
-        print(f"ERROR: Error in Claude analysis of similar descriptions: {e}")
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"Error in Claude analysis of similar descriptions: {e}")
         return []
 
 def get_similar_descriptions_from_db(context: Dict) -> List[str]:
@@ -2146,6 +2140,11 @@ def sync_csv_to_database(csv_filename=None):
                 date_value = date_value.split('T')[0]
             elif ' ' in date_value:
                 date_value = date_value.split(' ')[0]
+            if '/' in date_value:
+                try:
+                    date_value = datetime.strptime(date_value, '%m/%d/%Y').strftime('%Y-%m-%d')
+                except ValueError:
+                    pass
 
             # Debug first row
             if _ == 0:
@@ -2354,8 +2353,7 @@ def sync_csv_to_database(csv_filename=None):
         return True
 
     except Exception as e:
-        print(f"ERROR: Error syncing CSV to database: {e}")
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"Error syncing CSV to database: {e}")
         return False
 
 @app.route('/')
@@ -2591,7 +2589,6 @@ def api_test_transactions():
             })
 
     except Exception as e:
-        import traceback
         return jsonify({
             'error': str(e),
             'traceback': traceback.format_exc()
@@ -2668,7 +2665,6 @@ def api_debug_positive_transactions():
             })
 
     except Exception as e:
-        import traceback
         return jsonify({
             'error': str(e),
             'traceback': traceback.format_exc()
@@ -2718,7 +2714,6 @@ def api_reset_all_matches():
             })
 
     except Exception as e:
-        import traceback
         return jsonify({
             'success': False,
             'error': str(e),
@@ -3302,8 +3297,7 @@ def api_suggestions():
         return jsonify(result)
 
     except Exception as e:
-        print(f"ERROR: API suggestions error: {e}", flush=True)
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}", flush=True)
+        logger.exception(f"API suggestions error: {e}")
         return jsonify({
             'error': f'Failed to get AI suggestions: {str(e)}',
             'suggestions': [],
@@ -3581,8 +3575,7 @@ CRITICAL RULES:
         return jsonify(ai_response)
 
     except Exception as e:
-        print(f"ERROR: AI suggestions error: {e}")
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"AI suggestions error: {e}")
         return jsonify({
             'error': f'Failed to get AI suggestions: {str(e)}',
             'suggestions': []
@@ -3655,8 +3648,7 @@ def api_ai_apply_suggestion():
             }), 500
 
     except Exception as e:
-        print(f"ERROR: Apply AI suggestion error: {e}")
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}")
+        logger.exception(f"Apply AI suggestion error: {e}")
         return jsonify({
             'error': f'Failed to apply suggestion: {str(e)}',
             'success': False
@@ -3822,8 +3814,7 @@ Consider standard accounting practices, tax implications, and best practices for
         })
 
     except Exception as e:
-        print(f"ERROR: AI accounting category error: {e}", flush=True)
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}", flush=True)
+        logger.exception(f"AI accounting category error: {e}")
         return jsonify({
             'error': f'Failed to get AI accounting guidance: {str(e)}',
             'success': False
@@ -4164,8 +4155,7 @@ If no transactions have similar intent, return an empty array: []"""
         })
 
     except Exception as e:
-        print(f"ERROR: AI find similar transactions error: {e}", flush=True)
-        print(f"ERROR TRACEBACK: {traceback.format_exc()}", flush=True)
+        logger.exception(f"AI find similar transactions error: {e}")
         return jsonify({
             'error': f'Failed to find similar transactions: {str(e)}',
             'success': False
@@ -4575,9 +4565,7 @@ def files_page():
 
         return render_template('files.html', files=categorized_files)
     except Exception as e:
-        print(f"ERROR in files_page: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in files_page: {e}")
         return f"Error loading files: {str(e)}", 500
 
 def check_processed_file_duplicates(processed_filepath, original_filepath, tenant_id=None, include_all_duplicates=False):
@@ -4855,9 +4843,7 @@ def check_processed_file_duplicates(processed_filepath, original_filepath, tenan
         return result
 
     except Exception as e:
-        print(f"❌ Error checking duplicates: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error checking duplicates: {e}")
         return {
             'has_duplicates': False,
             'duplicate_count': 0,
@@ -5268,9 +5254,7 @@ def resolve_duplicates():
                         print(f"⚠️ Could not find processed CSV file at: {csv_path}")
 
                 except Exception as e:
-                    print(f"⚠️ Error applying modifications to CSV: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception(f"Error applying modifications to CSV: {e}")
 
             # Step 2: Sync the new processed file to database
             print(f"📥 Syncing new enriched transactions to database...")
@@ -7129,8 +7113,7 @@ CRITICAL: Make sure vendor_name is who SENT the invoice and customer_name is who
         print(f"ERROR: Invalid JSON response from Claude: {e}")
         return {'error': f'Invalid JSON response from Claude Vision: {str(e)}'}
     except Exception as e:
-        print(f"ERROR: Invoice processing failed: {e}")
-        traceback.print_exc()
+        logger.exception(f"Invoice processing failed: {e}")
         return {'error': str(e)}
 
 # ============================================================================
@@ -8745,7 +8728,6 @@ def api_enrich_all_pending():
 
     except Exception as e:
         logger.error(f"Error in bulk enrichment: {e}")
-        import traceback
         return jsonify({
             "success": False,
             "error": str(e),
@@ -5,11 +5,16 @@ Supports both SQLite (development) and PostgreSQL (production)
 """
 
 import os
+import re
+import hashlib
 import sqlite3
+import threading
+import weakref
 import psycopg2
 import psycopg2.extras
 import psycopg2.pool
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Generator, Optional, Any, Dict, List
 import time
 import logging
@@ -22,12 +27,92 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Report classifications of a transaction - the same CASE expressions as
+# migrations/add_transactions_expense_bucket.sql and
+# migrations/add_transactions_balance_buckets.sql, stored as generated columns
+EXPENSE_BUCKET_SQL = """
+    CASE WHEN amount < 0 THEN
+        CASE
+            WHEN LOWER(COALESCE(accounting_category, '')) LIKE '%material%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%inventory%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%manufacturing%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%production%'
+              OR LOWER(COALESCE(accounting_category, '')) LIKE '%supplier%' THEN 'cogs'
+            ELSE 'opex'
+        END
+    END
+"""
+ASSET_BUCKET_SQL = """
+    CASE
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%cash%' THEN 'cash'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%receivable%' THEN 'receivable'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%inventory%' THEN 'inventory'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%equipment%' THEN 'equipment'
+        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%asset%' THEN 'other_asset'
+        WHEN amount > 0 AND LOWER(COALESCE(description, '')) LIKE '%deposit%' THEN 'current_asset'
+    END
+"""
+LIABILITY_BUCKET_SQL = """
+    CASE WHEN amount < 0 THEN
+        CASE
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%payable%' THEN 'payable'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%loan%' THEN 'loan'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%debt%' THEN 'debt'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%liability%' THEN 'other_liability'
+            WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%tax%' THEN 'tax'
+            WHEN LOWER(COALESCE(description, '')) LIKE '%payment%' THEN 'current_liability'
+        END
+    END
+"""
+
+# Generated columns added to existing SQLite transactions tables by _init_sqlite_schema
+_SQLITE_GENERATED_COLUMNS = (
+    ('expense_bucket', EXPENSE_BUCKET_SQL),
+    ('asset_bucket', ASSET_BUCKET_SQL),
+    ('liability_bucket', LIABILITY_BUCKET_SQL),
+)
+
+# Quoted SQL literals, psycopg2 placeholders (%s) and escaped percent signs (%%)
+_PYFORMAT_PARAM_RE = re.compile(r"'(?:[^']|'')*'|%s|%%")
+
+
+@lru_cache(maxsize=256)
+def _prepared_statement(query: str):
+    """
+    Translate a psycopg2-style query into a server-side prepared statement.
+
+    Returns (statement_name, positional_sql, param_count). The name is derived
+    from the query text so identical queries share one prepared statement.
+    Placeholders inside quoted literals (LIKE '%sales%') are left alone; only
+    their %% escapes are undone.
+    """
+    counter = 0
+
+    def _replace(match):
+        nonlocal counter
+        token = match.group(0)
+        if token.startswith("'"):
+            return token.replace('%%', '%')
+        if token == '%%':
+            return '%'
+        counter += 1
+        return f"${counter}"
+
+    positional_sql = _PYFORMAT_PARAM_RE.sub(_replace, query)
+    name = 'stmt_' + hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+    return name, positional_sql, counter
+
+
 class DatabaseManager:
     def __init__(self):
         self.db_type = os.getenv('DB_TYPE', 'postgresql')  # Default to PostgreSQL after migration
         self.connection_config = self._get_connection_config()
         self.connection_pool = None
         self._pooled_connections = set()  # Track connection IDs from pool
+        # Prepared statement names per live PostgreSQL connection
+        self._prepared_statements = weakref.WeakKeyDictionary()
+        # Per-thread query settings (see statement_timeout)
+        self._session = threading.local()
         self._init_connection_pool()
 
     def _get_connection_config(self) -> dict:
@@ -59,7 +144,9 @@ class DatabaseManager:
             return {
                 'database': db_path,
                 'timeout': 60.0,
-                'check_same_thread': False
+                'check_same_thread': False,
+                # Report endpoints cycle through more distinct queries than the default cache holds
+                'cached_statements': 256
             }
 
     def _init_connection_pool(self):
@@ -77,13 +164,15 @@ class DatabaseManager:
                 # Remove None values
                 config = {k: v for k, v in config.items() if v is not None}
 
-                # Create connection pool
+                # Create connection pool - one per process, shared by every query
+                minconn = int(os.getenv('DB_POOL_MIN', '5'))
+                maxconn = max(minconn, int(os.getenv('DB_POOL_MAX', '20')))
                 self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                    minconn=2,  # Minimum connections
-                    maxconn=20,  # Maximum connections for Cloud SQL
+                    minconn=minconn,  # Connections opened up front
+                    maxconn=maxconn,  # Maximum connections for Cloud SQL
                     **config
                 )
-                logger.info("PostgreSQL connection pool initialized successfully")
+                logger.info(f"PostgreSQL connection pool initialized successfully ({minconn}-{maxconn} connections)")
 
             except Exception as e:
                 logger.warning(f"Failed to initialize connection pool: {e}")
@@ -180,6 +269,17 @@ class DatabaseManager:
         # Direct connections are NOT tracked in _pooled_connections
         return conn
 
+    def open_dedicated_connection(self):
+        """
+        Open a PostgreSQL connection outside the pool, owned (and closed) by the caller
+
+        For session state that has to outlive a single query, like an advisory lock.
+        """
+        config = {k: v for k, v in self.connection_config.items() if v is not None}
+        conn = psycopg2.connect(**config)
+        conn.autocommit = True
+        return conn
+
     def _get_sqlite_connection(self):
         """Create SQLite connection with optimizations"""
         config = self.connection_config
@@ -195,6 +295,22 @@ class DatabaseManager:
 
         return conn
 
+    @contextmanager
+    def statement_timeout(self, seconds: float):
+        """
+        Bound each query this thread runs inside the block to seconds (PostgreSQL)
+
+        execute_query starts those queries' transactions with SET LOCAL
+        statement_timeout, so the server cancels a runaway query instead of it
+        holding the calling thread and a pooled connection. No-op on SQLite.
+        """
+        previous = getattr(self._session, 'statement_timeout_ms', None)
+        self._session.statement_timeout_ms = int(seconds * 1000)
+        try:
+            yield
+        finally:
+            self._session.statement_timeout_ms = previous
+
     def execute_query(self, query: str, params: tuple = None, fetch_one: bool = False, fetch_all: bool = False):
         """Execute a query and return results"""
         with self.get_connection() as conn:
@@ -204,6 +320,10 @@ class DatabaseManager:
                 cursor = conn.cursor()
 
             try:
+                timeout_ms = getattr(self._session, 'statement_timeout_ms', None)
+                if timeout_ms and self.db_type == 'postgresql':
+                    cursor.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+
                 if params:
                     cursor.execute(query, params)
                 else:
@@ -225,6 +345,97 @@ class DatabaseManager:
             finally:
                 cursor.close()
 
+    def execute_prepared(self, query: str, params: tuple = None, fetch_one: bool = False,
+                         fetch_all: bool = False, name: str = None):
+        """
+        Execute a query through a server-side prepared statement (PostgreSQL)
+
+        The statement is PREPAREd once per connection and EXECUTEd with new
+        parameters afterwards, so repeated report queries skip parse/plan.
+        SQLite falls back to execute_query - sqlite3 already caches statements.
+        """
+        if self.db_type != 'postgresql':
+            return self.execute_query(query, params, fetch_one, fetch_all)
+
+        statement_name, positional_sql, param_count = _prepared_statement(query)
+        statement_name = name or statement_name
+        params = tuple(params or ())
+        if len(params) != param_count:
+            raise ValueError(
+                f"Prepared statement {statement_name} expects {param_count} parameters, got {len(params)}"
+            )
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            prepared = self._prepared_statements.setdefault(conn, set())
+
+            try:
+                if statement_name not in prepared:
+                    cursor.execute(f"PREPARE {statement_name} AS {positional_sql}")
+                    prepared.add(statement_name)
+
+                if param_count:
+                    placeholders = ', '.join(['%s'] * param_count)
+                    cursor.execute(f"EXECUTE {statement_name} ({placeholders})", params)
+                else:
+                    cursor.execute(f"EXECUTE {statement_name}")
+
+                if fetch_one:
+                    result = cursor.fetchone()
+                elif fetch_all:
+                    result = cursor.fetchall()
+                else:
+                    result = cursor.rowcount
+
+                conn.commit()
+                return result
+
+            except Exception as e:
+                conn.rollback()
+                # Prepared statements survive rollback; reset so tracking matches the server
+                prepared.clear()
+                try:
+                    cursor.execute("DEALLOCATE ALL")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                raise e
+            finally:
+                cursor.close()
+
+    def iter_query(self, query: str, params: tuple = None, batch: int = 1000):
+        """
+        Yield a query's rows without materializing the whole result set
+
+        PostgreSQL streams through a named (server-side) cursor that fetches
+        batch rows per round-trip; sqlite3 cursors already step through rows
+        lazily. The connection is held until the generator is exhausted or
+        closed.
+        """
+        with self.get_connection() as conn:
+            if self.db_type == 'postgresql':
+                cursor = conn.cursor(name='iter_query', cursor_factory=psycopg2.extras.RealDictCursor)
+                cursor.itersize = batch
+            else:
+                cursor = conn.cursor()
+                cursor.arraysize = batch
+
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                yield from cursor
+                conn.commit()
+
+            except BaseException:
+                # Includes GeneratorExit when the caller stops iterating early
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
     def execute_many(self, query: str, params_list: list):
         """Execute a query multiple times with different parameters"""
         with self.get_connection() as conn:
@@ -430,6 +641,38 @@ class DatabaseManager:
 
         return health_status
 
+    def warmup(self, n: int = 4) -> int:
+        """
+        Open up to n pooled PostgreSQL connections ahead of the first request
+
+        Connections are checked out together (so the pool really opens n of
+        them), pinged with SELECT 1 and returned. Returns the number warmed;
+        SQLite and a missing pool are no-ops.
+        """
+        if self.db_type != 'postgresql' or not self.connection_pool:
+            return 0
+
+        connections = []
+        try:
+            for _ in range(n):
+                conn = self.connection_pool.getconn()
+                connections.append(conn)
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+                conn.rollback()
+        except Exception as e:
+            logger.warning(f"Connection pool warm-up stopped after {len(connections)} connections: {e}")
+        finally:
+            for conn in connections:
+                try:
+                    self.connection_pool.putconn(conn)
+                except Exception as e:
+                    logger.error(f"Error returning connection to pool: {e}")
+
+        logger.info(f"Connection pool warmed with {len(connections)} connections")
+        return len(connections)
+
     def close_pool(self):
         """Close connection pool gracefully"""
         if self.connection_pool and self.db_type == 'postgresql':
@@ -550,6 +793,41 @@ class DatabaseManager:
                 )
             ''')
 
+            # Generated report columns - ALTER so tables created before they
+            # existed get them too (VIRTUAL columns can be added in place)
+            existing_columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(transactions)")}
+            for column, expression in _SQLITE_GENERATED_COLUMNS:
+                if column not in existing_columns:
+                    cursor.execute(
+                        f"ALTER TABLE transactions ADD COLUMN {column} TEXT GENERATED ALWAYS AS ({expression}) VIRTUAL"
+                    )
+
+            # Store transaction dates as ISO YYYY-MM-DD so range filters are
+            # plain text comparisons that can use the date index
+            cursor.execute('''
+                UPDATE transactions
+                SET date = substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)
+                WHERE date LIKE '__/__/____'
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date)")
+            # ...and keep them ISO when a writer still sends MM/DD/YYYY
+            for event in ('INSERT', 'UPDATE OF date'):
+                trigger = 'trg_transactions_iso_date_' + event.split()[0].lower()
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {trigger}
+                    AFTER {event} ON transactions
+                    WHEN NEW.date LIKE '__/__/____'
+                    BEGIN
+                        UPDATE transactions
+                        SET date = substr(NEW.date, 7, 4) || '-' || substr(NEW.date, 1, 2) || '-' || substr(NEW.date, 4, 2)
+                        WHERE rowid = NEW.rowid;
+                    END
+                ''')
+
+            # Report cache versions are MAX(updated_at) - one index seek each
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_updated_at ON transactions(updated_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_invoices_updated_at ON invoices(updated_at)")
+
             conn.commit()
             print("SQLite schema initialized successfully")
 
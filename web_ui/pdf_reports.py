@@ -20,6 +20,32 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+
+# Resolve the standard fonts used by every report once per process so
+# individual documents reuse the cached font objects instead of loading them
+# on first use. These are base-14 Type 1 fonts, so nothing is embedded.
+REPORT_FONTS = ('Helvetica', 'Helvetica-Bold')
+for _font_name in REPORT_FONTS:
+    pdfmetrics.getFont(_font_name)
+
+# Placeholder shown instead of tables/indicators when a report has no data
+NO_DATA_MESSAGE = "Sem dados para o período selecionado."
+
+# Shared blank cell for statement tables with sparse comparison columns
+EMPTY_CELL = ""
+
+# Swap US separators for Brazilian ones (1,234.56 -> 1.234,56) in one pass
+BR_NUMBER_SEPARATORS = str.maketrans(',.', '.,')
+
+# Estimated split of each balance sheet group into its detail lines.
+# Replace with real account classifications once they are available.
+BALANCE_SHEET_BREAKDOWN = {
+    'current_assets': {'cash_equivalents': 0.4, 'receivables': 0.4, 'inventory': 0.2},
+    'non_current_assets': {'fixed_assets': 0.7, 'intangible_assets': 0.3},
+    'current_liabilities': {'suppliers': 0.5, 'tax_liabilities': 0.3, 'other_current_liabilities': 0.2},
+    'non_current_liabilities': {'loans': 0.8, 'other_non_current_liabilities': 0.2},
+}
 
 class DeltaCFOReportTemplate:
     """
@@ -329,6 +355,16 @@ class DeltaCFOReportTemplate:
         else:
             return f"({currency} {abs(amount):,.2f})".replace(',', 'X').replace('.', ',').replace('X', '.')
 
+    def format_negative(self, amount: Union[float, int, None]) -> str:
+        """Format a deduction/outflow as a parenthesised amount without currency prefix"""
+        if amount is None:
+            return "(0,00)"
+
+        if amount >= 0:
+            return f"({amount:,.2f})".translate(BR_NUMBER_SEPARATORS)
+        else:
+            return f"(({abs(amount):,.2f}))".translate(BR_NUMBER_SEPARATORS)
+
     def format_percentage(self, value: Union[float, int, None], decimal_places: int = 2) -> str:
         """Format percentage values for display"""
         if value is None:
@@ -363,7 +399,8 @@ class DeltaCFOReportTemplate:
             title=self.title,
             author="Delta CFO Agent",
             subject=f"{self.company_name} - {self.title}",
-            creator="Delta CFO Agent - AI Financial Intelligence"
+            creator="Delta CFO Agent - AI Financial Intelligence",
+            invariant=1  # Deterministic output: skip per-build timestamp/ID regeneration
         )
 
         # Build PDF with header/footer
@@ -383,6 +420,13 @@ class DeltaCFOReportTemplate:
             story.append(Paragraph(title, self.styles['SectionHeader']))
         story.append(Spacer(1, 10))
 
+    def _empty_analysis_section(self) -> List:
+        """Analysis section for reports without data - skips all ratio math and table building"""
+        story = []
+        self.add_section_break(story, "Análise de Indicadores")
+        story.append(Paragraph(NO_DATA_MESSAGE, self.styles['TableData']))
+        return story
+
     def add_subsection(self, story: List, title: str) -> None:
         """Add a subsection title"""
         story.append(Paragraph(title, self.styles['SubHeader']))
@@ -627,22 +671,22 @@ class DREReport(DeltaCFOReportTemplate):
             headers,
             # Revenue section
             ["RECEITA BRUTA DE VENDAS E SERVIÇOS", self.format_currency(dre_data['receita_bruta']), self.format_currency(dre_data['prev_receita_bruta'])],
-            ["(-) Deduções da Receita Bruta", f"({self.format_currency(dre_data['deducoes_receita']).replace('R$ ', '')})", f"({self.format_currency(dre_data['prev_deducoes_receita']).replace('R$ ', '')})"],
+            ["(-) Deduções da Receita Bruta", self.format_negative(dre_data['deducoes_receita']), self.format_negative(dre_data['prev_deducoes_receita'])],
             ["(=) RECEITA LÍQUIDA", self.format_currency(dre_data['receita_liquida']), self.format_currency(dre_data['prev_receita_liquida'])],
             # Cost section
-            ["(-) Custo dos Produtos/Serviços Vendidos", f"({self.format_currency(dre_data['custo_vendas']).replace('R$ ', '')})", f"({self.format_currency(dre_data['prev_custo_vendas']).replace('R$ ', '')})"],
+            ["(-) Custo dos Produtos/Serviços Vendidos", self.format_negative(dre_data['custo_vendas']), self.format_negative(dre_data['prev_custo_vendas'])],
             ["(=) LUCRO BRUTO", self.format_currency(dre_data['lucro_bruto']), self.format_currency(dre_data['prev_lucro_bruto'])],
             # Operating expenses section
             ["(-) DESPESAS OPERACIONAIS", "", ""],
-            ["    Despesas com Vendas", f"({self.format_currency(dre_data['despesas_vendas']).replace('R$ ', '')})", ""],
-            ["    Despesas Administrativas", f"({self.format_currency(dre_data['despesas_administrativas']).replace('R$ ', '')})", ""],
-            ["    Total das Despesas Operacionais", f"({self.format_currency(dre_data['despesas_operacionais']).replace('R$ ', '')})", f"({self.format_currency(dre_data['prev_despesas_operacionais']).replace('R$ ', '')})"],
+            ["    Despesas com Vendas", self.format_negative(dre_data['despesas_vendas']), ""],
+            ["    Despesas Administrativas", self.format_negative(dre_data['despesas_administrativas']), ""],
+            ["    Total das Despesas Operacionais", self.format_negative(dre_data['despesas_operacionais']), self.format_negative(dre_data['prev_despesas_operacionais'])],
             ["(=) RESULTADO OPERACIONAL", self.format_currency(dre_data['resultado_operacional']), self.format_currency(dre_data['prev_resultado_operacional'])],
             # Financial section
-            ["(-) Despesas Financeiras", f"({self.format_currency(dre_data['despesas_financeiras']).replace('R$ ', '')})", f"({self.format_currency(dre_data['prev_despesas_financeiras']).replace('R$ ', '')})"],
+            ["(-) Despesas Financeiras", self.format_negative(dre_data['despesas_financeiras']), self.format_negative(dre_data['prev_despesas_financeiras'])],
             ["(=) RESULTADO ANTES DOS IMPOSTOS", self.format_currency(dre_data['resultado_antes_impostos']), self.format_currency(dre_data['prev_resultado_antes_impostos'])],
             # Final result section
-            ["(-) Provisão para Impostos sobre o Lucro", f"({self.format_currency(dre_data['impostos']).replace('R$ ', '')})", f"({self.format_currency(dre_data['prev_impostos']).replace('R$ ', '')})"],
+            ["(-) Provisão para Impostos sobre o Lucro", self.format_negative(dre_data['impostos']), self.format_negative(dre_data['prev_impostos'])],
             ["(=) RESULTADO LÍQUIDO DO EXERCÍCIO", self.format_currency(dre_data['resultado_liquido']), self.format_currency(dre_data['prev_resultado_liquido'])],
         ]
 
@@ -841,14 +885,19 @@ class CashFlowReport(DeltaCFOReportTemplate):
             else:
                 entity_filter_condition = ""
 
-            # Cash flows from operating activities
+            # Cash flows from operating activities - current and previous period in a single scan
             operating_query = f"""
+                WITH periods(sd, ed, tag) AS (
+                    VALUES (%s::date, %s::date, 'cur'), (%s::date, %s::date, 'prev')
+                )
                 SELECT
+                    periods.tag,
                     SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) as cash_receipts,
                     SUM(CASE WHEN amount < 0 THEN ABS(usd_equivalent) ELSE 0 END) as cash_payments
                 FROM transactions
-                WHERE date::date BETWEEN %s AND %s
+                JOIN periods ON transactions.date::date BETWEEN periods.sd AND periods.ed
                 {entity_filter_condition}
+                GROUP BY periods.tag
             """
 
             # Cash flows from investing activities
@@ -873,7 +922,14 @@ class CashFlowReport(DeltaCFOReportTemplate):
 
             all_params = params + entity_params
 
-            operating_result = db_manager.execute_query(operating_query, tuple(all_params), fetch_one=True)
+            # Previous period comparison
+            prev_start = self.start_date - relativedelta(years=1)
+            prev_end = self.end_date - relativedelta(years=1)
+            operating_params = params + [prev_start.isoformat(), prev_end.isoformat()] + entity_params
+
+            operating_rows = db_manager.execute_prepared(operating_query, tuple(operating_params), fetch_all=True)
+            operating_by_tag = {row['tag']: row for row in operating_rows or []}
+            operating_result = operating_by_tag.get('cur')
             investing_result = db_manager.execute_query(investing_query, tuple(all_params), fetch_one=True)
             financing_result = db_manager.execute_query(financing_query, tuple(all_params), fetch_one=True)
 
@@ -892,26 +948,22 @@ class CashFlowReport(DeltaCFOReportTemplate):
             net_cash_change = net_operating + net_investing + net_financing
 
             # Get beginning cash balance (simplified as total cash up to start date)
+            # Regex predicate is served by idx_transactions_description_trgm (pg_trgm)
             beginning_cash_query = f"""
                 SELECT SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) as beginning_cash
                 FROM transactions
                 WHERE date::date < %s
-                AND LOWER(COALESCE(description, classified_entity, '')) LIKE ANY(ARRAY['%cash%', '%bank%', '%deposit%'])
+                AND LOWER(COALESCE(description, classified_entity, '')) ~ '(cash|bank|deposit)'
                 {entity_filter_condition}
             """
 
             beginning_params = [self.start_date.isoformat()] + entity_params
-            beginning_result = db_manager.execute_query(beginning_cash_query, tuple(beginning_params), fetch_one=True)
+            beginning_result = db_manager.execute_prepared(beginning_cash_query, tuple(beginning_params), fetch_one=True)
             beginning_cash = float(beginning_result.get('beginning_cash', 0) or 0) if beginning_result else 0
 
             ending_cash = beginning_cash + net_cash_change
 
-            # Previous period comparison
-            prev_start = self.start_date - relativedelta(years=1)
-            prev_end = self.end_date - relativedelta(years=1)
-            prev_params = [prev_start.isoformat(), prev_end.isoformat()] + entity_params
-
-            prev_operating_result = db_manager.execute_query(operating_query, tuple(prev_params), fetch_one=True)
+            prev_operating_result = operating_by_tag.get('prev')
             prev_cash_receipts = float(prev_operating_result.get('cash_receipts', 0) or 0) if prev_operating_result else 0
             prev_cash_payments = float(prev_operating_result.get('cash_payments', 0) or 0) if prev_operating_result else 0
             prev_net_operating = prev_cash_receipts - prev_cash_payments
@@ -953,6 +1005,8 @@ class CashFlowReport(DeltaCFOReportTemplate):
     def _create_cash_flow_table(self, cash_flow_data: Dict[str, Any]) -> Table:
         """Create the main Cash Flow table following Brazilian standards"""
 
+        # Bind palette to locals once; the style list below references them many times
+        blue, grey, lgrey = self.colors['delta_blue'], self.colors['delta_grey'], self.colors['light_grey']
         current_year = self.end_date.year
         previous_year = current_year - 1
 
@@ -960,27 +1014,29 @@ class CashFlowReport(DeltaCFOReportTemplate):
         headers = ["DEMONSTRAÇÃO DE FLUXO DE CAIXA", f"{current_year}", f"{previous_year}"]
 
         # Table data following DFC structure with improved spacing
+        # (most comparison cells are blank - share one empty cell object)
+        E = EMPTY_CELL
         table_data = [
             headers,
             # Operating Activities section
-            ["FLUXO DE CAIXA DAS ATIVIDADES OPERACIONAIS", "", ""],
-            ["Recebimentos de clientes", self.format_currency(cash_flow_data['cash_receipts']), ""],
-            ["Pagamentos a fornecedores e empregados", f"({self.format_currency(cash_flow_data['cash_payments']).replace('R$ ', '')})", ""],
+            ["FLUXO DE CAIXA DAS ATIVIDADES OPERACIONAIS", E, E],
+            ["Recebimentos de clientes", self.format_currency(cash_flow_data['cash_receipts']), E],
+            ["Pagamentos a fornecedores e empregados", self.format_negative(cash_flow_data['cash_payments']), E],
             ["Caixa líquido gerado pelas atividades operacionais", self.format_currency(cash_flow_data['net_operating']), self.format_currency(cash_flow_data['prev_net_operating'])],
             # Investing Activities section
-            ["FLUXO DE CAIXA DAS ATIVIDADES DE INVESTIMENTO", "", ""],
-            ["Recebimentos por venda de ativos", self.format_currency(cash_flow_data['investing_inflows']), ""],
-            ["Pagamentos por aquisição de ativos", f"({self.format_currency(cash_flow_data['investing_outflows']).replace('R$ ', '')})", ""],
-            ["Caixa líquido usado nas atividades de investimento", self.format_currency(cash_flow_data['net_investing']), ""],
+            ["FLUXO DE CAIXA DAS ATIVIDADES DE INVESTIMENTO", E, E],
+            ["Recebimentos por venda de ativos", self.format_currency(cash_flow_data['investing_inflows']), E],
+            ["Pagamentos por aquisição de ativos", self.format_negative(cash_flow_data['investing_outflows']), E],
+            ["Caixa líquido usado nas atividades de investimento", self.format_currency(cash_flow_data['net_investing']), E],
             # Financing Activities section
-            ["FLUXO DE CAIXA DAS ATIVIDADES DE FINANCIAMENTO", "", ""],
-            ["Recebimentos de empréstimos", self.format_currency(cash_flow_data['financing_inflows']), ""],
-            ["Pagamentos de empréstimos e dividendos", f"({self.format_currency(cash_flow_data['financing_outflows']).replace('R$ ', '')})", ""],
-            ["Caixa líquido usado nas atividades de financiamento", self.format_currency(cash_flow_data['net_financing']), ""],
+            ["FLUXO DE CAIXA DAS ATIVIDADES DE FINANCIAMENTO", E, E],
+            ["Recebimentos de empréstimos", self.format_currency(cash_flow_data['financing_inflows']), E],
+            ["Pagamentos de empréstimos e dividendos", self.format_negative(cash_flow_data['financing_outflows']), E],
+            ["Caixa líquido usado nas atividades de financiamento", self.format_currency(cash_flow_data['net_financing']), E],
             # Net change and reconciliation
-            ["AUMENTO (DIMINUIÇÃO) LÍQUIDO DE CAIXA", self.format_currency(cash_flow_data['net_cash_change']), ""],
-            ["Caixa e equivalentes no início do período", self.format_currency(cash_flow_data['beginning_cash']), ""],
-            ["CAIXA E EQUIVALENTES NO FINAL DO PERÍODO", self.format_currency(cash_flow_data['ending_cash']), ""],
+            ["AUMENTO (DIMINUIÇÃO) LÍQUIDO DE CAIXA", self.format_currency(cash_flow_data['net_cash_change']), E],
+            ["Caixa e equivalentes no início do período", self.format_currency(cash_flow_data['beginning_cash']), E],
+            ["CAIXA E EQUIVALENTES NO FINAL DO PERÍODO", self.format_currency(cash_flow_data['ending_cash']), E],
         ]
 
         # Create table with improved column widths for better readability
@@ -990,7 +1046,7 @@ class CashFlowReport(DeltaCFOReportTemplate):
         # Apply custom Cash Flow styling with improved spacing
         table_style = TableStyle([
             # Header row styling
-            ('BACKGROUND', (0, 0), (-1, 0), self.colors['delta_blue']),
+            ('BACKGROUND', (0, 0), (-1, 0), blue),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 12),
@@ -1018,29 +1074,29 @@ class CashFlowReport(DeltaCFOReportTemplate):
             ('FONTNAME', (0, 15), (0, 15), 'Helvetica-Bold'), # CAIXA FINAL
 
             # Section highlighting with better visual separation
-            ('BACKGROUND', (0, 1), (-1, 1), self.colors['light_grey']),   # ATIVIDADES OPERACIONAIS
-            ('BACKGROUND', (0, 4), (-1, 4), self.colors['light_grey']),   # Líquido operacional
-            ('BACKGROUND', (0, 5), (-1, 5), self.colors['light_grey']),   # ATIVIDADES DE INVESTIMENTO
-            ('BACKGROUND', (0, 8), (-1, 8), self.colors['light_grey']),   # Líquido investimento
-            ('BACKGROUND', (0, 9), (-1, 9), self.colors['light_grey']),   # ATIVIDADES DE FINANCIAMENTO
-            ('BACKGROUND', (0, 12), (-1, 12), self.colors['light_grey']),  # Líquido financiamento
-            ('BACKGROUND', (0, 13), (-1, 13), self.colors['light_grey']),  # AUMENTO LÍQUIDO
-            ('BACKGROUND', (0, 15), (-1, 15), self.colors['delta_blue']),  # CAIXA FINAL
+            ('BACKGROUND', (0, 1), (-1, 1), lgrey),   # ATIVIDADES OPERACIONAIS
+            ('BACKGROUND', (0, 4), (-1, 4), lgrey),   # Líquido operacional
+            ('BACKGROUND', (0, 5), (-1, 5), lgrey),   # ATIVIDADES DE INVESTIMENTO
+            ('BACKGROUND', (0, 8), (-1, 8), lgrey),   # Líquido investimento
+            ('BACKGROUND', (0, 9), (-1, 9), lgrey),   # ATIVIDADES DE FINANCIAMENTO
+            ('BACKGROUND', (0, 12), (-1, 12), lgrey),  # Líquido financiamento
+            ('BACKGROUND', (0, 13), (-1, 13), lgrey),  # AUMENTO LÍQUIDO
+            ('BACKGROUND', (0, 15), (-1, 15), blue),  # CAIXA FINAL
             ('TEXTCOLOR', (0, 15), (-1, 15), colors.white),                # CAIXA FINAL text color
 
             # Enhanced spacing with line separators for major sections
-            ('LINEABOVE', (0, 4), (-1, 4), 1, self.colors['delta_grey']),   # Above líquido operacional
-            ('LINEABOVE', (0, 5), (-1, 5), 1, self.colors['delta_grey']),   # Above ATIVIDADES DE INVESTIMENTO
-            ('LINEABOVE', (0, 8), (-1, 8), 1, self.colors['delta_grey']),   # Above líquido investimento
-            ('LINEABOVE', (0, 9), (-1, 9), 1, self.colors['delta_grey']),   # Above ATIVIDADES DE FINANCIAMENTO
-            ('LINEABOVE', (0, 12), (-1, 12), 1, self.colors['delta_grey']),  # Above líquido financiamento
-            ('LINEABOVE', (0, 13), (-1, 13), 1, self.colors['delta_grey']),  # Above AUMENTO LÍQUIDO
-            ('LINEABOVE', (0, 15), (-1, 15), 2, self.colors['delta_blue']),  # Above CAIXA FINAL
+            ('LINEABOVE', (0, 4), (-1, 4), 1, grey),   # Above líquido operacional
+            ('LINEABOVE', (0, 5), (-1, 5), 1, grey),   # Above ATIVIDADES DE INVESTIMENTO
+            ('LINEABOVE', (0, 8), (-1, 8), 1, grey),   # Above líquido investimento
+            ('LINEABOVE', (0, 9), (-1, 9), 1, grey),   # Above ATIVIDADES DE FINANCIAMENTO
+            ('LINEABOVE', (0, 12), (-1, 12), 1, grey),  # Above líquido financiamento
+            ('LINEABOVE', (0, 13), (-1, 13), 1, grey),  # Above AUMENTO LÍQUIDO
+            ('LINEABOVE', (0, 15), (-1, 15), 2, blue),  # Above CAIXA FINAL
 
             # Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, self.colors['delta_grey']),
-            ('LINEBELOW', (0, 0), (-1, 0), 2, self.colors['delta_blue']),  # Header border
-            ('LINEBELOW', (0, 15), (-1, 15), 2, self.colors['delta_blue']), # Final cash border
+            ('GRID', (0, 0), (-1, -1), 0.5, grey),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, blue),  # Header border
+            ('LINEBELOW', (0, 15), (-1, 15), 2, blue), # Final cash border
         ])
 
         table.setStyle(table_style)
@@ -1048,6 +1104,9 @@ class CashFlowReport(DeltaCFOReportTemplate):
 
     def _create_cash_flow_analysis_section(self, cash_flow_data: Dict[str, Any]) -> List:
         """Create analysis section with key cash flow indicators"""
+        if not any(cash_flow_data.values()):
+            return self._empty_analysis_section()
+
         story = []
 
         self.add_section_break(story, "Análise de Indicadores")
@@ -1171,8 +1230,9 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
         from .database import db_manager
 
         try:
-            # Get balance sheet data
-            params = [self.end_date.isoformat()]
+            # Get balance sheet data - current and previous year-end positions in a single scan
+            prev_end = self.end_date - relativedelta(years=1)
+            params = [self.end_date.isoformat(), prev_end.isoformat()]
             entity_params = []
 
             if self.entity_filter:
@@ -1181,46 +1241,40 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
             else:
                 entity_filter_condition = ""
 
-            # Total assets (simplified - based on positive USD equivalent)
-            assets_query = f"""
-                SELECT
-                    SUM(CASE WHEN usd_equivalent > 0 THEN usd_equivalent ELSE 0 END) as total_assets
-                FROM transactions
-                WHERE date::date <= %s
-                {entity_filter_condition}
-            """
-
-            # Total liabilities (simplified - based on negative USD equivalent)
-            liabilities_query = f"""
+            # Total assets / liabilities (simplified - based on positive / negative USD equivalent)
+            balance_query = f"""
+                WITH periods(ed, tag) AS (
+                    VALUES (%s::date, 'cur'), (%s::date, 'prev')
+                )
                 SELECT
+                    periods.tag,
+                    SUM(CASE WHEN usd_equivalent > 0 THEN usd_equivalent ELSE 0 END) as total_assets,
                     SUM(CASE WHEN usd_equivalent < 0 THEN ABS(usd_equivalent) ELSE 0 END) as total_liabilities
                 FROM transactions
-                WHERE date::date <= %s
+                JOIN periods ON transactions.date::date <= periods.ed
                 {entity_filter_condition}
+                GROUP BY periods.tag
             """
 
             all_params = params + entity_params
-            assets_result = db_manager.execute_query(assets_query, tuple(all_params), fetch_one=True)
-            liabilities_result = db_manager.execute_query(liabilities_query, tuple(all_params), fetch_one=True)
+            balance_rows = db_manager.execute_query(balance_query, tuple(all_params), fetch_all=True)
+            balance_by_tag = {row['tag']: row for row in balance_rows or []}
+            current_result = balance_by_tag.get('cur')
 
-            total_assets = float(assets_result.get('total_assets', 0) or 0) if assets_result else 0
-            total_liabilities = float(liabilities_result.get('total_liabilities', 0) or 0) if liabilities_result else 0
+            total_assets = float(current_result.get('total_assets', 0) or 0) if current_result else 0
+            total_liabilities = float(current_result.get('total_liabilities', 0) or 0) if current_result else 0
 
             # Calculate equity
             total_equity = total_assets - total_liabilities
 
             # Previous period comparison (1 year ago)
-            prev_end = self.end_date - relativedelta(years=1)
-            prev_params = [prev_end.isoformat()] + entity_params
-
-            prev_assets_result = db_manager.execute_query(assets_query, tuple(prev_params), fetch_one=True)
-            prev_liabilities_result = db_manager.execute_query(liabilities_query, tuple(prev_params), fetch_one=True)
+            prev_result = balance_by_tag.get('prev')
 
-            prev_total_assets = float(prev_assets_result.get('total_assets', 0) or 0) if prev_assets_result else 0
-            prev_total_liabilities = float(prev_liabilities_result.get('total_liabilities', 0) or 0) if prev_liabilities_result else 0
+            prev_total_assets = float(prev_result.get('total_assets', 0) or 0) if prev_result else 0
+            prev_total_liabilities = float(prev_result.get('total_liabilities', 0) or 0) if prev_result else 0
             prev_total_equity = prev_total_assets - prev_total_liabilities
 
-            return {
+            return self._add_balance_breakdown({
                 'total_assets': total_assets,
                 'current_assets': total_assets * 0.6,  # Estimated split
                 'non_current_assets': total_assets * 0.4,
@@ -1235,11 +1289,11 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
                 'prev_current_liabilities': prev_total_liabilities * 0.7,
                 'prev_non_current_liabilities': prev_total_liabilities * 0.3,
                 'prev_total_equity': prev_total_equity
-            }
+            })
 
         except Exception as e:
             print(f"Error fetching balance sheet data: {e}")
-            return {
+            return self._add_balance_breakdown({
                 'total_assets': 0,
                 'current_assets': 0,
                 'non_current_assets': 0,
@@ -1254,11 +1308,27 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
                 'prev_current_liabilities': 0,
                 'prev_non_current_liabilities': 0,
                 'prev_total_equity': 0
-            }
-
-    def _create_balance_sheet_table(self, balance_data: Dict[str, Any]) -> Table:
+            })
+
+    @staticmethod
+    def _add_balance_breakdown(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the estimated detail lines (current and previous year) to the fetched totals"""
+        for prefix in ('', 'prev_'):
+            for group, lines in BALANCE_SHEET_BREAKDOWN.items():
+                group_total = data[prefix + group]
+                for line, share in lines.items():
+                    data[prefix + line] = group_total * share
+        return data
+
+    def _create_balance_sheet_table(self, balance_data: Dict[str, Any]) -> Union[Table, Paragraph]:
         """Create the main Balance Sheet table following Brazilian standards"""
 
+        # Nothing to break down when both years are empty
+        if not any(balance_data.values()):
+            return Paragraph(NO_DATA_MESSAGE, self.styles['TableData'])
+
+        # Bind palette to locals once; the style list below references them many times
+        blue, grey, lgrey = self.colors['delta_blue'], self.colors['delta_grey'], self.colors['light_grey']
         current_year = self.end_date.year
         previous_year = current_year - 1
 
@@ -1271,22 +1341,22 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
             # ASSETS SECTION
             ["ATIVO", "", ""],
             ["ATIVO CIRCULANTE", self.format_currency(balance_data['current_assets']), self.format_currency(balance_data['prev_current_assets'])],
-            ["    Caixa e Equivalentes", self.format_currency(balance_data['current_assets'] * 0.4), self.format_currency(balance_data['prev_current_assets'] * 0.4)],
-            ["    Contas a Receber", self.format_currency(balance_data['current_assets'] * 0.4), self.format_currency(balance_data['prev_current_assets'] * 0.4)],
-            ["    Estoques", self.format_currency(balance_data['current_assets'] * 0.2), self.format_currency(balance_data['prev_current_assets'] * 0.2)],
+            ["    Caixa e Equivalentes", self.format_currency(balance_data['cash_equivalents']), self.format_currency(balance_data['prev_cash_equivalents'])],
+            ["    Contas a Receber", self.format_currency(balance_data['receivables']), self.format_currency(balance_data['prev_receivables'])],
+            ["    Estoques", self.format_currency(balance_data['inventory']), self.format_currency(balance_data['prev_inventory'])],
             ["ATIVO NÃO CIRCULANTE", self.format_currency(balance_data['non_current_assets']), self.format_currency(balance_data['prev_non_current_assets'])],
-            ["    Imobilizado", self.format_currency(balance_data['non_current_assets'] * 0.7), self.format_currency(balance_data['prev_non_current_assets'] * 0.7)],
-            ["    Intangível", self.format_currency(balance_data['non_current_assets'] * 0.3), self.format_currency(balance_data['prev_non_current_assets'] * 0.3)],
+            ["    Imobilizado", self.format_currency(balance_data['fixed_assets']), self.format_currency(balance_data['prev_fixed_assets'])],
+            ["    Intangível", self.format_currency(balance_data['intangible_assets']), self.format_currency(balance_data['prev_intangible_assets'])],
             ["TOTAL DO ATIVO", self.format_currency(balance_data['total_assets']), self.format_currency(balance_data['prev_total_assets'])],
             # LIABILITIES & EQUITY SECTION
             ["PASSIVO E PATRIMÔNIO LÍQUIDO", "", ""],
             ["PASSIVO CIRCULANTE", self.format_currency(balance_data['current_liabilities']), self.format_currency(balance_data['prev_current_liabilities'])],
-            ["    Fornecedores", self.format_currency(balance_data['current_liabilities'] * 0.5), self.format_currency(balance_data['prev_current_liabilities'] * 0.5)],
-            ["    Obrigações Fiscais", self.format_currency(balance_data['current_liabilities'] * 0.3), self.format_currency(balance_data['prev_current_liabilities'] * 0.3)],
-            ["    Outras Obrigações", self.format_currency(balance_data['current_liabilities'] * 0.2), self.format_currency(balance_data['prev_current_liabilities'] * 0.2)],
+            ["    Fornecedores", self.format_currency(balance_data['suppliers']), self.format_currency(balance_data['prev_suppliers'])],
+            ["    Obrigações Fiscais", self.format_currency(balance_data['tax_liabilities']), self.format_currency(balance_data['prev_tax_liabilities'])],
+            ["    Outras Obrigações", self.format_currency(balance_data['other_current_liabilities']), self.format_currency(balance_data['prev_other_current_liabilities'])],
             ["PASSIVO NÃO CIRCULANTE", self.format_currency(balance_data['non_current_liabilities']), self.format_currency(balance_data['prev_non_current_liabilities'])],
-            ["    Financiamentos", self.format_currency(balance_data['non_current_liabilities'] * 0.8), self.format_currency(balance_data['prev_non_current_liabilities'] * 0.8)],
-            ["    Outras Obrigações", self.format_currency(balance_data['non_current_liabilities'] * 0.2), self.format_currency(balance_data['prev_non_current_liabilities'] * 0.2)],
+            ["    Financiamentos", self.format_currency(balance_data['loans']), self.format_currency(balance_data['prev_loans'])],
+            ["    Outras Obrigações", self.format_currency(balance_data['other_non_current_liabilities']), self.format_currency(balance_data['prev_other_non_current_liabilities'])],
             ["PATRIMÔNIO LÍQUIDO", self.format_currency(balance_data['total_equity']), self.format_currency(balance_data['prev_total_equity'])],
             ["TOTAL DO PASSIVO + PL", self.format_currency(balance_data['total_assets']), self.format_currency(balance_data['prev_total_assets'])],
         ]
@@ -1298,7 +1368,7 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
         # Apply custom Balance Sheet styling with improved spacing
         table_style = TableStyle([
             # Header row styling
-            ('BACKGROUND', (0, 0), (-1, 0), self.colors['delta_blue']),
+            ('BACKGROUND', (0, 0), (-1, 0), blue),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 12),
@@ -1327,26 +1397,26 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
             ('FONTNAME', (0, 19), (0, 19), 'Helvetica-Bold'), # TOTAL DO PASSIVO + PL
 
             # Section highlighting with better visual separation
-            ('BACKGROUND', (0, 1), (-1, 1), self.colors['light_grey']),   # ATIVO
-            ('BACKGROUND', (0, 9), (-1, 9), self.colors['light_grey']),   # TOTAL DO ATIVO
-            ('BACKGROUND', (0, 10), (-1, 10), self.colors['light_grey']),  # PASSIVO E PATRIMÔNIO LÍQUIDO
-            ('BACKGROUND', (0, 18), (-1, 18), self.colors['light_grey']),  # PATRIMÔNIO LÍQUIDO
-            ('BACKGROUND', (0, 19), (-1, 19), self.colors['delta_blue']),  # TOTAL DO PASSIVO + PL
+            ('BACKGROUND', (0, 1), (-1, 1), lgrey),   # ATIVO
+            ('BACKGROUND', (0, 9), (-1, 9), lgrey),   # TOTAL DO ATIVO
+            ('BACKGROUND', (0, 10), (-1, 10), lgrey),  # PASSIVO E PATRIMÔNIO LÍQUIDO
+            ('BACKGROUND', (0, 18), (-1, 18), lgrey),  # PATRIMÔNIO LÍQUIDO
+            ('BACKGROUND', (0, 19), (-1, 19), blue),  # TOTAL DO PASSIVO + PL
             ('TEXTCOLOR', (0, 19), (-1, 19), colors.white),                # TOTAL DO PASSIVO + PL text color
 
             # Enhanced spacing with line separators for major sections
-            ('LINEABOVE', (0, 2), (-1, 2), 1, self.colors['delta_grey']),   # Above ATIVO CIRCULANTE
-            ('LINEABOVE', (0, 6), (-1, 6), 1, self.colors['delta_grey']),   # Above ATIVO NÃO CIRCULANTE
-            ('LINEABOVE', (0, 9), (-1, 9), 2, self.colors['delta_blue']),   # Above TOTAL DO ATIVO
-            ('LINEABOVE', (0, 11), (-1, 11), 1, self.colors['delta_grey']),  # Above PASSIVO CIRCULANTE
-            ('LINEABOVE', (0, 15), (-1, 15), 1, self.colors['delta_grey']),  # Above PASSIVO NÃO CIRCULANTE
-            ('LINEABOVE', (0, 18), (-1, 18), 1, self.colors['delta_grey']),  # Above PATRIMÔNIO LÍQUIDO
-            ('LINEABOVE', (0, 19), (-1, 19), 2, self.colors['delta_blue']),  # Above TOTAL DO PASSIVO + PL
+            ('LINEABOVE', (0, 2), (-1, 2), 1, grey),   # Above ATIVO CIRCULANTE
+            ('LINEABOVE', (0, 6), (-1, 6), 1, grey),   # Above ATIVO NÃO CIRCULANTE
+            ('LINEABOVE', (0, 9), (-1, 9), 2, blue),   # Above TOTAL DO ATIVO
+            ('LINEABOVE', (0, 11), (-1, 11), 1, grey),  # Above PASSIVO CIRCULANTE
+            ('LINEABOVE', (0, 15), (-1, 15), 1, grey),  # Above PASSIVO NÃO CIRCULANTE
+            ('LINEABOVE', (0, 18), (-1, 18), 1, grey),  # Above PATRIMÔNIO LÍQUIDO
+            ('LINEABOVE', (0, 19), (-1, 19), 2, blue),  # Above TOTAL DO PASSIVO + PL
 
             # Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, self.colors['delta_grey']),
-            ('LINEBELOW', (0, 0), (-1, 0), 2, self.colors['delta_blue']),  # Header border
-            ('LINEBELOW', (0, 19), (-1, 19), 2, self.colors['delta_blue']), # Final total border
+            ('GRID', (0, 0), (-1, -1), 0.5, grey),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, blue),  # Header border
+            ('LINEBELOW', (0, 19), (-1, 19), 2, blue), # Final total border
         ])
 
         table.setStyle(table_style)
@@ -1354,6 +1424,9 @@ class BalanceSheetReport(DeltaCFOReportTemplate):
 
     def _create_balance_analysis_section(self, balance_data: Dict[str, Any]) -> List:
         """Create analysis section with key financial indicators"""
+        if not any(balance_data.values()):
+            return self._empty_analysis_section()
+
         story = []
 
         self.add_section_break(story, "Análise de Indicadores")
@@ -1495,14 +1568,19 @@ class CashFlowReport(DeltaCFOReportTemplate):
             else:
                 entity_filter_condition = ""
 
-            # Cash flows from operating activities
+            # Cash flows from operating activities - current and previous period in a single scan
             operating_query = f"""
+                WITH periods(sd, ed, tag) AS (
+                    VALUES (%s::date, %s::date, 'cur'), (%s::date, %s::date, 'prev')
+                )
                 SELECT
+                    periods.tag,
                     SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) as cash_receipts,
                     SUM(CASE WHEN amount < 0 THEN ABS(usd_equivalent) ELSE 0 END) as cash_payments
                 FROM transactions
-                WHERE date::date BETWEEN %s AND %s
+                JOIN periods ON transactions.date::date BETWEEN periods.sd AND periods.ed
                 {entity_filter_condition}
+                GROUP BY periods.tag
             """
 
             # Cash flows from investing activities
@@ -1527,7 +1605,14 @@ class CashFlowReport(DeltaCFOReportTemplate):
 
             all_params = params + entity_params
 
-            operating_result = db_manager.execute_query(operating_query, tuple(all_params), fetch_one=True)
+            # Previous period comparison
+            prev_start = self.start_date - relativedelta(years=1)
+            prev_end = self.end_date - relativedelta(years=1)
+            operating_params = params + [prev_start.isoformat(), prev_end.isoformat()] + entity_params
+
+            operating_rows = db_manager.execute_prepared(operating_query, tuple(operating_params), fetch_all=True)
+            operating_by_tag = {row['tag']: row for row in operating_rows or []}
+            operating_result = operating_by_tag.get('cur')
             investing_result = db_manager.execute_query(investing_query, tuple(all_params), fetch_one=True)
             financing_result = db_manager.execute_query(financing_query, tuple(all_params), fetch_one=True)
 
@@ -1546,26 +1631,22 @@ class CashFlowReport(DeltaCFOReportTemplate):
             net_cash_change = net_operating + net_investing + net_financing
 
             # Get beginning cash balance (simplified as total cash up to start date)
+            # Regex predicate is served by idx_transactions_description_trgm (pg_trgm)
             beginning_cash_query = f"""
                 SELECT SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) as beginning_cash
                 FROM transactions
                 WHERE date::date < %s
-                AND LOWER(COALESCE(description, classified_entity, '')) LIKE ANY(ARRAY['%cash%', '%bank%', '%deposit%'])
+                AND LOWER(COALESCE(description, classified_entity, '')) ~ '(cash|bank|deposit)'
                 {entity_filter_condition}
             """
 
             beginning_params = [self.start_date.isoformat()] + entity_params
-            beginning_result = db_manager.execute_query(beginning_cash_query, tuple(beginning_params), fetch_one=True)
+            beginning_result = db_manager.execute_prepared(beginning_cash_query, tuple(beginning_params), fetch_one=True)
             beginning_cash = float(beginning_result.get('beginning_cash', 0) or 0) if beginning_result else 0
 
             ending_cash = beginning_cash + net_cash_change
 
-            # Previous period comparison
-            prev_start = self.start_date - relativedelta(years=1)
-            prev_end = self.end_date - relativedelta(years=1)
-            prev_params = [prev_start.isoformat(), prev_end.isoformat()] + entity_params
-
-            prev_operating_result = db_manager.execute_query(operating_query, tuple(prev_params), fetch_one=True)
+            prev_operating_result = operating_by_tag.get('prev')
             prev_cash_receipts = float(prev_operating_result.get('cash_receipts', 0) or 0) if prev_operating_result else 0
             prev_cash_payments = float(prev_operating_result.get('cash_payments', 0) or 0) if prev_operating_result else 0
             prev_net_operating = prev_cash_receipts - prev_cash_payments
@@ -1607,6 +1688,8 @@ class CashFlowReport(DeltaCFOReportTemplate):
     def _create_cash_flow_table(self, cash_flow_data: Dict[str, Any]) -> Table:
         """Create the main Cash Flow table following Brazilian standards"""
 
+        # Bind palette to locals once; the style list below references them many times
+        blue, grey, lgrey = self.colors['delta_blue'], self.colors['delta_grey'], self.colors['light_grey']
         current_year = self.end_date.year
         previous_year = current_year - 1
 
@@ -1614,27 +1697,29 @@ class CashFlowReport(DeltaCFOReportTemplate):
         headers = ["DEMONSTRAÇÃO DE FLUXO DE CAIXA", f"{current_year}", f"{previous_year}"]
 
         # Table data following DFC structure with improved spacing
+        # (most comparison cells are blank - share one empty cell object)
+        E = EMPTY_CELL
         table_data = [
             headers,
             # Operating Activities section
-            ["FLUXO DE CAIXA DAS ATIVIDADES OPERACIONAIS", "", ""],
-            ["Recebimentos de clientes", self.format_currency(cash_flow_data['cash_receipts']), ""],
-            ["Pagamentos a fornecedores e empregados", f"({self.format_currency(cash_flow_data['cash_payments']).replace('R$ ', '')})", ""],
+            ["FLUXO DE CAIXA DAS ATIVIDADES OPERACIONAIS", E, E],
+            ["Recebimentos de clientes", self.format_currency(cash_flow_data['cash_receipts']), E],
+            ["Pagamentos a fornecedores e empregados", self.format_negative(cash_flow_data['cash_payments']), E],
             ["Caixa líquido gerado pelas atividades operacionais", self.format_currency(cash_flow_data['net_operating']), self.format_currency(cash_flow_data['prev_net_operating'])],
             # Investing Activities section
-            ["FLUXO DE CAIXA DAS ATIVIDADES DE INVESTIMENTO", "", ""],
-            ["Recebimentos por venda de ativos", self.format_currency(cash_flow_data['investing_inflows']), ""],
-            ["Pagamentos por aquisição de ativos", f"({self.format_currency(cash_flow_data['investing_outflows']).replace('R$ ', '')})", ""],
-            ["Caixa líquido usado nas atividades de investimento", self.format_currency(cash_flow_data['net_investing']), ""],
+            ["FLUXO DE CAIXA DAS ATIVIDADES DE INVESTIMENTO", E, E],
+            ["Recebimentos por venda de ativos", self.format_currency(cash_flow_data['investing_inflows']), E],
+            ["Pagamentos por aquisição de ativos", self.format_negative(cash_flow_data['investing_outflows']), E],
+            ["Caixa líquido usado nas atividades de investimento", self.format_currency(cash_flow_data['net_investing']), E],
             # Financing Activities section
-            ["FLUXO DE CAIXA DAS ATIVIDADES DE FINANCIAMENTO", "", ""],
-            ["Recebimentos de empréstimos", self.format_currency(cash_flow_data['financing_inflows']), ""],
-            ["Pagamentos de empréstimos e dividendos", f"({self.format_currency(cash_flow_data['financing_outflows']).replace('R$ ', '')})", ""],
-            ["Caixa líquido usado nas atividades de financiamento", self.format_currency(cash_flow_data['net_financing']), ""],
+            ["FLUXO DE CAIXA DAS ATIVIDADES DE FINANCIAMENTO", E, E],
+            ["Recebimentos de empréstimos", self.format_currency(cash_flow_data['financing_inflows']), E],
+            ["Pagamentos de empréstimos e dividendos", self.format_negative(cash_flow_data['financing_outflows']), E],
+            ["Caixa líquido usado nas atividades de financiamento", self.format_currency(cash_flow_data['net_financing']), E],
             # Net change and reconciliation
-            ["AUMENTO (DIMINUIÇÃO) LÍQUIDO DE CAIXA", self.format_currency(cash_flow_data['net_cash_change']), ""],
-            ["Caixa e equivalentes no início do período", self.format_currency(cash_flow_data['beginning_cash']), ""],
-            ["CAIXA E EQUIVALENTES NO FINAL DO PERÍODO", self.format_currency(cash_flow_data['ending_cash']), ""],
+            ["AUMENTO (DIMINUIÇÃO) LÍQUIDO DE CAIXA", self.format_currency(cash_flow_data['net_cash_change']), E],
+            ["Caixa e equivalentes no início do período", self.format_currency(cash_flow_data['beginning_cash']), E],
+            ["CAIXA E EQUIVALENTES NO FINAL DO PERÍODO", self.format_currency(cash_flow_data['ending_cash']), E],
         ]
 
         # Create table with improved column widths for better readability
@@ -1644,7 +1729,7 @@ class CashFlowReport(DeltaCFOReportTemplate):
         # Apply custom Cash Flow styling with improved spacing
         table_style = TableStyle([
             # Header row styling
-            ('BACKGROUND', (0, 0), (-1, 0), self.colors['delta_blue']),
+            ('BACKGROUND', (0, 0), (-1, 0), blue),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 12),
@@ -1672,29 +1757,29 @@ class CashFlowReport(DeltaCFOReportTemplate):
             ('FONTNAME', (0, 15), (0, 15), 'Helvetica-Bold'), # CAIXA FINAL
 
             # Section highlighting with better visual separation
-            ('BACKGROUND', (0, 1), (-1, 1), self.colors['light_grey']),   # ATIVIDADES OPERACIONAIS
-            ('BACKGROUND', (0, 4), (-1, 4), self.colors['light_grey']),   # Líquido operacional
-            ('BACKGROUND', (0, 5), (-1, 5), self.colors['light_grey']),   # ATIVIDADES DE INVESTIMENTO
-            ('BACKGROUND', (0, 8), (-1, 8), self.colors['light_grey']),   # Líquido investimento
-            ('BACKGROUND', (0, 9), (-1, 9), self.colors['light_grey']),   # ATIVIDADES DE FINANCIAMENTO
-            ('BACKGROUND', (0, 12), (-1, 12), self.colors['light_grey']),  # Líquido financiamento
-            ('BACKGROUND', (0, 13), (-1, 13), self.colors['light_grey']),  # AUMENTO LÍQUIDO
-            ('BACKGROUND', (0, 15), (-1, 15), self.colors['delta_blue']),  # CAIXA FINAL
+            ('BACKGROUND', (0, 1), (-1, 1), lgrey),   # ATIVIDADES OPERACIONAIS
+            ('BACKGROUND', (0, 4), (-1, 4), lgrey),   # Líquido operacional
+            ('BACKGROUND', (0, 5), (-1, 5), lgrey),   # ATIVIDADES DE INVESTIMENTO
+            ('BACKGROUND', (0, 8), (-1, 8), lgrey),   # Líquido investimento
+            ('BACKGROUND', (0, 9), (-1, 9), lgrey),   # ATIVIDADES DE FINANCIAMENTO
+            ('BACKGROUND', (0, 12), (-1, 12), lgrey),  # Líquido financiamento
+            ('BACKGROUND', (0, 13), (-1, 13), lgrey),  # AUMENTO LÍQUIDO
+            ('BACKGROUND', (0, 15), (-1, 15), blue),  # CAIXA FINAL
             ('TEXTCOLOR', (0, 15), (-1, 15), colors.white),                # CAIXA FINAL text color
 
             # Enhanced spacing with line separators for major sections
-            ('LINEABOVE', (0, 4), (-1, 4), 1, self.colors['delta_grey']),   # Above líquido operacional
-            ('LINEABOVE', (0, 5), (-1, 5), 1, self.colors['delta_grey']),   # Above ATIVIDADES DE INVESTIMENTO
-            ('LINEABOVE', (0, 8), (-1, 8), 1, self.colors['delta_grey']),   # Above líquido investimento
-            ('LINEABOVE', (0, 9), (-1, 9), 1, self.colors['delta_grey']),   # Above ATIVIDADES DE FINANCIAMENTO
-            ('LINEABOVE', (0, 12), (-1, 12), 1, self.colors['delta_grey']),  # Above líquido financiamento
-            ('LINEABOVE', (0, 13), (-1, 13), 1, self.colors['delta_grey']),  # Above AUMENTO LÍQUIDO
-            ('LINEABOVE', (0, 15), (-1, 15), 2, self.colors['delta_blue']),  # Above CAIXA FINAL
+            ('LINEABOVE', (0, 4), (-1, 4), 1, grey),   # Above líquido operacional
+            ('LINEABOVE', (0, 5), (-1, 5), 1, grey),   # Above ATIVIDADES DE INVESTIMENTO
+            ('LINEABOVE', (0, 8), (-1, 8), 1, grey),   # Above líquido investimento
+            ('LINEABOVE', (0, 9), (-1, 9), 1, grey),   # Above ATIVIDADES DE FINANCIAMENTO
+            ('LINEABOVE', (0, 12), (-1, 12), 1, grey),  # Above líquido financiamento
+            ('LINEABOVE', (0, 13), (-1, 13), 1, grey),  # Above AUMENTO LÍQUIDO
+            ('LINEABOVE', (0, 15), (-1, 15), 2, blue),  # Above CAIXA FINAL
 
             # Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, self.colors['delta_grey']),
-            ('LINEBELOW', (0, 0), (-1, 0), 2, self.colors['delta_blue']),  # Header border
-            ('LINEBELOW', (0, 15), (-1, 15), 2, self.colors['delta_blue']), # Final cash border
+            ('GRID', (0, 0), (-1, -1), 0.5, grey),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, blue),  # Header border
+            ('LINEBELOW', (0, 15), (-1, 15), 2, blue), # Final cash border
         ])
 
         table.setStyle(table_style)
@@ -1702,6 +1787,9 @@ class CashFlowReport(DeltaCFOReportTemplate):
 
     def _create_cash_flow_analysis_section(self, cash_flow_data: Dict[str, Any]) -> List:
         """Create analysis section with key cash flow indicators"""
+        if not any(cash_flow_data.values()):
+            return self._empty_analysis_section()
+
         story = []
 
         self.add_section_break(story, "Análise de Indicadores")
@@ -5,37 +5,1009 @@ Flask routes for financial statements and reporting functionality
 """
 
 import os
+import re
 import sys
 import json
 import logging
 import calendar
+import multiprocessing
+import threading
+import time
+import gzip
+import pickle
+import hashlib
+import functools
+import heapq
+from collections import Counter
+from operator import itemgetter
+from concurrent.futures import (
+    FIRST_EXCEPTION, ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+)
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, date, timedelta
-from flask import request, jsonify, send_file, make_response
+from dateutil.relativedelta import relativedelta
+from flask import request, make_response, Response, stream_with_context
+from werkzeug.exceptions import BadRequest
 from decimal import Decimal
-import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.colors import HexColor
+import numpy as np
+
+# Fast JSON encoding - optional, falls back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from reporting.financial_statements import FinancialStatementsGenerator
 from reporting.cash_dashboard import CashDashboard
-from .database import db_manager
-from .pdf_reports import DREReport, BalanceSheetReport
-from .cash_flow_report_new import CashFlowReport
-from .dmpl_report_new import DMPLReport
+from reporting._kernels import dmpl_kernel, variance_kernel
+from .database import db_manager, ASSET_BUCKET_SQL, EXPENSE_BUCKET_SQL, LIABILITY_BUCKET_SQL
+from .report_cache import TTLCache
+from .statement_pdf import generate_income_statement_pdf, generate_balance_sheet_pdf
 
 logger = logging.getLogger(__name__)
 
+# Category label of the grand-total row appended by _with_total_row()
+TOTAL_ROW_LABEL = '__TOTAL__'
+
+
+def _with_total_row(category_query):
+    """
+    Wrap a (category, total, count) GROUP BY query so the database also
+    returns a grand-total row, labelled TOTAL_ROW_LABEL, in the same round-trip.
+    """
+    return f"""
+        WITH cats AS ({category_query})
+        SELECT category, total, count FROM cats
+        UNION ALL
+        SELECT '{TOTAL_ROW_LABEL}', SUM(total), CAST(SUM(count) AS BIGINT) FROM cats
+        ORDER BY total DESC
+    """
+
+
+# Display labels for the generated asset_bucket / liability_bucket columns
+# (see migrations/add_transactions_balance_buckets.sql)
+ASSET_BUCKET_LABELS = {
+    'cash': 'Caixa e Equivalentes',
+    'receivable': 'Contas a Receber',
+    'inventory': 'Estoque',
+    'equipment': 'Equipamentos',
+    'other_asset': 'Outros Ativos',
+    'current_asset': 'Ativos Circulantes',
+    'estimated': 'Ativos Estimados (30% da Receita)',
+}
+LIABILITY_BUCKET_LABELS = {
+    'payable': 'Contas a Pagar',
+    'loan': 'Empréstimos',
+    'debt': 'Dívidas',
+    'other_liability': 'Outros Passivos',
+    'tax': 'Impostos a Pagar',
+    'current_liability': 'Passivos Circulantes',
+}
+
+
+# MM/DD/YYYY fallback for request dates that are not ISO formatted
+_MDY_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+
+def _parse_date(value):
+    """
+    Parse a YYYY-MM-DD or MM/DD/YYYY request date
+
+    Returns:
+        date, or None when the string matches neither format
+    """
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        m = _MDY_RE.fullmatch(value)
+        if m:
+            try:
+                return date(int(m[3]), int(m[1]), int(m[2]))
+            except ValueError:
+                return None
+        return None
+
+
+def _parse_iso_date(value, field='date'):
+    """
+    Parse a YYYY-MM-DD request date
+
+    Raises:
+        BadRequest: rendered as a JSON 400 by the reporting error handler
+    """
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f'Invalid {field} format. Use YYYY-MM-DD') from None
+
+
+def _category_variance(current_categories, previous_categories):
+    """
+    Per-category change between two periods
+
+    Categories from both periods are aligned on one index and the changes are
+    computed by variance_kernel. Same rules as the total-level changes: with
+    no previous amount the change is the full current amount and 100% (0%
+    when the current amount isn't positive).
+
+    Returns:
+        [{'category', 'current', 'previous', 'absolute', 'percentage'}] in
+        current-period order, then categories only seen in the previous period
+    """
+    index = {}
+    for row in current_categories:
+        index.setdefault(row['category'], len(index))
+    for row in previous_categories:
+        index.setdefault(row['category'], len(index))
+
+    current = np.zeros(len(index))
+    previous = np.zeros(len(index))
+    for row in current_categories:
+        current[index[row['category']]] += row['amount']
+    for row in previous_categories:
+        previous[index[row['category']]] += row['amount']
+
+    absolute, percentage = variance_kernel(current, previous)
+
+    return [
+        {
+            'category': category,
+            'current': cur,
+            'previous': prev,
+            'absolute': abs_change,
+            'percentage': pct
+        }
+        for category, cur, prev, abs_change, pct in zip(
+            index, current.tolist(), previous.tolist(),
+            absolute.round(2).tolist(), percentage.round(2).tolist()
+        )
+    ]
+
+
+def _safe_query(dbm, query, params=None, fetch_all=False, name=None, errors=None):
+    """
+    Run a query, logging and swallowing any database error
+
+    With a statement name the query goes through dbm.execute_prepared, for
+    queries that are reissued constantly with new parameters. With an errors
+    list, a swallowed error is appended to it so the caller can tell a failed
+    query from an empty result.
+
+    Returns:
+        The rows (fetch_all) or the single row; [] / {} when there is no
+        result or the query fails
+    """
+    if name:
+        execute = functools.partial(dbm.execute_prepared, name=name)
+    else:
+        execute = dbm.execute_query
+    try:
+        if fetch_all:
+            return execute(query, params, fetch_all=True) or []
+        return execute(query, params, fetch_one=True) or {}
+    except Exception as query_error:
+        logger.warning(f"Query failed safely: {query_error}")
+        if errors is not None:
+            errors.append(query_error)
+        return [] if fetch_all else {}
+
+
+# Month abbreviations indexed 1-12 ('Jan'..'Dec'), same names as strftime('%b')
+_MONTH_ABBR = tuple(calendar.month_abbr)
+
+
+def _month_label(month):
+    """Format a trend month ('2025-10' string or date) as 'Oct 2025'"""
+    if not month:
+        return 'Unknown'
+    if isinstance(month, str):
+        # '2025-10' format (SQLite and the PostgreSQL JSON trend)
+        year, _, mm = month.partition('-')
+        if year.isdigit() and mm.isdigit() and 1 <= int(mm) <= 12:
+            return f"{_MONTH_ABBR[int(mm)]} {year}"
+        return month
+    return f"{_MONTH_ABBR[month.month]} {month.year}"
+
+
+def _monthly_margins(monthly_data):
+    """
+    Revenue, expenses, net income and margin % per trend month
+
+    The arithmetic runs over NumPy arrays for all months at once; only the
+    month labels are formatted per row.
+    """
+    n = len(monthly_data)
+    revenue = np.fromiter((float(row['revenue'] or 0) for row in monthly_data), dtype=np.float64, count=n)
+    expenses = np.fromiter((float(row['expenses'] or 0) for row in monthly_data), dtype=np.float64, count=n)
+    net_income = revenue - expenses
+    margin = np.zeros(n)
+    np.divide(net_income * 100, revenue, out=margin, where=revenue > 0)
+    margin = margin.round(2)
+
+    return [
+        {
+            'month': _month_label(row['month']),
+            'revenue': rev,
+            'expenses': exp,
+            'net_income': net,
+            'margin_percent': pct
+        }
+        for row, rev, exp, net, pct in zip(
+            monthly_data, revenue.tolist(), expenses.tolist(), net_income.tolist(), margin.tolist()
+        )
+    ]
+
+
+def _monthly_pl_rows(monthly_data):
+    """
+    Monthly P&L records and period totals from the (year, month_number, totals) rows
+
+    Amounts are converted and summed as NumPy arrays for all months at once;
+    only the month labels are formatted per row. The monthly P&L queries
+    return non-NULL int/float columns, so rows are read as-is.
+
+    Returns:
+        (monthly_pl, {'total_revenue', 'total_expenses', 'total_profit'})
+    """
+    n = len(monthly_data)
+
+    def column(key):
+        return np.fromiter((row[key] for row in monthly_data), dtype=np.float64, count=n)
+
+    revenue = column('total_revenue')
+    expenses = column('total_expenses')
+    profit = column('net_profit')
+
+    monthly_pl = []
+    for row, rev, exp, prof in zip(monthly_data, revenue.tolist(), expenses.tolist(), profit.tolist()):
+        year = row['year']
+        month_number = row['month_number']
+        monthly_pl.append({
+            'month': f"{_MONTH_ABBR[month_number]} {year}",
+            'year': year,
+            'month_number': month_number,
+            'revenue': rev,
+            'expenses': exp,
+            'profit': prof,
+            'transaction_count': row['transaction_count']
+        })
+
+    totals = {
+        'total_revenue': round(float(revenue.sum()), 2),
+        'total_expenses': round(float(expenses.sum()), 2),
+        'total_profit': round(float(profit.sum()), 2),
+    }
+    return monthly_pl, totals
+
+
+# Shared workers for independent dashboard queries - lets a hung one time out
+# instead of holding the request
+_report_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ReportWorker')
+REPORT_TIMEOUT_SECONDS = 30
+
+# Full statement generation runs on its own workers, so slow statements can't
+# starve the dashboards of _report_pool threads
+_statement_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='StatementWorker')
+
+
+def _gather(*futures, timeout=None):
+    """
+    Results of futures, all within one deadline (REPORT_TIMEOUT_SECONDS by default)
+
+    The futures are awaited together, so the whole call is bounded by timeout
+    rather than timeout per future. As soon as one raises, or when the
+    deadline passes, the ones still pending are cancelled and the error (or
+    FutureTimeoutError) propagates.
+
+    Returns:
+        list of results, in the order of futures
+    """
+    done, not_done = wait(futures, timeout=timeout or REPORT_TIMEOUT_SECONDS, return_when=FIRST_EXCEPTION)
+    for future in not_done:
+        future.cancel()
+    for future in futures:
+        if future in done and future.exception() is not None:
+            future.result()
+    if not_done:
+        raise FutureTimeoutError()
+    return [future.result() for future in futures]
+
+
+def _generate_income_statement(generator, **kwargs):
+    """
+    generator.generate_income_statement with each of its queries capped at REPORT_TIMEOUT_SECONDS
+
+    A timed-out request can't stop the worker thread, but the database cancels
+    the query it is waiting on, so the thread and its connection are freed.
+    """
+    with generator.db.statement_timeout(REPORT_TIMEOUT_SECONDS):
+        return generator.generate_income_statement(**kwargs)
+
+
+# Worker processes rendering statement PDFs, per web worker
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', '2'))
+
+# Pooled connections opened when the reporting routes are registered
+POOL_WARMUP_CONNECTIONS = 4
+
+# Most frequent entities returned for the filter dropdown
+ENTITY_LIST_LIMIT = 500
+
+# Entity flow column api_entity_performance ranks by for each metric
+ENTITY_METRIC_COLUMNS = {
+    'revenue': 'total_inflows',
+    'profit': 'net_flow',
+    'transactions': 'transaction_count',
+}
+
+# Serialized report responses keyed by (path, query string, data version)
+_statement_cache = TTLCache(ttl=60, maxsize=256)
+
+# Previous-period offsets for api_period_comparison's comparison_type
+_COMPARISON_SHIFTS = {
+    'month_over_month': relativedelta(months=1),
+    'quarter_over_quarter': relativedelta(months=3),
+    'year_over_year': relativedelta(years=1),
+}
+
+# Chart.js dataset styling for api_cash_trend (inflows, outflows, net flow)
+_CASH_TREND_DATASETS = (
+    {'label': 'Inflows (+)', 'borderColor': '#10b981', 'backgroundColor': 'rgba(16, 185, 129, 0.1)', 'fill': True},
+    {'label': 'Outflows (-)', 'borderColor': '#ef4444', 'backgroundColor': 'rgba(239, 68, 68, 0.1)', 'fill': True},
+    {'label': 'Net Flow', 'borderColor': '#3b82f6', 'backgroundColor': 'rgba(59, 130, 246, 0.1)', 'fill': False,
+     'type': 'line'},
+)
+
+# Period comparison aggregates keyed by (start, end, data version)
+_period_data_cache = TTLCache(ttl=60, maxsize=256)
+
+# Data version of the transactions table - changes whenever a row is inserted or edited
+STATEMENT_VERSION_QUERY = "SELECT MAX(updated_at) AS version FROM transactions"
+
+# Data version for reports that also aggregate invoices
+CHARTS_VERSION_QUERY = """
+    SELECT
+        COALESCE(CAST((SELECT MAX(updated_at) FROM transactions) AS TEXT), '') || '|' ||
+        COALESCE(CAST((SELECT MAX(updated_at) FROM invoices) AS TEXT), '') AS version
+"""
+
+# Cached statements at least this large are also stored gzip-compressed
+GZIP_MIN_SIZE = 512
+
+# Inflow/outflow totals - the same aggregate feeds both the Cash Flow and the DMPL
+FLOW_TOTALS_QUERY = """
+    SELECT
+        CAST(SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) AS DOUBLE PRECISION) as inflows,
+        CAST(SUM(CASE WHEN amount < 0 THEN ABS(usd_equivalent) ELSE 0 END) AS DOUBLE PRECISION) as outflows
+    FROM transactions
+"""
+
+# Numeric invoice total, NULL when total_amount isn't a plain non-negative number:
+# the generated total_amount_num column (migrations/add_invoices_total_amount_num.sql)...
+INVOICE_AMOUNT_SQL = "total_amount_num"
+
+# ...or, on databases without it, the same validation evaluated per row
+INVOICE_AMOUNT_LEGACY_SQL = r"(CASE WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$' THEN total_amount::text::numeric END)"
+
+# Monthly P&L over transactions + invoices - with NaN filtering. Revenue/expenses
+# are FILTERed aggregates over the signed amounts; invoice totals are never
+# negative and always land in revenue. {in_range} is the date condition and
+# {invoice_amount} the numeric invoice total.
+# Columns are cast to int/float8 so the driver hands back Python ints and
+# floats (no Decimal parsing) and are never NULL.
+_MONTHLY_PL_SELECT = """
+    SELECT
+        EXTRACT(YEAR FROM transaction_date)::int as year,
+        EXTRACT(MONTH FROM transaction_date)::int as month_number,
+        COALESCE(SUM(amount) FILTER (WHERE amount > 0), 0)::float8 as total_revenue,
+        COALESCE(-SUM(amount) FILTER (WHERE amount < 0), 0)::float8 as total_expenses,
+        COALESCE(SUM(amount), 0)::float8 as net_profit,
+        COUNT(*) as transaction_count
+    FROM (
+        -- Transactions data (can be revenue or expenses)
+        SELECT date::date as transaction_date, amount
+        FROM transactions
+        WHERE {in_range}
+            AND amount::text != 'NaN' AND amount IS NOT NULL
+
+        UNION ALL
+
+        -- Invoices data (always revenue)
+        SELECT date::date as transaction_date, {invoice_amount}::float8 as amount
+        FROM invoices
+        WHERE {in_range}
+            AND {invoice_amount} IS NOT NULL
+    ) combined_data
+    GROUP BY 1, 2
+"""
+
+# Live monthly P&L for [start, end]
+MONTHLY_PL_QUERY = _MONTHLY_PL_SELECT.format(
+    in_range="date::date >= %s AND date::date <= %s", invoice_amount=INVOICE_AMOUNT_SQL
+) + "    ORDER BY year, month_number\n"
+MONTHLY_PL_LEGACY_QUERY = _MONTHLY_PL_SELECT.format(
+    in_range="date::date >= %s AND date::date <= %s", invoice_amount=INVOICE_AMOUNT_LEGACY_SQL
+) + "    ORDER BY year, month_number\n"
+
+# Closed months [mv_start, mv_end) from monthly_pl_mv (migrations/create_monthly_pl_mv.sql),
+# plus live aggregates for the partial months at either edge: [start, mv_start) and [mv_end, end].
+# The view itself is built on total_amount_num, so this always reads the column.
+MONTHLY_PL_MV_QUERY = """
+    SELECT year::int, month_number::int, total_revenue::float8, total_expenses::float8,
+           net_profit::float8, transaction_count
+    FROM monthly_pl_mv
+    WHERE month_start >= %s AND month_start < %s
+    UNION ALL
+""" + _MONTHLY_PL_SELECT.format(
+    in_range="(date::date >= %s AND date::date < %s OR date::date >= %s AND date::date <= %s)",
+    invoice_amount=INVOICE_AMOUNT_SQL
+) + "    ORDER BY year, month_number\n"
+
+# Seconds between monthly_pl_mv refreshes
+MONTHLY_PL_REFRESH_SECONDS = 300
+
+# Session advisory lock held by the one process that refreshes monthly_pl_mv
+MONTHLY_PL_REFRESH_LOCK_KEY = 0x6D706C5F6D76  # 'mpl_mv'
+
+# First and last transaction/invoice dates for api_monthly_pl's months_back=all -
+# separate MIN/MAX per table so each can be answered from its date index
+DATA_DATE_RANGE_QUERY = """
+    SELECT
+        LEAST(
+            (SELECT MIN(date::date) FROM transactions),
+            (SELECT MIN(date::date) FROM invoices)
+        ) as min_date,
+        GREATEST(
+            (SELECT MAX(date::date) FROM transactions),
+            (SELECT MAX(date::date) FROM invoices)
+        ) as max_date
+"""
+
+# The date range only moves at ingest - keep it for as long as the MV refresh interval
+_date_range_cache = TTLCache(ttl=MONTHLY_PL_REFRESH_SECONDS, maxsize=1)
+
+
+def _monthly_pl_split(start_date, end_date, today):
+    """
+    Whole closed months of [start_date, end_date] that monthly_pl_mv can serve
+
+    Returns (mv_start, mv_end) - first-of-month dates, mv_end exclusive - or
+    None when no such month fits. The current month (as of today) is never
+    taken from the view; the days outside [mv_start, mv_end) are queried live.
+    """
+    mv_start = start_date if start_date.day == 1 else start_date.replace(day=1) + relativedelta(months=1)
+    mv_end = min((end_date + timedelta(days=1)).replace(day=1), today.replace(day=1))
+    if mv_start >= mv_end:
+        return None
+    return mv_start, mv_end
+
+
+def _data_date_range():
+    """
+    (min_date, max_date) across transactions and invoices, through _date_range_cache
+
+    Returns:
+        tuple of dates, or None when there's no data yet (not cached)
+    """
+    date_range = _date_range_cache.get('all')
+    if date_range is None:
+        row = db_manager.execute_prepared(DATA_DATE_RANGE_QUERY, fetch_one=True, name='monthly_pl_range_v2')
+        if not row or not row['min_date']:
+            return None
+        date_range = (row['min_date'], row['max_date'])
+        _date_range_cache.set('all', date_range)
+    return date_range
+
+
+def _refresh_monthly_pl_mv(interval=MONTHLY_PL_REFRESH_SECONDS):
+    """
+    Refresh monthly_pl_mv every interval seconds, forever (run on a daemon thread)
+
+    Every worker process starts this loop, but only the one holding the
+    MONTHLY_PL_REFRESH_LOCK_KEY advisory lock refreshes. The lock lives on a
+    dedicated connection, so when the owner exits (or its connection drops)
+    another worker takes it over on its next tick.
+    """
+    conn = None
+    owner = False
+    while True:
+        time.sleep(interval)
+        try:
+            if not _has_monthly_pl_mv():
+                continue
+            if conn is None:
+                conn = db_manager.open_dedicated_connection()
+            with conn.cursor() as cursor:
+                if not owner:
+                    cursor.execute("SELECT pg_try_advisory_lock(%s)", (MONTHLY_PL_REFRESH_LOCK_KEY,))
+                    owner = cursor.fetchone()[0]
+                if owner:
+                    cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY monthly_pl_mv")
+        except Exception as e:
+            logger.warning(f"monthly_pl_mv refresh failed: {e}")
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            conn = None
+            owner = False
+
+
+def _json_default(obj):
+    """Encode the non-JSON types our statements carry (Decimal totals, period dates, NumPy scalars)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj):
+    """Serialize obj to JSON bytes (orjson when installed); datetimes become ISO strings"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes (orjson when installed); raises ValueError on bad input"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_response(obj, status=200):
+    """Serialize obj straight to a JSON Response"""
+    return Response(_json_dumps(obj), status=status, mimetype='application/json')
+
+
+def _elapsed_ms(start_ns):
+    """Milliseconds since start_ns, a time.perf_counter_ns() reading"""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
+# Income statement sections that carry transaction lines when include_details is set
+STATEMENT_DETAIL_SECTIONS = ('revenue', 'cost_of_goods_sold', 'operating_expenses', 'other_income_expenses')
+
+
+def _emit_ndjson(statement):
+    """
+    Yield an income statement as NDJSON: one line per transaction, then the statement
+
+    Transaction lines are {'type': 'transaction', 'section': ..., **row}; the final
+    line is {'type': 'statement', 'success': True, 'statement': ...} with the
+    transaction lists removed.
+    """
+    summary = dict(statement)
+    for section in STATEMENT_DETAIL_SECTIONS:
+        data = statement.get(section)
+        if not isinstance(data, dict):
+            continue
+        for row in data.get('transactions') or ():
+            yield _json_dumps({'type': 'transaction', 'section': section, **row}) + b'\n'
+        summary[section] = {k: v for k, v in data.items() if k != 'transactions'}
+
+    yield _json_dumps({'type': 'statement', 'success': True, 'statement': summary}) + b'\n'
+
+
+def _conditional_json_response(body, etag, gzipped=None):
+    """
+    Return cached JSON bytes, or an empty 304 when the client already has this ETag
+
+    When a pre-compressed body is available and the client accepts gzip, that
+    variant is sent instead under its own ETag.
+    """
+    if gzipped is not None and 'gzip' in request.accept_encodings:
+        body, etag = gzipped, f"{etag}-gz"
+    else:
+        gzipped = None
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if gzipped is not None:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _data_version(version_query=STATEMENT_VERSION_QUERY, version_name='statement_version_v1'):
+    """Current data version for cache keys (str - 'None' while the table is empty); raises if the probe fails"""
+    version_row = db_manager.execute_prepared(version_query, fetch_one=True, name=version_name)
+    return str(version_row['version']) if version_row else None
+
+
+def cached_statement(view=None, *, version_query=STATEMENT_VERSION_QUERY, version_name='statement_version_v1'):
+    """
+    Serve a report endpoint from _statement_cache while its source data is unchanged
+
+    The cache key includes the data version (MAX(updated_at) by default, or
+    version_query), so inserts and edits invalidate it on the next request; the
+    60s TTL bounds staleness for deletes. Error responses, and responses marked
+    Cache-Control: no-store, are never cached. Bodies of GZIP_MIN_SIZE bytes or
+    more are gzipped once when cached, so repeat requests never recompress.
+
+    Use bare (@cached_statement) or with a version query
+    (@cached_statement(version_query=..., version_name=...)).
+    """
+    if view is None:
+        return functools.partial(cached_statement, version_query=version_query, version_name=version_name)
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            version = _data_version(version_query, version_name)
+        except Exception as e:
+            logger.warning(f"Statement cache bypassed, version probe failed: {e}")
+            return view(*args, **kwargs)
+
+        cache_key = (request.path, request.query_string, version)
+        cached = _statement_cache.get(cache_key)
+
+        if cached is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.cache_control.no_store:
+                return response
+
+            body = response.get_data()
+            gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+            cached = (hashlib.blake2b(body, digest_size=16).hexdigest(), body, gzipped)
+            _statement_cache.set(cache_key, cached)
+
+        etag, body, gzipped = cached
+        return _conditional_json_response(body, etag, gzipped)
+
+    return wrapper
+
+
+def _split_total_row(rows, key='category'):
+    """Separate the grand-total row from category rows; returns (category_rows, total_row)"""
+    category_rows = []
+    total_row = None
+    for row in rows or []:
+        if row[key] == TOTAL_ROW_LABEL:
+            total_row = row
+        else:
+            category_rows.append(row)
+    return category_rows, total_row
+
+
+def _entity_summary_record(row):
+    """
+    api_entity_summary entry for one ENTITY_SUMMARY_QUERIES row
+
+    Every metric and classification comes from the query; only rounding for
+    display happens here.
+    """
+    return {
+        'entity': row['entity'],
+        'financial_metrics': {
+            'total_revenue': row['total_revenue'],
+            'total_expenses': row['total_expenses'],
+            'net_profit': row['net_profit'],
+            'profit_margin_percent': round(row['profit_margin'], 2),
+            'roi_percent': round(row['roi'], 2),
+            'efficiency_ratio': round(row['efficiency_ratio'], 2)
+        },
+        'transaction_metrics': {
+            'total_transactions': row['total_transactions'],
+            'revenue_transactions': row['revenue_transactions'],
+            'expense_transactions': row['expense_transactions'],
+            'avg_revenue_per_transaction': round(row['avg_revenue_per_transaction'], 2),
+            'avg_expense_per_transaction': round(row['avg_expense_per_transaction'], 2),
+            'transaction_volume_score': row['transaction_volume_score']  # Scale 0-100
+        },
+        'performance_analysis': {
+            'performance_tier': row['performance_tier'],
+            'risk_level': row['risk_level'],
+            'profitability_status': row['profitability_status'],
+            'growth_potential': row['growth_potential']
+        },
+        'range_analysis': {
+            'min_revenue_transaction': row['min_revenue_transaction'],
+            'max_revenue_transaction': row['max_revenue_transaction'],
+            'min_expense_transaction': row['min_expense_transaction'],
+            'max_expense_transaction': row['max_expense_transaction']
+        }
+    }
+
+
+def _as_dicts(rows):
+    """
+    Rows as JSON-serializable dicts
+
+    PostgreSQL RealDictRows already are dicts and are returned as-is; only
+    sqlite3.Row results are copied into plain dicts.
+    """
+    if rows and not isinstance(rows[0], dict):
+        return [dict(row) for row in rows]
+    return rows or []
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_template_config(config_json):
+    try:
+        return _json_loads(config_json)
+    except (ValueError, TypeError):
+        return {}
+
+
+def _template_config(value):
+    """
+    A report template's config as a dict
+
+    PostgreSQL's JSONB column already comes back as a dict; SQLite's TEXT
+    column is parsed once per distinct value and then served from cache.
+    Unparseable configs become {}.
+    """
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode()
+    return _parse_template_config(value) if isinstance(value, str) else {}
+
+
+def _category_rows(rows, labels=None):
+    """
+    Shape (category, total, count) query rows as the API's category list in one pass
+
+    With labels, rows carry a 'bucket' key that is mapped to its display label.
+    """
+    if labels is None:
+        return [{'category': row['category'], 'amount': row['total'] or 0.0, 'count': row['count']} for row in rows]
+    return [{'category': labels[row['bucket']], 'amount': row['total'] or 0.0, 'count': row['count']} for row in rows]
+
+
+# Simplified statement queries - module constants so each runs as a named
+# prepared statement (see DatabaseManager.execute_prepared)
+
+# Income statement revenue: positive amounts by category, plus the total row
+SIMPLE_REVENUE_QUERY = _with_total_row("""
+    SELECT
+        COALESCE(accounting_category, classified_entity, 'Uncategorized Revenue') as category,
+        CAST(SUM(COALESCE(usd_equivalent, amount, 0)) AS DOUBLE PRECISION) as total,
+        COUNT(*) as count
+    FROM transactions
+    WHERE amount > 0
+    GROUP BY COALESCE(accounting_category, classified_entity, 'Uncategorized Revenue')
+""")
+
+def _simple_opex_query(bucket):
+    """Income statement opex: outflows outside cost of goods by category, plus the total row"""
+    return _with_total_row(f"""
+    SELECT
+        COALESCE(accounting_category, classified_entity, 'General & Administrative') as category,
+        CAST(SUM(ABS(COALESCE(usd_equivalent, amount, 0))) AS DOUBLE PRECISION) as total,
+        COUNT(*) as count
+    FROM transactions
+    WHERE amount < 0
+    AND {bucket} = 'opex'
+    GROUP BY COALESCE(accounting_category, classified_entity, 'General & Administrative')
+""")
+
+
+# Filtered on the generated expense_bucket column...
+SIMPLE_OPEX_QUERY = _simple_opex_query('expense_bucket')
+
+# ...or, on databases without it, on the same CASE evaluated per row
+SIMPLE_OPEX_LEGACY_QUERY = _simple_opex_query(f"({EXPENSE_BUCKET_SQL})")
+
+def _simple_assets_query(bucket):
+    """Balance sheet assets by positive bucket, or one 30%-of-revenue estimate row when none are positive"""
+    return f"""
+    WITH a AS (
+        SELECT
+            {bucket} as bucket,
+            CAST(SUM(COALESCE(usd_equivalent, amount, 0)) AS DOUBLE PRECISION) as total,
+            COUNT(*) as count
+        FROM transactions
+        WHERE {bucket} IS NOT NULL
+        GROUP BY 1
+    ),
+    r AS (
+        SELECT CAST(SUM(COALESCE(usd_equivalent, amount, 0)) * 0.3 AS DOUBLE PRECISION) as est
+        FROM transactions
+        WHERE amount > 0
+    )
+    SELECT bucket, total, count FROM a WHERE total > 0
+    UNION ALL
+    SELECT 'estimated', est, 1 FROM r
+    WHERE NOT EXISTS (SELECT 1 FROM a WHERE total > 0)
+    ORDER BY total DESC
+"""
+
+
+def _simple_liabilities_query(bucket):
+    """Balance sheet liabilities by positive bucket"""
+    return f"""
+    SELECT
+        {bucket} as bucket,
+        CAST(SUM(ABS(COALESCE(usd_equivalent, amount, 0))) AS DOUBLE PRECISION) as total,
+        COUNT(*) as count
+    FROM transactions
+    WHERE {bucket} IS NOT NULL
+    GROUP BY 1
+    HAVING SUM(ABS(COALESCE(usd_equivalent, amount, 0))) > 0
+    ORDER BY total DESC
+"""
+
+
+# Grouped on the generated asset_bucket / liability_bucket columns...
+SIMPLE_ASSETS_QUERY = _simple_assets_query('asset_bucket')
+SIMPLE_LIABILITIES_QUERY = _simple_liabilities_query('liability_bucket')
+
+# ...or, on databases without them, on the same CASE evaluated per row
+SIMPLE_ASSETS_LEGACY_QUERY = _simple_assets_query(ASSET_BUCKET_SQL)
+SIMPLE_LIABILITIES_LEGACY_QUERY = _simple_liabilities_query(LIABILITY_BUCKET_SQL)
+
+# Seconds before a schema probe that found a column missing is repeated
+SCHEMA_PROBE_TTL_SECONDS = 300
+
+# Columns (and views) found present stay known for the life of the process;
+# missing ones are re-probed once their entry expires, so a migration applied
+# while the app is running gets picked up
+_known_columns = set()
+_missing_columns = TTLCache(ttl=SCHEMA_PROBE_TTL_SECONDS, maxsize=64)
+
+
+def _has_column(table, column):
+    """Whether table.column exists in the connected database"""
+    key = (table, column)
+    if key in _known_columns:
+        return True
+    if _missing_columns.get(key):
+        return False
+
+    if db_manager.db_type == 'postgresql':
+        row = db_manager.execute_query(
+            "SELECT 1 AS present FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = %s AND column_name = %s",
+            (table, column), fetch_one=True
+        )
+    else:
+        row = db_manager.execute_query(
+            "SELECT 1 AS present FROM pragma_table_xinfo(?) WHERE name = ?", (table, column), fetch_one=True
+        )
+
+    if row:
+        _known_columns.add(key)
+        return True
+    _missing_columns.set(key, True)
+    return False
+
+
+def _has_monthly_pl_mv():
+    """Whether the monthly_pl_mv view exists, cached like _has_column"""
+    if db_manager.db_type != 'postgresql':
+        return False
+    key = ('monthly_pl_mv', None)
+    if key in _known_columns:
+        return True
+    if _missing_columns.get(key):
+        return False
+
+    row = db_manager.execute_query("SELECT to_regclass('monthly_pl_mv') IS NOT NULL AS present", fetch_one=True)
+    if row and row['present']:
+        _known_columns.add(key)
+        return True
+    _missing_columns.set(key, True)
+    return False
+
+
+def _invoice_amount_sql():
+    """The numeric invoice total expression for the connected database"""
+    return INVOICE_AMOUNT_SQL if _has_column('invoices', 'total_amount_num') else INVOICE_AMOUNT_LEGACY_SQL
+
+
+# Worker processes for ReportLab rendering - CPU-bound, so it runs outside the
+# web worker's interpreter (and GIL). Created on the first PDF export, from a
+# forkserver rather than by forking this process: it runs threads (report
+# pool, pool warmup, MV refresh) and holds database sockets, and a fork could
+# copy a lock some thread holds at that moment.
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _discard_pdf_pool(pool):
+    """Stop pool's worker processes - including one stuck rendering - and forget it"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    # ProcessPoolExecutor can't cancel a running task; terminating its
+    # processes is the only way to get the worker back
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_pdf(render, statement_data):
+    """
+    Render a statement PDF in the worker processes
+
+    Falls back to rendering in-process if the pool has broken (e.g. a worker
+    was killed) or the renderer can't be sent to it (module re-imported under
+    another name). After REPORT_TIMEOUT_SECONDS the pool is torn down, so the
+    stuck render doesn't keep its worker, and FutureTimeoutError is raised.
+
+    Returns:
+        The PDF bytes
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_RENDER_WORKERS, mp_context=multiprocessing.get_context('forkserver')
+            )
+        pool = _pdf_pool
+
+    try:
+        return pool.submit(render, statement_data).result(timeout=REPORT_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        logger.warning(f"PDF render exceeded {REPORT_TIMEOUT_SECONDS}s - restarting the PDF worker pool")
+        _discard_pdf_pool(pool)
+        raise
+    except BrokenProcessPool:
+        logger.warning("PDF worker pool broken - rendering in-process")
+        with _pdf_pool_lock:
+            if _pdf_pool is pool:
+                _pdf_pool = None
+        return render(statement_data)
+    except pickle.PicklingError as e:
+        logger.warning(f"PDF renderer not picklable ({e}) - rendering in-process")
+        return render(statement_data)
+
+
+def _pdf_response(pdf_bytes, filename):
+    """PDF download response over the rendered bytes (no BytesIO/send_file copy)"""
+    return Response(pdf_bytes, mimetype='application/pdf', headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Content-Length': str(len(pdf_bytes)),
+    })
+
 
 def register_reporting_routes(app):
     """Register all CFO reporting routes with the Flask app"""
 
+    # Driver is fixed for the life of the process - resolve it once for every handler
+    IS_PG = db_manager.db_type == 'postgresql'
+
+    # Bind-parameter placeholder for the configured driver
+    PH = '%s' if IS_PG else '?'
+
+    # Open pooled connections in the background so the first report request
+    # doesn't pay the connection handshake
+    threading.Thread(
+        target=db_manager.warmup,
+        kwargs={'n': POOL_WARMUP_CONNECTIONS},
+        name='PoolWarmup',
+        daemon=True
+    ).start()
+
+    # Keep the closed-month P&L aggregates behind api_monthly_pl current
+    if IS_PG:
+        threading.Thread(target=_refresh_monthly_pl_mv, name='MonthlyPLRefresh', daemon=True).start()
+
+    @app.errorhandler(BadRequest)
+    def reports_bad_request(e):
+        """Render request validation errors (e.g. _parse_iso_date) as JSON for the reporting API"""
+        if not request.path.startswith('/api/reports/'):
+            return e
+        return _json_response({
+            'success': False,
+            'error': e.description
+        }, 400)
+
     @app.route('/api/reports/income-statement', methods=['GET', 'POST'])
     def api_income_statement():
         """
@@ -47,46 +1019,45 @@ def register_reporting_routes(app):
             - period_id: Accounting period ID (optional)
             - include_details: Include transaction details (true/false)
             - comparison_period_id: Period to compare against (optional)
+            - stream: Return NDJSON - one line per transaction, then the statement (1/true)
 
         Returns:
             JSON with complete Income Statement data
         """
         try:
-            # Parse parameters
-            start_date_str = request.args.get('start_date') or request.json.get('start_date') if request.method == 'POST' else None
-            end_date_str = request.args.get('end_date') or request.json.get('end_date') if request.method == 'POST' else None
-            period_id = request.args.get('period_id') or request.json.get('period_id') if request.method == 'POST' else None
-            include_details = request.args.get('include_details', 'false').lower() == 'true' or \
-                            (request.json.get('include_details', False) if request.method == 'POST' else False)
-            comparison_period_id = request.args.get('comparison_period_id') or \
-                                 (request.json.get('comparison_period_id') if request.method == 'POST' else None)
+            # Parse parameters - query string first, then the JSON body (parsed once)
+            payload = (request.get_json(silent=True) or {}) if request.method == 'POST' else {}
+            args = request.args
+
+            def _g(key, default=None):
+                return args.get(key, payload.get(key, default))
+
+            start_date_str = _g('start_date')
+            end_date_str = _g('end_date')
+            period_id = _g('period_id')
+            include_details = str(_g('include_details', False)).lower() == 'true'
+            comparison_period_id = _g('comparison_period_id')
+            stream = str(_g('stream', False)).lower() in ('1', 'true')
 
             # Parse dates
             start_date = None
             end_date = None
 
             if start_date_str:
-                try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        start_date = datetime.strptime(start_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        return jsonify({'error': 'Invalid start_date format. Use YYYY-MM-DD or MM/DD/YYYY'}), 400
+                start_date = _parse_date(start_date_str)
+                if start_date is None:
+                    return _json_response({'error': 'Invalid start_date format. Use YYYY-MM-DD or MM/DD/YYYY'}, 400)
 
             if end_date_str:
-                try:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        end_date = datetime.strptime(end_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD or MM/DD/YYYY'}), 400
+                end_date = _parse_date(end_date_str)
+                if end_date is None:
+                    return _json_response({'error': 'Invalid end_date format. Use YYYY-MM-DD or MM/DD/YYYY'}, 400)
 
             # Generate statement
             generator = FinancialStatementsGenerator()
 
-            statement = generator.generate_income_statement(
+            future = _statement_pool.submit(
+                _generate_income_statement, generator,
                 period_id=int(period_id) if period_id else None,
                 start_date=start_date,
                 end_date=end_date,
@@ -94,165 +1065,245 @@ def register_reporting_routes(app):
                 include_details=include_details
             )
 
-            return jsonify({
+            try:
+                statement = future.result(timeout=REPORT_TIMEOUT_SECONDS)
+            except FutureTimeoutError:
+                logger.error(f"Income statement generation exceeded {REPORT_TIMEOUT_SECONDS}s")
+                return _json_response({
+                    'success': False,
+                    'error': f'Income statement generation timed out after {REPORT_TIMEOUT_SECONDS} seconds'
+                }, 504)
+
+            if stream:
+                return Response(stream_with_context(_emit_ndjson(statement)), mimetype='application/x-ndjson')
+
+            return _json_response({
                 'success': True,
                 'statement': statement
             })
 
         except Exception as e:
-            logger.error(f"Error generating income statement: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating income statement: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
-    @app.route('/api/reports/income-statement/simple', methods=['GET'])
-    def api_income_statement_simple():
+    def build_income_statement_simple():
         """
-        Generate simplified Income Statement using direct SQL (fast)
-        This endpoint uses the optimized query approach from test_pl_simple.py
-
-        Returns:
-            JSON with simplified P&L data
+        Build the simplified Income Statement using direct SQL (fast)
+        Shared by /api/reports/income-statement/simple, /api/reports/bundle and the PDF export
         """
-        try:
-            start_time = datetime.now()
+        now = datetime.now()
+        start_time = time.perf_counter_ns()
 
-            # Revenue: All positive amounts
-            revenue_query = """
-                SELECT
-                    COALESCE(accounting_category, classified_entity, 'Uncategorized Revenue') as category,
-                    SUM(COALESCE(usd_equivalent, amount, 0)) as total,
-                    COUNT(*) as count
-                FROM transactions
-                WHERE amount > 0
-                GROUP BY COALESCE(accounting_category, classified_entity, 'Uncategorized Revenue')
-                ORDER BY total DESC
-            """
-            revenue_data = db_manager.execute_query(revenue_query, fetch_all=True)
+        # Revenue: All positive amounts (categories + grand total in one query)
+        revenue_data = db_manager.execute_prepared(SIMPLE_REVENUE_QUERY, fetch_all=True, name='pl_revenue_v1')
 
-            total_revenue = Decimal('0')
-            revenue_categories = []
+        revenue_rows, revenue_total_row = _split_total_row(revenue_data)
+        total_revenue = (revenue_total_row['total'] or 0.0) if revenue_total_row else 0.0
+        revenue_count = (revenue_total_row['count'] or 0) if revenue_total_row else 0
+        revenue_categories = _category_rows(revenue_rows)
 
-            for row in revenue_data:
-                amount = Decimal(str(row['total'] or 0))
-                revenue_categories.append({
-                    'category': row['category'],
-                    'amount': float(amount),
-                    'count': row['count']
-                })
-                total_revenue += amount
+        # Operating Expenses: negative amounts outside cost of goods (generated expense_bucket
+        # column, classified inline on databases without it)
+        if _has_column('transactions', 'expense_bucket'):
+            opex_data = db_manager.execute_prepared(SIMPLE_OPEX_QUERY, fetch_all=True, name='pl_opex_v1')
+        else:
+            opex_data = db_manager.execute_prepared(SIMPLE_OPEX_LEGACY_QUERY, fetch_all=True, name='pl_opex_legacy_v1')
 
-            # Operating Expenses: All negative amounts
-            opex_query = """
-                SELECT
-                    COALESCE(accounting_category, classified_entity, 'General & Administrative') as category,
-                    SUM(ABS(COALESCE(usd_equivalent, amount, 0))) as total,
-                    COUNT(*) as count
-                FROM transactions
-                WHERE amount < 0
-                AND LOWER(COALESCE(accounting_category, '')) NOT LIKE '%material%'
-                AND LOWER(COALESCE(accounting_category, '')) NOT LIKE '%inventory%'
-                AND LOWER(COALESCE(accounting_category, '')) NOT LIKE '%manufacturing%'
-                AND LOWER(COALESCE(accounting_category, '')) NOT LIKE '%production%'
-                AND LOWER(COALESCE(accounting_category, '')) NOT LIKE '%supplier%'
-                GROUP BY COALESCE(accounting_category, classified_entity, 'General & Administrative')
-                ORDER BY total DESC
-            """
-            opex_data = db_manager.execute_query(opex_query, fetch_all=True)
+        opex_rows, opex_total_row = _split_total_row(opex_data)
+        total_opex = (opex_total_row['total'] or 0.0) if opex_total_row else 0.0
+        opex_count = (opex_total_row['count'] or 0) if opex_total_row else 0
+        opex_categories = _category_rows(opex_rows)
 
-            total_opex = Decimal('0')
-            opex_categories = []
-
-            for row in opex_data:
-                amount = Decimal(str(row['total'] or 0))
-                opex_categories.append({
-                    'category': row['category'],
-                    'amount': float(amount),
-                    'count': row['count']
-                })
-                total_opex += amount
+        # Calculate metrics
+        gross_profit = total_revenue
+        operating_income = gross_profit - total_opex
+        net_income = operating_income
 
-            # Calculate metrics
-            gross_profit = total_revenue
-            operating_income = gross_profit - total_opex
-            net_income = operating_income
+        gross_margin = (gross_profit / total_revenue * 100) if total_revenue > 0 else 0
+        operating_margin = (operating_income / total_revenue * 100) if total_revenue > 0 else 0
+        net_margin = (net_income / total_revenue * 100) if total_revenue > 0 else 0
 
-            gross_margin = (gross_profit / total_revenue * 100) if total_revenue > 0 else 0
-            operating_margin = (operating_income / total_revenue * 100) if total_revenue > 0 else 0
-            net_margin = (net_income / total_revenue * 100) if total_revenue > 0 else 0
+        generation_time_ms = _elapsed_ms(start_time)
 
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        return {
+            'statement_type': 'IncomeStatement',
+            'statement_name': 'Income Statement - All Periods',
+            'generated_at': now,
+            'generation_time_ms': generation_time_ms,
+
+            'revenue': {
+                'total': float(total_revenue),
+                'categories': revenue_categories
+            },
 
-            return jsonify({
-                'success': True,
-                'statement': {
-                    'statement_type': 'IncomeStatement',
-                    'statement_name': 'Income Statement - All Periods',
-                    'generated_at': datetime.now().isoformat(),
-                    'generation_time_ms': generation_time_ms,
+            'cost_of_goods_sold': {
+                'total': 0,
+                'categories': []
+            },
 
-                    'revenue': {
-                        'total': float(total_revenue),
-                        'categories': revenue_categories
-                    },
+            'gross_profit': {
+                'amount': float(gross_profit),
+                'margin_percent': round(float(gross_margin), 2)
+            },
 
-                    'cost_of_goods_sold': {
-                        'total': 0,
-                        'categories': []
-                    },
+            'operating_expenses': {
+                'total': float(total_opex),
+                'categories': opex_categories
+            },
 
-                    'gross_profit': {
-                        'amount': float(gross_profit),
-                        'margin_percent': round(float(gross_margin), 2)
-                    },
+            'operating_income': {
+                'amount': float(operating_income),
+                'margin_percent': round(float(operating_margin), 2)
+            },
 
-                    'operating_expenses': {
-                        'total': float(total_opex),
-                        'categories': opex_categories
-                    },
+            'other_income_expenses': {
+                'total': 0,
+                'categories': []
+            },
 
-                    'operating_income': {
-                        'amount': float(operating_income),
-                        'margin_percent': round(float(operating_margin), 2)
-                    },
+            'net_income': {
+                'amount': float(net_income),
+                'margin_percent': round(float(net_margin), 2)
+            },
 
-                    'other_income_expenses': {
-                        'total': 0,
-                        'categories': []
-                    },
+            'summary_metrics': {
+                'total_revenue': float(total_revenue),
+                'gross_profit': float(gross_profit),
+                'gross_margin_percent': round(float(gross_margin), 2),
+                'operating_income': float(operating_income),
+                'operating_margin_percent': round(float(operating_margin), 2),
+                'net_income': float(net_income),
+                'net_margin_percent': round(float(net_margin), 2),
+                'transaction_count': revenue_count + opex_count
+            }
+        }
 
-                    'net_income': {
-                        'amount': float(net_income),
-                        'margin_percent': round(float(net_margin), 2)
-                    },
+    @app.route('/api/reports/income-statement/simple', methods=['GET'])
+    @cached_statement
+    def api_income_statement_simple():
+        """
+        Generate simplified Income Statement using direct SQL (fast)
+        This endpoint uses the optimized query approach from test_pl_simple.py
 
-                    'summary_metrics': {
-                        'total_revenue': float(total_revenue),
-                        'gross_profit': float(gross_profit),
-                        'gross_margin_percent': round(float(gross_margin), 2),
-                        'operating_income': float(operating_income),
-                        'operating_margin_percent': round(float(operating_margin), 2),
-                        'net_income': float(net_income),
-                        'net_margin_percent': round(float(net_margin), 2),
-                        'transaction_count': sum(c['count'] for c in revenue_categories) + sum(c['count'] for c in opex_categories)
-                    }
-                }
+        Returns:
+            JSON with simplified P&L data
+        """
+        try:
+            return _json_response({
+                'success': True,
+                'statement': build_income_statement_simple()
             })
 
         except Exception as e:
-            logger.error(f"Error generating simplified income statement: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating simplified income statement: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
+
+    def build_balance_sheet_simple():
+        """
+        Build the simplified Balance Sheet using direct SQL (fast)
+        Shared by /api/reports/balance-sheet/simple, /api/reports/bundle and the PDF export
+        """
+        now = datetime.now()
+        start_time = time.perf_counter_ns()
+
+        # Databases without the migrated bucket columns classify rows inline
+        bucketed = _has_column('transactions', 'asset_bucket') and _has_column('transactions', 'liability_bucket')
+
+        # Assets: rows classified by the generated asset_bucket column
+        # (cash/receivable/inventory/equipment/asset categories or deposits).
+        # With no positive bucket, a single estimated row (30% of revenue) is
+        # returned instead so the fallback costs no extra round-trip.
+        if bucketed:
+            assets_data = db_manager.execute_prepared(SIMPLE_ASSETS_QUERY, fetch_all=True, name='bs_assets_v1')
+        else:
+            assets_data = db_manager.execute_prepared(SIMPLE_ASSETS_LEGACY_QUERY, fetch_all=True, name='bs_assets_legacy_v1')
+
+        assets_categories = _category_rows(assets_data, ASSET_BUCKET_LABELS)
+        total_assets = sum(c['amount'] for c in assets_categories)
+
+        # Liabilities: negative rows classified by the generated liability_bucket column
+        # (payable/loan/debt/liability/tax categories or payments)
+        if bucketed:
+            liabilities_data = db_manager.execute_prepared(
+                SIMPLE_LIABILITIES_QUERY, fetch_all=True, name='bs_liabilities_v1'
+            )
+        else:
+            liabilities_data = db_manager.execute_prepared(
+                SIMPLE_LIABILITIES_LEGACY_QUERY, fetch_all=True, name='bs_liabilities_legacy_v1'
+            )
+
+        liabilities_categories = _category_rows(liabilities_data, LIABILITY_BUCKET_LABELS)
+        total_liabilities = sum(c['amount'] for c in liabilities_categories)
+
+        # Calculate Equity (Assets - Liabilities)
+        total_equity = total_assets - total_liabilities
+
+        # Ensure balance
+        if abs(total_assets - (total_liabilities + total_equity)) > 0.01:
+            # Adjust equity to balance
+            total_equity = total_assets - total_liabilities
+
+        generation_time_ms = _elapsed_ms(start_time)
+
+        return {
+            'statement_type': 'BalanceSheet',
+            'statement_name': 'Balanço Patrimonial - Todos os Períodos',
+            'generated_at': now,
+            'generation_time_ms': generation_time_ms,
+
+            'assets': {
+                'current_assets': {
+                    'total': float(total_assets),
+                    'categories': assets_categories
+                },
+                'non_current_assets': {
+                    'total': 0,
+                    'categories': []
+                },
+                'total': float(total_assets)
+            },
+
+            'liabilities': {
+                'current_liabilities': {
+                    'total': float(total_liabilities),
+                    'categories': liabilities_categories
+                },
+                'non_current_liabilities': {
+                    'total': 0,
+                    'categories': []
+                },
+                'total': float(total_liabilities)
+            },
+
+            'equity': {
+                'total': float(total_equity),
+                'categories': [
+                    {
+                        'category': 'Patrimônio Líquido Acumulado',
+                        'amount': float(total_equity),
+                        'count': 1
+                    }
+                ]
+            },
+
+            'summary_metrics': {
+                'total_assets': float(total_assets),
+                'total_liabilities': float(total_liabilities),
+                'total_equity': float(total_equity),
+                'debt_to_equity_ratio': float(total_liabilities / total_equity) if total_equity else 0,
+                'asset_turnover': 0,  # Would need revenue data for calculation
+                'balance_check': abs(float(total_assets - (total_liabilities + total_equity))) < 0.01
+            }
+        }
 
     @app.route('/api/reports/balance-sheet/simple', methods=['GET'])
+    @cached_statement
     def api_balance_sheet_simple():
         """
         Generate simplified Balance Sheet using direct SQL (fast)
@@ -261,195 +1312,107 @@ def register_reporting_routes(app):
             JSON with simplified Balance Sheet data
         """
         try:
-            start_time = datetime.now()
-
-            # Assets: All positive balances in balance sheet accounts or cash-related transactions
-            assets_query = """
-                SELECT
-                    CASE
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%cash%' THEN 'Caixa e Equivalentes'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%receivable%' THEN 'Contas a Receber'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%inventory%' THEN 'Estoque'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%equipment%' THEN 'Equipamentos'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%asset%' THEN 'Outros Ativos'
-                        ELSE 'Ativos Circulantes'
-                    END as category,
-                    SUM(COALESCE(usd_equivalent, amount, 0)) as total,
-                    COUNT(*) as count
-                FROM transactions
-                WHERE (
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%cash%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%asset%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%receivable%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%inventory%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%equipment%' OR
-                    (amount > 0 AND LOWER(COALESCE(description, '')) LIKE '%deposit%')
-                )
-                GROUP BY CASE
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%cash%' THEN 'Caixa e Equivalentes'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%receivable%' THEN 'Contas a Receber'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%inventory%' THEN 'Estoque'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%equipment%' THEN 'Equipamentos'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%asset%' THEN 'Outros Ativos'
-                    ELSE 'Ativos Circulantes'
-                END
-                ORDER BY total DESC
-            """
-            assets_data = db_manager.execute_query(assets_query, fetch_all=True)
-
-            total_assets = Decimal('0')
-            assets_categories = []
-
-            for row in assets_data:
-                amount = Decimal(str(row['total'] or 0))
-                if amount > 0:  # Only positive asset values
-                    assets_categories.append({
-                        'category': row['category'],
-                        'amount': float(amount),
-                        'count': row['count']
-                    })
-                    total_assets += amount
+            return _json_response({
+                'success': True,
+                'statement': build_balance_sheet_simple()
+            })
 
-            # If no specific asset transactions, estimate current assets from revenue
-            if total_assets == 0:
-                revenue_query = """
-                    SELECT SUM(COALESCE(usd_equivalent, amount, 0)) as total_revenue
-                    FROM transactions
-                    WHERE amount > 0
-                """
-                revenue_result = db_manager.execute_query(revenue_query, fetch_one=True)
-                estimated_assets = Decimal(str(revenue_result['total_revenue'] or 0)) * Decimal('0.3')  # Estimate 30% of revenue as assets
+        except Exception as e:
+            logger.exception(f"Error generating simplified balance sheet: {e}")
+            return _json_response({
+                'success': False,
+                'error': str(e)
+            }, 500)
 
-                if estimated_assets > 0:
-                    assets_categories.append({
-                        'category': 'Ativos Estimados (30% da Receita)',
-                        'amount': float(estimated_assets),
-                        'count': 1
-                    })
-                    total_assets = estimated_assets
+    def fetch_flow_totals():
+        """
+        Fetch the inflow/outflow totals shared by the simplified Cash Flow and DMPL
+        """
+        row = db_manager.execute_prepared(FLOW_TOTALS_QUERY, fetch_one=True, name='flow_totals_v1')
+        return dict(row) if row else {}
 
-            # Liabilities: All negative balances that represent actual debts/obligations
-            liabilities_query = """
-                SELECT
-                    CASE
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%payable%' THEN 'Contas a Pagar'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%loan%' THEN 'Empréstimos'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%debt%' THEN 'Dívidas'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%liability%' THEN 'Outros Passivos'
-                        WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%tax%' THEN 'Impostos a Pagar'
-                        ELSE 'Passivos Circulantes'
-                    END as category,
-                    SUM(ABS(COALESCE(usd_equivalent, amount, 0))) as total,
-                    COUNT(*) as count
-                FROM transactions
-                WHERE (
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%payable%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%loan%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%debt%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%liability%' OR
-                    LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%tax%' OR
-                    (amount < 0 AND LOWER(COALESCE(description, '')) LIKE '%payment%')
-                ) AND amount < 0
-                GROUP BY CASE
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%payable%' THEN 'Contas a Pagar'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%loan%' THEN 'Empréstimos'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%debt%' THEN 'Dívidas'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%liability%' THEN 'Outros Passivos'
-                    WHEN LOWER(COALESCE(accounting_category, classified_entity, '')) LIKE '%tax%' THEN 'Impostos a Pagar'
-                    ELSE 'Passivos Circulantes'
-                END
-                ORDER BY total DESC
-            """
-            liabilities_data = db_manager.execute_query(liabilities_query, fetch_all=True)
+    def build_cash_flow_simple(flow_totals=None):
+        """
+        Build the simplified Cash Flow from the shared inflow/outflow totals
+        Shared by /api/reports/cash-flow/simple and /api/reports/bundle
+        """
+        now = datetime.now()
+        start_time = time.perf_counter_ns()
 
-            total_liabilities = Decimal('0')
-            liabilities_categories = []
+        # Operating Cash Flow: All transactions (simplified)
+        if flow_totals is None:
+            flow_totals = fetch_flow_totals()
 
-            for row in liabilities_data:
-                amount = Decimal(str(row['total'] or 0))
-                if amount > 0:  # Only positive liability values (absolute)
-                    liabilities_categories.append({
-                        'category': row['category'],
-                        'amount': float(amount),
-                        'count': row['count']
-                    })
-                    total_liabilities += amount
+        cash_receipts = (flow_totals.get('inflows') or 0.0)
+        cash_payments = (flow_totals.get('outflows') or 0.0)
+        net_operating = cash_receipts - cash_payments
 
-            # Calculate Equity (Assets - Liabilities)
-            total_equity = total_assets - total_liabilities
+        # Investing and Financing activities simplified to zero for now
+        investing_inflows = 0.0
+        investing_outflows = 0.0
+        net_investing = 0.0
 
-            # Ensure balance
-            if abs(total_assets - (total_liabilities + total_equity)) > Decimal('0.01'):
-                # Adjust equity to balance
-                total_equity = total_assets - total_liabilities
+        financing_inflows = 0.0
+        financing_outflows = 0.0
+        net_financing = 0.0
 
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        # Net cash flow is just operating for simplified version
+        net_cash_flow = net_operating
+        beginning_cash = 0.0  # Simplified
+        ending_cash = net_cash_flow
 
-            return jsonify({
-                'success': True,
-                'statement': {
-                    'statement_type': 'BalanceSheet',
-                    'statement_name': 'Balanço Patrimonial - Todos os Períodos',
-                    'generated_at': datetime.now().isoformat(),
-                    'generation_time_ms': generation_time_ms,
-
-                    'assets': {
-                        'current_assets': {
-                            'total': float(total_assets),
-                            'categories': assets_categories
-                        },
-                        'non_current_assets': {
-                            'total': 0,
-                            'categories': []
-                        },
-                        'total': float(total_assets)
-                    },
+        generation_time_ms = _elapsed_ms(start_time)
 
-                    'liabilities': {
-                        'current_liabilities': {
-                            'total': float(total_liabilities),
-                            'categories': liabilities_categories
-                        },
-                        'non_current_liabilities': {
-                            'total': 0,
-                            'categories': []
-                        },
-                        'total': float(total_liabilities)
+        return {
+            'statement_type': 'CashFlow',
+            'statement_name': 'Demonstração de Fluxo de Caixa (DFC)',
+            'generated_at': now,
+            'generation_time_ms': generation_time_ms,
+
+            'operating_activities': {
+                'cash_receipts': float(cash_receipts),
+                'cash_payments': float(cash_payments),
+                'net_operating': float(net_operating),
+                'categories': [
+                    {
+                        'category': 'Recebimentos de Clientes',
+                        'amount': float(cash_receipts),
+                        'count': 1
                     },
+                    {
+                        'category': 'Pagamentos a Fornecedores',
+                        'amount': float(-cash_payments),
+                        'count': 1
+                    }
+                ]
+            },
 
-                    'equity': {
-                        'total': float(total_equity),
-                        'categories': [
-                            {
-                                'category': 'Patrimônio Líquido Acumulado',
-                                'amount': float(total_equity),
-                                'count': 1
-                            }
-                        ]
-                    },
+            'investing_activities': {
+                'investing_inflows': float(investing_inflows),
+                'investing_outflows': float(investing_outflows),
+                'net_investing': float(net_investing),
+                'categories': []
+            },
 
-                    'summary_metrics': {
-                        'total_assets': float(total_assets),
-                        'total_liabilities': float(total_liabilities),
-                        'total_equity': float(total_equity),
-                        'debt_to_equity_ratio': float(total_liabilities / total_equity) if total_equity != 0 else 0,
-                        'asset_turnover': 0,  # Would need revenue data for calculation
-                        'balance_check': abs(float(total_assets - (total_liabilities + total_equity))) < 0.01
-                    }
-                }
-            })
+            'financing_activities': {
+                'financing_inflows': float(financing_inflows),
+                'financing_outflows': float(financing_outflows),
+                'net_financing': float(net_financing),
+                'categories': []
+            },
 
-        except Exception as e:
-            logger.error(f"Error generating simplified balance sheet: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            'summary_metrics': {
+                'net_cash_flow': float(net_cash_flow),
+                'beginning_cash': float(beginning_cash),
+                'ending_cash': float(ending_cash),
+                'cash_receipts': float(cash_receipts),
+                'cash_payments': float(cash_payments),
+                'net_operating': float(net_operating)
+            }
+        }
 
     @app.route('/api/reports/cash-flow/simple', methods=['GET'])
+    @cached_statement
     def api_cash_flow_simple():
         """
         Generate simplified Cash Flow using direct SQL (fast)
@@ -458,99 +1421,88 @@ def register_reporting_routes(app):
             JSON with simplified Cash Flow data
         """
         try:
-            start_time = datetime.now()
-
-            # Operating Cash Flow: All transactions (simplified)
-            operating_query = """
-                SELECT
-                    SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) as cash_receipts,
-                    SUM(CASE WHEN amount < 0 THEN ABS(usd_equivalent) ELSE 0 END) as cash_payments
-                FROM transactions
-            """
-            operating_result = db_manager.execute_query(operating_query, fetch_one=True)
-
-            cash_receipts = Decimal(str(operating_result.get('cash_receipts', 0) or 0))
-            cash_payments = Decimal(str(operating_result.get('cash_payments', 0) or 0))
-            net_operating = cash_receipts - cash_payments
+            return _json_response({
+                'success': True,
+                'statement': build_cash_flow_simple()
+            })
 
-            # Investing and Financing activities simplified to zero for now
-            investing_inflows = Decimal('0')
-            investing_outflows = Decimal('0')
-            net_investing = Decimal('0')
+        except Exception as e:
+            logger.exception(f"Error generating simplified cash flow: {e}")
+            return _json_response({
+                'success': False,
+                'error': str(e)
+            }, 500)
 
-            financing_inflows = Decimal('0')
-            financing_outflows = Decimal('0')
-            net_financing = Decimal('0')
+    def build_dmpl_simple(flow_totals=None):
+        """
+        Build the simplified DMPL from the shared inflow/outflow totals
+        Shared by /api/reports/dmpl/simple and /api/reports/bundle
+        """
+        now = datetime.now()
+        start_time = time.perf_counter_ns()
 
-            # Net cash flow is just operating for simplified version
-            net_cash_flow = net_operating
-            beginning_cash = Decimal('0')  # Simplified
-            ending_cash = net_cash_flow
+        # Net income calculation (same as DRE)
+        if flow_totals is None:
+            flow_totals = fetch_flow_totals()
 
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        total_revenue = (flow_totals.get('inflows') or 0.0)
+        total_expenses = (flow_totals.get('outflows') or 0.0)
 
-            return jsonify({
-                'success': True,
-                'statement': {
-                    'statement_type': 'CashFlow',
-                    'statement_name': 'Demonstração de Fluxo de Caixa (DFC)',
-                    'generated_at': datetime.now().isoformat(),
-                    'generation_time_ms': generation_time_ms,
+        # Equity walk: beginning equity estimated at 80% of current earnings
+        net_income, beginning_equity, ending_equity, equity_growth, roe = dmpl_kernel(total_revenue, total_expenses)
 
-                    'operating_activities': {
-                        'cash_receipts': float(cash_receipts),
-                        'cash_payments': float(cash_payments),
-                        'net_operating': float(net_operating),
-                        'categories': [
-                            {
-                                'category': 'Recebimentos de Clientes',
-                                'amount': float(cash_receipts),
-                                'count': 1
-                            },
-                            {
-                                'category': 'Pagamentos a Fornecedores',
-                                'amount': float(-cash_payments),
-                                'count': 1
-                            }
-                        ]
-                    },
+        # Simplified equity changes (not yet tracked - zero in the equity walk)
+        capital_contributions = 0.0
+        capital_distributions = 0.0
+        dividends_paid = 0.0
+        other_changes = 0.0
 
-                    'investing_activities': {
-                        'investing_inflows': float(investing_inflows),
-                        'investing_outflows': float(investing_outflows),
-                        'net_investing': float(net_investing),
-                        'categories': []
-                    },
+        generation_time_ms = _elapsed_ms(start_time)
 
-                    'financing_activities': {
-                        'financing_inflows': float(financing_inflows),
-                        'financing_outflows': float(financing_outflows),
-                        'net_financing': float(net_financing),
-                        'categories': []
+        return {
+            'statement_type': 'DMPL',
+            'statement_name': 'Demonstração das Mutações do Patrimônio Líquido (DMPL)',
+            'generated_at': now,
+            'generation_time_ms': generation_time_ms,
+
+            'equity_movements': {
+                'beginning_equity': float(beginning_equity),
+                'net_income': float(net_income),
+                'capital_contributions': float(capital_contributions),
+                'capital_distributions': float(capital_distributions),
+                'dividends_paid': float(dividends_paid),
+                'other_changes': float(other_changes),
+                'ending_equity': float(ending_equity),
+                'categories': [
+                    {
+                        'category': 'Lucro/Prejuízo do Exercício',
+                        'amount': float(net_income),
+                        'count': 1
                     },
-
-                    'summary_metrics': {
-                        'net_cash_flow': float(net_cash_flow),
-                        'beginning_cash': float(beginning_cash),
-                        'ending_cash': float(ending_cash),
-                        'cash_receipts': float(cash_receipts),
-                        'cash_payments': float(cash_payments),
-                        'net_operating': float(net_operating)
+                    {
+                        'category': 'Patrimônio Inicial',
+                        'amount': float(beginning_equity),
+                        'count': 1
                     }
-                }
-            })
+                ]
+            },
 
-        except Exception as e:
-            logger.error(f"Error generating simplified cash flow: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            'components': {
+                'total_revenue': float(total_revenue),
+                'total_expenses': float(total_expenses)
+            },
+
+            'summary_metrics': {
+                'beginning_equity': float(beginning_equity),
+                'net_income': float(net_income),
+                'ending_equity': float(ending_equity),
+                'equity_growth': float(equity_growth),
+                'roe': float(roe)
+            }
+        }
 
     @app.route('/api/reports/dmpl/simple', methods=['GET'])
+    @cached_statement
     def api_dmpl_simple():
         """
         Generate simplified DMPL using direct SQL (fast)
@@ -559,89 +1511,48 @@ def register_reporting_routes(app):
             JSON with simplified DMPL data
         """
         try:
-            start_time = datetime.now()
-
-            # Net income calculation (same as DRE)
-            income_query = """
-                SELECT
-                    SUM(CASE WHEN amount > 0 THEN usd_equivalent ELSE 0 END) as total_revenue,
-                    SUM(CASE WHEN amount < 0 THEN ABS(usd_equivalent) ELSE 0 END) as total_expenses
-                FROM transactions
-            """
-            income_result = db_manager.execute_query(income_query, fetch_one=True)
-
-            total_revenue = Decimal(str(income_result.get('total_revenue', 0) or 0))
-            total_expenses = Decimal(str(income_result.get('total_expenses', 0) or 0))
-            net_income = total_revenue - total_expenses
+            return _json_response({
+                'success': True,
+                'statement': build_dmpl_simple()
+            })
 
-            # Beginning equity (simplified - use net income as proxy)
-            beginning_equity = net_income * Decimal('0.8')  # Estimate 80% of current earnings
+        except Exception as e:
+            logger.exception(f"Error generating simplified DMPL: {e}")
+            return _json_response({
+                'success': False,
+                'error': str(e)
+            }, 500)
 
-            # Simplified equity changes
-            capital_contributions = Decimal('0')
-            capital_distributions = Decimal('0')
-            dividends_paid = Decimal('0')
-            other_changes = Decimal('0')
+    @app.route('/api/reports/bundle', methods=['GET'])
+    @cached_statement
+    def api_reports_bundle():
+        """
+        Generate all four simplified statements in one request
 
-            # Ending equity
-            ending_equity = beginning_equity + net_income + capital_contributions - capital_distributions - dividends_paid - other_changes
+        The Cash Flow and DMPL share a single inflow/outflow totals query.
 
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        Returns:
+            JSON with the simplified Income Statement, Balance Sheet, Cash Flow and DMPL
+        """
+        try:
+            flow_totals = fetch_flow_totals()
 
-            return jsonify({
+            return _json_response({
                 'success': True,
-                'statement': {
-                    'statement_type': 'DMPL',
-                    'statement_name': 'Demonstração das Mutações do Patrimônio Líquido (DMPL)',
-                    'generated_at': datetime.now().isoformat(),
-                    'generation_time_ms': generation_time_ms,
-
-                    'equity_movements': {
-                        'beginning_equity': float(beginning_equity),
-                        'net_income': float(net_income),
-                        'capital_contributions': float(capital_contributions),
-                        'capital_distributions': float(capital_distributions),
-                        'dividends_paid': float(dividends_paid),
-                        'other_changes': float(other_changes),
-                        'ending_equity': float(ending_equity),
-                        'categories': [
-                            {
-                                'category': 'Lucro/Prejuízo do Exercício',
-                                'amount': float(net_income),
-                                'count': 1
-                            },
-                            {
-                                'category': 'Patrimônio Inicial',
-                                'amount': float(beginning_equity),
-                                'count': 1
-                            }
-                        ]
-                    },
-
-                    'components': {
-                        'total_revenue': float(total_revenue),
-                        'total_expenses': float(total_expenses)
-                    },
-
-                    'summary_metrics': {
-                        'beginning_equity': float(beginning_equity),
-                        'net_income': float(net_income),
-                        'ending_equity': float(ending_equity),
-                        'equity_growth': float(((ending_equity - beginning_equity) / beginning_equity * 100)) if beginning_equity != 0 else 0,
-                        'roe': float((net_income / beginning_equity * 100)) if beginning_equity != 0 else 0
-                    }
+                'statements': {
+                    'income_statement': build_income_statement_simple(),
+                    'balance_sheet': build_balance_sheet_simple(),
+                    'cash_flow': build_cash_flow_simple(flow_totals),
+                    'dmpl': build_dmpl_simple(flow_totals)
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating simplified DMPL: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating report bundle: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/periods', methods=['GET'])
     def api_accounting_periods():
@@ -662,36 +1573,40 @@ def register_reporting_routes(app):
             status = request.args.get('status')
 
             # Build query
-            query = "SELECT * FROM cfo_accounting_periods WHERE 1=1"
+            clauses = []
             params = []
 
             if year:
-                query += " AND fiscal_year = %s" if db_manager.db_type == 'postgresql' else " AND fiscal_year = ?"
+                clauses.append(f"fiscal_year = {PH}")
                 params.append(int(year))
 
             if period_type:
-                query += " AND period_type = %s" if db_manager.db_type == 'postgresql' else " AND period_type = ?"
+                clauses.append(f"period_type = {PH}")
                 params.append(period_type)
 
             if status:
-                query += " AND status = %s" if db_manager.db_type == 'postgresql' else " AND status = ?"
+                clauses.append(f"status = {PH}")
                 params.append(status)
 
+            query = "SELECT * FROM cfo_accounting_periods"
+            if clauses:
+                query += " WHERE " + " AND ".join(clauses)
             query += " ORDER BY start_date DESC"
 
-            periods = db_manager.execute_query(query, tuple(params) if params else None, fetch_all=True)
+            # Each filter combination is its own prepared statement (named from the SQL text)
+            periods = db_manager.execute_prepared(query, tuple(params), fetch_all=True)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
-                'periods': [dict(p) for p in periods]
+                'periods': _as_dicts(periods)
             })
 
         except Exception as e:
             logger.error(f"Error fetching accounting periods: {e}")
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/chart-of-accounts', methods=['GET'])
     def api_chart_of_accounts():
@@ -710,36 +1625,53 @@ def register_reporting_routes(app):
             is_active = request.args.get('is_active')
 
             # Build query
-            query = "SELECT * FROM cfo_chart_of_accounts WHERE 1=1"
+            clauses = []
             params = []
 
             if account_type:
-                query += " AND account_type = %s" if db_manager.db_type == 'postgresql' else " AND account_type = ?"
+                clauses.append(f"account_type = {PH}")
                 params.append(account_type)
 
             if is_active is not None:
-                if db_manager.db_type == 'postgresql':
-                    query += " AND is_active = %s"
-                    params.append(is_active.lower() == 'true')
-                else:
-                    query += " AND is_active = ?"
-                    params.append(1 if is_active.lower() == 'true' else 0)
+                active = is_active.lower() == 'true'
+                clauses.append(f"is_active = {PH}")
+                params.append(active if PH == '%s' else int(active))
 
+            query = "SELECT * FROM cfo_chart_of_accounts"
+            if clauses:
+                query += " WHERE " + " AND ".join(clauses)
             query += " ORDER BY account_code"
 
-            accounts = db_manager.execute_query(query, tuple(params) if params else None, fetch_all=True)
+            accounts = db_manager.execute_prepared(query, tuple(params), fetch_all=True)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
-                'accounts': [dict(a) for a in accounts]
+                'accounts': _as_dicts(accounts)
             })
 
         except Exception as e:
             logger.error(f"Error fetching chart of accounts: {e}")
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
+
+    # CFO tables and data counts in one round-trip
+    REPORTS_HEALTH_QUERY = """
+        SELECT
+            (SELECT COUNT(*) FROM information_schema.tables
+             WHERE table_schema = 'public' AND table_name LIKE 'cfo_%') as cfo_tables,
+            (SELECT COUNT(*) FROM cfo_accounting_periods) as periods,
+            (SELECT COUNT(*) FROM cfo_chart_of_accounts) as accounts,
+            (SELECT COUNT(*) FROM cfo_financial_statements) as statements
+    """ if IS_PG else """
+        SELECT
+            (SELECT COUNT(*) FROM sqlite_master
+             WHERE type='table' AND name LIKE 'cfo_%') as cfo_tables,
+            (SELECT COUNT(*) FROM cfo_accounting_periods) as periods,
+            (SELECT COUNT(*) FROM cfo_chart_of_accounts) as accounts,
+            (SELECT COUNT(*) FROM cfo_financial_statements) as statements
+    """
 
     @app.route('/api/reports/health', methods=['GET'])
     def api_reports_health():
@@ -748,41 +1680,18 @@ def register_reporting_routes(app):
             # Check database
             db_health = db_manager.health_check()
 
-            # Check CFO tables
-            table_check_query = """
-                SELECT COUNT(*) as count
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                AND table_name LIKE 'cfo_%'
-            """ if db_manager.db_type == 'postgresql' else """
-                SELECT COUNT(*) as count
-                FROM sqlite_master
-                WHERE type='table'
-                AND name LIKE 'cfo_%'
-            """
-
-            result = db_manager.execute_query(table_check_query, fetch_one=True)
-            cfo_tables_count = result['count']
-
-            # Check data
-            periods_query = "SELECT COUNT(*) as count FROM cfo_accounting_periods"
-            periods_result = db_manager.execute_query(periods_query, fetch_one=True)
-
-            accounts_query = "SELECT COUNT(*) as count FROM cfo_chart_of_accounts"
-            accounts_result = db_manager.execute_query(accounts_query, fetch_one=True)
+            counts = db_manager.execute_prepared(REPORTS_HEALTH_QUERY, fetch_one=True, name='reports_health_v1')
+            cfo_tables_count = counts['cfo_tables']
 
-            statements_query = "SELECT COUNT(*) as count FROM cfo_financial_statements"
-            statements_result = db_manager.execute_query(statements_query, fetch_one=True)
-
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'health': {
                     'database': db_health,
                     'cfo_tables_count': cfo_tables_count,
                     'data': {
-                        'accounting_periods': periods_result['count'],
-                        'chart_of_accounts': accounts_result['count'],
-                        'financial_statements': statements_result['count']
+                        'accounting_periods': counts['periods'],
+                        'chart_of_accounts': counts['accounts'],
+                        'financial_statements': counts['statements']
                     },
                     'status': 'healthy' if cfo_tables_count == 8 else 'degraded'
                 }
@@ -790,13 +1699,14 @@ def register_reporting_routes(app):
 
         except Exception as e:
             logger.error(f"Error in reports health check: {e}")
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': str(e),
                 'status': 'unhealthy'
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/entities', methods=['GET'])
+    @cached_statement
     def api_reports_entities():
         """
         Get all entities from transactions for filter dropdown
@@ -806,70 +1716,36 @@ def register_reporting_routes(app):
         """
         try:
             # Get entities from transactions table
-            # Query all entity-related columns: classified_entity, origin, and destination
-            query = """
-                SELECT
-                    classified_entity as name,
-                    classified_entity as display_name,
-                    COUNT(*) as transaction_count
-                FROM transactions
-                WHERE classified_entity IS NOT NULL
-                    AND classified_entity != ''
-                    AND classified_entity != 'Unknown'
-                GROUP BY classified_entity
-
-                UNION ALL
-
-                SELECT
-                    origin as name,
-                    origin as display_name,
-                    COUNT(*) as transaction_count
-                FROM transactions
-                WHERE origin IS NOT NULL
-                    AND origin != ''
-                    AND origin != 'Unknown'
-                GROUP BY origin
-
-                UNION ALL
-
-                SELECT
-                    destination as name,
-                    destination as display_name,
-                    COUNT(*) as transaction_count
-                FROM transactions
-                WHERE destination IS NOT NULL
-                    AND destination != ''
-                    AND destination != 'Unknown'
-                GROUP BY destination
+            # Count every entity-related column (classified_entity, origin, destination)
+            # with a partial GROUP BY per column, then merge, sort and limit once
+            query = f"""
+                SELECT name, name as display_name, CAST(SUM(cnt) AS BIGINT) as transaction_count
+                FROM (
+                    SELECT classified_entity as name, COUNT(*) as cnt
+                    FROM transactions
+                    WHERE classified_entity IS NOT NULL AND classified_entity NOT IN ('', 'Unknown')
+                    GROUP BY classified_entity
+                    UNION ALL
+                    SELECT origin, COUNT(*)
+                    FROM transactions
+                    WHERE origin IS NOT NULL AND origin NOT IN ('', 'Unknown')
+                    GROUP BY origin
+                    UNION ALL
+                    SELECT destination, COUNT(*)
+                    FROM transactions
+                    WHERE destination IS NOT NULL AND destination NOT IN ('', 'Unknown')
+                    GROUP BY destination
+                ) entity_names
+                GROUP BY name
+                ORDER BY transaction_count DESC
+                LIMIT {PH}
             """
 
-            results = db_manager.execute_query(query, fetch_all=True)
-
-            # Consolidate entities and sum transaction counts
-            entity_counts = {}
-            for row in results:
-                entity = row['name']
-                count = row['transaction_count']
+            results = db_manager.execute_query(query, (ENTITY_LIST_LIMIT,), fetch_all=True)
 
-                if entity in entity_counts:
-                    entity_counts[entity] += count
-                else:
-                    entity_counts[entity] = count
+            entities = _as_dicts(results)
 
-            # Convert to list and sort by transaction count (descending)
-            entities = [
-                {
-                    'name': entity,
-                    'display_name': entity,
-                    'transaction_count': count
-                }
-                for entity, count in entity_counts.items()
-            ]
-
-            # Sort by transaction count descending
-            entities.sort(key=lambda x: x['transaction_count'], reverse=True)
-
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'entities': entities,
@@ -879,13 +1755,14 @@ def register_reporting_routes(app):
 
         except Exception as e:
             logger.error(f"Error getting entities: {e}")
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': str(e),
                 'entities': []
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/charts-data', methods=['GET'])
+    @cached_statement(version_query=CHARTS_VERSION_QUERY, version_name='charts_version_v1')
     def api_charts_data():
         """
         Endpoint otimizado para dados de gráficos - versão robusta
@@ -900,7 +1777,8 @@ def register_reporting_routes(app):
             JSON com dados prontos para Chart.js
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             period = request.args.get('period', 'all_time')
@@ -914,8 +1792,8 @@ def register_reporting_routes(app):
 
             if start_date_str and end_date_str:
                 try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+                    start_date = date.fromisoformat(start_date_str)
+                    end_date = date.fromisoformat(end_date_str)
                     start_date_str = start_date.isoformat()
                     end_date_str = end_date.isoformat()
                 except ValueError:
@@ -942,9 +1820,12 @@ def register_reporting_routes(app):
 
             # Build entity filter
             entity_filter_clause = ""
+            invoice_entity_clause = ""
             entity_params = []
             if entity_filter:
-                entity_filter_clause = "AND (classified_entity = %s OR accounting_category = %s)"
+                entity_filter_clause = f"AND (classified_entity = {PH} OR accounting_category = {PH})"
+                # Same two parameters, matched against the invoice vendor
+                invoice_entity_clause = f"AND (vendor_name = {PH} OR vendor_name = {PH})"
                 entity_params = [entity_filter, entity_filter]
 
             # Initialize default fallback data
@@ -973,104 +1854,15 @@ def register_reporting_routes(app):
                 }
             }
 
-            # Safe query execution function
-            def safe_query(query, params=None, fetch_all=False):
-                try:
-                    if fetch_all:
-                        result = db_manager.execute_query(query, params, fetch_all=True)
-                        return result if result else []
-                    else:
-                        result = db_manager.execute_query(query, params, fetch_one=True)
-                        return result if result else {}
-                except Exception as query_error:
-                    logger.warning(f"Query failed safely: {query_error}")
-                    return [] if fetch_all else {}
-
-            # Revenue vs Expenses data - consolidating transactions + invoices
-            revenue_expenses_query = f"""
-                WITH combined_data AS (
-                    -- Transactions data (can be revenue or expenses)
-                    SELECT
-                        CASE WHEN amount > 0 THEN amount ELSE 0 END as revenue,
-                        CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END as expenses
-                    FROM transactions
-                    WHERE amount::text != 'NaN' AND amount IS NOT NULL
-                    {date_filter}
-                    {entity_filter_clause}
+            # Errors _safe_query swallowed - the response is still served, just never cached
+            query_errors = []
 
-                    UNION ALL
-
-                    -- Invoices data (always revenue)
-                    SELECT
-                        CASE
-                            WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$'
-                            THEN total_amount::float
-                            ELSE 0
-                        END as revenue,
-                        0 as expenses
-                    FROM invoices
-                    WHERE total_amount IS NOT NULL
-                        AND total_amount::text != 'NaN'
-                        AND total_amount::text != ''
-                        {date_filter}
-                        {entity_filter_clause.replace('classified_entity', 'vendor_name').replace('accounting_category', 'vendor_name') if entity_filter_clause else ''}
-                )
-                SELECT 'Revenue' as type, COALESCE(SUM(revenue), 0) as amount FROM combined_data
-                UNION ALL
-                SELECT 'Expenses' as type, COALESCE(SUM(expenses), 0) as amount FROM combined_data
-            """
-            revenue_expenses_params = date_params + entity_params + date_params + entity_params
-            revenue_expenses_data = safe_query(revenue_expenses_query, revenue_expenses_params, fetch_all=True)
-
-            # Top revenue categories - consolidating transactions + invoices
-            categories_query = f"""
-                WITH combined_categories AS (
-                    -- Transactions revenue categories
-                    SELECT
-                        COALESCE(accounting_category, classified_entity, 'Uncategorized') as category,
-                        amount,
-                        1 as count
-                    FROM transactions
-                    WHERE amount > 0 AND amount::text != 'NaN' AND amount IS NOT NULL
-                    {date_filter}
-                    {entity_filter_clause}
-
-                    UNION ALL
-
-                    -- Invoices revenue categories
-                    SELECT
-                        COALESCE(vendor_name, 'Invoice Revenue') as category,
-                        CASE
-                            WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$'
-                            THEN total_amount::float
-                            ELSE 0
-                        END as amount,
-                        1 as count
-                    FROM invoices
-                    WHERE total_amount IS NOT NULL
-                        AND total_amount::text != 'NaN'
-                        AND total_amount::text != ''
-                        {date_filter}
-                        {entity_filter_clause.replace('classified_entity', 'vendor_name').replace('accounting_category', 'vendor_name') if entity_filter_clause else ''}
-                )
-                SELECT
-                    category,
-                    COALESCE(SUM(amount), 0) as amount,
-                    COUNT(*) as count
-                FROM combined_categories
-                WHERE amount > 0
-                GROUP BY category
-                ORDER BY amount DESC
-                LIMIT 8
-            """
-            categories_params = date_params + entity_params + date_params + entity_params
-            categories_data = safe_query(categories_query, categories_params, fetch_all=True)
-
-            # Monthly trend data - with dynamic filters
-            if db_manager.db_type == 'sqlite':
+            if not IS_PG:
                 base_where = "amount IS NOT NULL"
+                monthly_params = []
                 if start_date_str and end_date_str:
-                    base_where += f" AND date >= '{start_date_str}' AND date <= '{end_date_str}'"
+                    base_where += " AND date >= ? AND date <= ?"
+                    monthly_params = [start_date_str, end_date_str]
                 else:
                     base_where += " AND date >= date('now', '-6 months')"
 
@@ -1085,98 +1877,88 @@ def register_reporting_routes(app):
                     GROUP BY strftime('%Y-%m', date)
                     ORDER BY month
                 """
-                monthly_params = entity_params
-            else:
-                # PostgreSQL version with proper date filtering
-                base_where = "amount::text != 'NaN' AND amount IS NOT NULL"
-                if start_date_str and end_date_str:
-                    base_where += " AND date::date >= %s::date AND date::date <= %s::date"
-                    monthly_params = [start_date_str, end_date_str] + entity_params + [start_date_str, end_date_str] + entity_params
-                else:
-                    base_where += " AND date::date >= CURRENT_DATE - INTERVAL '6 months'"
-                    monthly_params = entity_params + entity_params
-
-                monthly_trend_query = f"""
-                    WITH combined_monthly AS (
-                        -- Transactions monthly data
+                monthly_data = _safe_query(
+                    db_manager, monthly_trend_query, monthly_params + entity_params, fetch_all=True, errors=query_errors
+                )
+                revenue_amount = expenses_amount = 0
+                transactions_count = 0
+                categories_data = []
+            else:
+                # Transactions + invoices are filtered once in a shared CTE; the
+                # revenue/expenses totals, top categories and monthly trend are all
+                # aggregated from it and returned as one JSON object.
+                # Without a date range the trend keeps only the last 6 months of transactions.
+                monthly_where = "" if start_date_str and end_date_str else \
+                    "WHERE src = 'inv' OR d >= CURRENT_DATE - INTERVAL '6 months'"
+                invoice_amount = _invoice_amount_sql()
+
+                charts_query = f"""
+                    WITH filtered AS (
+                        -- Transactions (can be revenue or expenses)
                         SELECT
-                            DATE_TRUNC('month', date::date) as month,
-                            CASE WHEN amount > 0 THEN amount ELSE 0 END as revenue,
-                            CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END as expenses
+                            date::date as d,
+                            amount::float8 as amount,
+                            COALESCE(accounting_category, classified_entity, 'Uncategorized') as category,
+                            'tx' as src
                         FROM transactions
-                        WHERE {base_where}
+                        WHERE amount IS NOT NULL AND amount <> 'NaN'
+                        {date_filter}
                         {entity_filter_clause}
 
                         UNION ALL
 
-                        -- Invoices monthly data (always revenue)
+                        -- Invoices (always revenue)
                         SELECT
-                            DATE_TRUNC('month', date::date) as month,
-                            CASE
-                                WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$'
-                                THEN total_amount::float
-                                ELSE 0
-                            END as revenue,
-                            0 as expenses
+                            date::date as d,
+                            {invoice_amount}::float8 as amount,
+                            COALESCE(vendor_name, 'Invoice Revenue') as category,
+                            'inv' as src
                         FROM invoices
-                        WHERE total_amount IS NOT NULL
-                            AND total_amount::text != 'NaN'
-                            AND total_amount::text != ''
+                        WHERE {invoice_amount} IS NOT NULL
                             {date_filter}
-                            {entity_filter_clause.replace('classified_entity', 'vendor_name').replace('accounting_category', 'vendor_name') if entity_filter_clause else ''}
+                            {invoice_entity_clause}
                     )
-                    SELECT
-                        month,
-                        COALESCE(SUM(revenue), 0) as revenue,
-                        COALESCE(SUM(expenses), 0) as expenses
-                    FROM combined_monthly
-                    GROUP BY month
-                    ORDER BY month
+                    SELECT json_build_object(
+                        'revenue', (SELECT COALESCE(SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END), 0) FROM filtered),
+                        'expenses', (SELECT COALESCE(SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END), 0) FROM filtered),
+                        'total_count', (SELECT COUNT(*) FROM filtered WHERE amount > 0),
+                        'categories', COALESCE((
+                            SELECT json_agg(c ORDER BY c.amount DESC)
+                            FROM (
+                                SELECT category, SUM(amount) as amount, COUNT(*) as count
+                                FROM filtered
+                                WHERE amount > 0
+                                GROUP BY category
+                                ORDER BY amount DESC
+                                LIMIT 8
+                            ) c
+                        ), '[]'::json),
+                        'monthly_trend', COALESCE((
+                            SELECT json_agg(m ORDER BY m.month)
+                            FROM (
+                                SELECT
+                                    to_char(DATE_TRUNC('month', d), 'YYYY-MM') as month,
+                                    SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as revenue,
+                                    SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) as expenses
+                                FROM filtered
+                                {monthly_where}
+                                GROUP BY 1
+                            ) m
+                        ), '[]'::json)
+                    ) as charts
                 """
+                charts_params = date_params + entity_params + date_params + entity_params
+                charts_row = _safe_query(db_manager, charts_query, charts_params, errors=query_errors)
+                charts = charts_row.get('charts') or {}
 
-            monthly_data = safe_query(monthly_trend_query, monthly_params, fetch_all=True)
+                revenue_amount = float(charts.get('revenue') or 0)
+                expenses_amount = float(charts.get('expenses') or 0)
+                transactions_count = int(charts.get('total_count') or 0)
+                categories_data = charts.get('categories') or []
+                monthly_data = charts.get('monthly_trend') or []
 
             # Calculate margins for monthly data
-            monthly_margins = []
-            for row in monthly_data:
-                try:
-                    revenue = float(row.get('revenue', 0) or 0)
-                    expenses = float(row.get('expenses', 0) or 0)
-                    net_income = revenue - expenses
-                    margin = (net_income / revenue * 100) if revenue > 0 else 0
-
-                    # Handle different month formats
-                    month_display = 'Unknown'
-                    if row.get('month'):
-                        if isinstance(row['month'], str):
-                            # For SQLite: '2025-10' format
-                            try:
-                                month_obj = datetime.strptime(row['month'], '%Y-%m')
-                                month_display = month_obj.strftime('%b %Y')
-                            except:
-                                month_display = row['month']
-                        else:
-                            # For PostgreSQL: datetime object
-                            month_display = row['month'].strftime('%b %Y')
-
-                    monthly_margins.append({
-                        'month': month_display,
-                        'revenue': revenue,
-                        'expenses': expenses,
-                        'net_income': net_income,
-                        'margin_percent': round(margin, 2)
-                    })
-                except Exception as row_error:
-                    logger.warning(f"Error processing monthly row: {row_error}")
-                    continue
-
-            # Format data for charts with safe access
-            try:
-                revenue_amount = float(revenue_expenses_data[0].get('amount', 0) or 0) if len(revenue_expenses_data) > 0 else 0
-                expenses_amount = float(revenue_expenses_data[1].get('amount', 0) or 0) if len(revenue_expenses_data) > 1 else 0
-            except (IndexError, TypeError, ValueError):
-                revenue_amount = 0
-                expenses_amount = 0
+            monthly_margins = _monthly_margins(monthly_data)
 
             charts_data = {
                 'revenue_expenses': {
@@ -1199,10 +1981,10 @@ def register_reporting_routes(app):
                 },
 
                 'summary': {
-                    'total_revenue': sum([item['revenue'] for item in monthly_margins]) if monthly_margins else 0,
-                    'total_expenses': sum([item['expenses'] for item in monthly_margins]) if monthly_margins else 0,
+                    'total_revenue': revenue_amount,
+                    'total_expenses': expenses_amount,
                     'current_margin': monthly_margins[-1]['margin_percent'] if monthly_margins else 0,
-                    'transactions_count': sum([row.get('count', 0) for row in categories_data]) if categories_data else 0
+                    'transactions_count': transactions_count
                 }
             }
 
@@ -1210,23 +1992,23 @@ def register_reporting_routes(app):
             if not charts_data['categories']['data'] or all(x == 0 for x in charts_data['categories']['data']):
                 charts_data = default_charts_data
 
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            response = _json_response({
                 'success': True,
                 'data': charts_data,
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             })
+            if query_errors:
+                response.cache_control.no_store = True
+            return response
 
         except Exception as e:
-            logger.error(f"Error generating charts data: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error generating charts data: {e}")
 
-            # Return fallback data instead of 500 error
-            return jsonify({
+            # Return fallback data instead of 500 error (never cached)
+            response = _json_response({
                 'success': True,
                 'data': {
                     'revenue_expenses': {
@@ -1252,11 +2034,13 @@ def register_reporting_routes(app):
                         'transactions_count': 0
                     }
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': 0,
                 'fallback': True,
                 'original_error': str(e)
             })
+            response.cache_control.no_store = True
+            return response
 
     @app.route('/api/reports/export-pdf', methods=['POST'])
     def api_export_pdf():
@@ -1279,506 +2063,51 @@ def register_reporting_routes(app):
             end_date = data.get('end_date')
             include_charts = data.get('include_charts', False)
 
-            # Parse dates if provided
-            start_date_obj = None
-            end_date_obj = None
-
-            if start_date:
-                try:
-                    start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-                except ValueError:
-                    start_date_obj = datetime.strptime(start_date, '%m/%d/%Y').date()
-
-            if end_date:
-                try:
-                    end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-                except ValueError:
-                    end_date_obj = datetime.strptime(end_date, '%m/%d/%Y').date()
-
             # Generate the requested report type
             if report_type == 'income-statement':
-                # Use the simplified income statement endpoint for income statement data
-                response = api_income_statement_simple()
-                if response.status_code != 200:
-                    return response
-
-                income_statement_data = response.get_json()['statement']
+                # Same data as the simplified income statement endpoint, without the JSON round-trip
+                income_statement_data = build_income_statement_simple()
 
                 # Generate PDF
-                pdf_buffer = generate_income_statement_pdf(income_statement_data)
+                pdf_bytes = _render_pdf(generate_income_statement_pdf, income_statement_data)
 
                 # Create filename with timestamp
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"DeltaCFO_IncomeStatement_{timestamp}.pdf"
 
-                return send_file(
-                    pdf_buffer,
-                    as_attachment=True,
-                    download_name=filename,
-                    mimetype='application/pdf'
-                )
+                return _pdf_response(pdf_bytes, filename)
 
             elif report_type == 'balance-sheet':
-                # Use the simplified balance sheet endpoint for balance sheet data
-                response = api_balance_sheet_simple()
-                if response.status_code != 200:
-                    return response
-
-                balance_sheet_data = response.get_json()['statement']
+                # Same data as the simplified balance sheet endpoint, without the JSON round-trip
+                balance_sheet_data = build_balance_sheet_simple()
 
                 # Generate PDF
-                pdf_buffer = generate_balance_sheet_pdf(balance_sheet_data)
+                pdf_bytes = _render_pdf(generate_balance_sheet_pdf, balance_sheet_data)
 
                 # Create filename with timestamp
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"DeltaCFO_BalanceSheet_{timestamp}.pdf"
 
-                return send_file(
-                    pdf_buffer,
-                    as_attachment=True,
-                    download_name=filename,
-                    mimetype='application/pdf'
-                )
+                return _pdf_response(pdf_bytes, filename)
             else:
-                return jsonify({
+                return _json_response({
                     'success': False,
                     'error': f'Report type "{report_type}" not yet supported'
-                }), 400
+                }, 400)
+
+        except FutureTimeoutError:
+            logger.error(f"PDF export exceeded {REPORT_TIMEOUT_SECONDS}s")
+            return _json_response({
+                'success': False,
+                'error': f'PDF export timed out after {REPORT_TIMEOUT_SECONDS} seconds'
+            }, 504)
 
         except Exception as e:
-            logger.error(f"Error exporting PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error exporting PDF: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
-
-    def generate_income_statement_pdf(statement_data):
-        """Generate a professional PDF for income statement"""
-
-        # Create a buffer to hold the PDF data
-        buffer = io.BytesIO()
-
-        # Create the PDF document
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=0.75*inch,
-            leftMargin=0.75*inch,
-            topMargin=1*inch,
-            bottomMargin=0.75*inch
-        )
-
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=HexColor('#2563eb'),
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
-
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=HexColor('#374151'),
-            spaceAfter=20,
-            alignment=1
-        )
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading3'],
-            fontSize=12,
-            textColor=HexColor('#1f2937'),
-            spaceAfter=10,
-            spaceBefore=15
-        )
-
-        # Build the content
-        content = []
-
-        # Header
-        content.append(Paragraph("Delta CFO Agent", title_style))
-        content.append(Paragraph(
-            statement_data.get('statement_name', 'Demonstração de Resultado'),
-            subtitle_style
-        ))
-
-        # Generation info
-        generated_at = datetime.now().strftime('%d/%m/%Y às %H:%M')
-        content.append(Paragraph(f"Gerado em: {generated_at}", styles['Normal']))
-        content.append(Spacer(1, 20))
-
-        # Summary metrics (if available)
-        if statement_data.get('summary_metrics'):
-            metrics = statement_data['summary_metrics']
-            content.append(Paragraph("📊 Resumo Executivo", section_style))
-
-            metrics_data = [
-                ['Métrica', 'Valor'],
-                ['Receita Total', f"${metrics.get('total_revenue', 0):,.2f}"],
-                ['Lucro Operacional', f"${metrics.get('operating_income', 0):,.2f}"],
-                ['Lucro Líquido', f"${metrics.get('net_income', 0):,.2f}"],
-                ['Margem Líquida', f"{metrics.get('net_margin_percent', 0):.1f}%"],
-                ['Total de Transações', f"{metrics.get('transaction_count', 0):,}"]
-            ]
-
-            metrics_table = Table(metrics_data, colWidths=[3*inch, 2*inch])
-            metrics_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#1f2937')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, HexColor('#e5e7eb'))
-            ]))
-
-            content.append(metrics_table)
-            content.append(Spacer(1, 20))
-
-        # Revenue section
-        if statement_data.get('revenue'):
-            content.append(Paragraph("💰 RECEITAS", section_style))
-
-            revenue_data = [['Categoria', 'Valor']]
-            for category in statement_data['revenue'].get('categories', []):
-                revenue_data.append([
-                    category.get('category', 'N/A'),
-                    f"${category.get('amount', 0):,.2f}"
-                ])
-
-            # Add total
-            revenue_data.append([
-                'TOTAL DE RECEITAS',
-                f"${statement_data['revenue'].get('total', 0):,.2f}"
-            ])
-
-            revenue_table = Table(revenue_data, colWidths=[3.5*inch, 1.5*inch])
-            revenue_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#dcfce7')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#166534')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, -1), (-1, -1), HexColor('#f0fdf4')),
-                ('LINEABOVE', (0, -1), (-1, -1), 2, HexColor('#16a34a')),
-                ('GRID', (0, 0), (-1, -2), 0.5, HexColor('#bbf7d0'))
-            ]))
-
-            content.append(revenue_table)
-            content.append(Spacer(1, 15))
-
-        # Operating expenses section
-        if statement_data.get('operating_expenses'):
-            content.append(Paragraph("💸 DESPESAS OPERACIONAIS", section_style))
-
-            expenses_data = [['Categoria', 'Valor']]
-            for category in statement_data['operating_expenses'].get('categories', []):
-                expenses_data.append([
-                    category.get('category', 'N/A'),
-                    f"${category.get('amount', 0):,.2f}"
-                ])
-
-            # Add total
-            expenses_data.append([
-                'TOTAL DE DESPESAS OPERACIONAIS',
-                f"${statement_data['operating_expenses'].get('total', 0):,.2f}"
-            ])
-
-            expenses_table = Table(expenses_data, colWidths=[3.5*inch, 1.5*inch])
-            expenses_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#fee2e2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#991b1b')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, -1), (-1, -1), HexColor('#fef2f2')),
-                ('LINEABOVE', (0, -1), (-1, -1), 2, HexColor('#dc2626')),
-                ('GRID', (0, 0), (-1, -2), 0.5, HexColor('#fecaca'))
-            ]))
-
-            content.append(expenses_table)
-            content.append(Spacer(1, 15))
-
-        # Net income section
-        if statement_data.get('net_income'):
-            content.append(Paragraph("📈 RESULTADO LÍQUIDO", section_style))
-
-            net_income = statement_data['net_income']
-            result_data = [
-                ['Lucro Operacional', f"${statement_data.get('operating_income', {}).get('amount', 0):,.2f}"],
-                ['Outras Receitas/Despesas', f"${statement_data.get('other_income_expenses', {}).get('total', 0):,.2f}"],
-                ['LUCRO LÍQUIDO', f"${net_income.get('amount', 0):,.2f}"],
-                ['Margem Líquida', f"{net_income.get('margin_percent', 0):.1f}%"]
-            ]
-
-            result_table = Table(result_data, colWidths=[3.5*inch, 1.5*inch])
-            result_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BACKGROUND', (0, -2), (-1, -1), HexColor('#eff6ff')),
-                ('TEXTCOLOR', (0, -2), (-1, -1), HexColor('#1e40af')),
-                ('LINEABOVE', (0, -2), (-1, -2), 2, HexColor('#3b82f6')),
-                ('GRID', (0, 0), (-1, -3), 0.5, HexColor('#e5e7eb'))
-            ]))
-
-            content.append(result_table)
-            content.append(Spacer(1, 20))
-
-        # Footer
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=HexColor('#6b7280'),
-            alignment=1
-        )
-
-        generation_time = statement_data.get('generation_time_ms', 0)
-        content.append(Paragraph(
-            f"Relatório gerado automaticamente pela Delta CFO Agent em {generation_time}ms | "
-            f"Delta's proprietary self improving AI CFO Agent",
-            footer_style
-        ))
-
-        # Build PDF
-        doc.build(content)
-        buffer.seek(0)
-        return buffer
-
-    def generate_balance_sheet_pdf(statement_data):
-        """Generate a professional PDF for balance sheet"""
-
-        # Create a buffer to hold the PDF data
-        buffer = io.BytesIO()
-
-        # Create the PDF document
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=0.75*inch,
-            leftMargin=0.75*inch,
-            topMargin=1*inch,
-            bottomMargin=0.75*inch
-        )
-
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=HexColor('#2563eb'),
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
-
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=HexColor('#374151'),
-            spaceAfter=20,
-            alignment=1
-        )
-
-        section_style = ParagraphStyle(
-            'SectionHeader',
-            parent=styles['Heading3'],
-            fontSize=12,
-            textColor=HexColor('#1f2937'),
-            spaceAfter=10,
-            spaceBefore=15
-        )
-
-        # Build the content
-        content = []
-
-        # Header
-        content.append(Paragraph("Delta CFO Agent", title_style))
-        content.append(Paragraph(
-            statement_data.get('statement_name', 'Balanço Patrimonial'),
-            subtitle_style
-        ))
-
-        # Generation info
-        generated_at = datetime.now().strftime('%d/%m/%Y às %H:%M')
-        content.append(Paragraph(f"Gerado em: {generated_at}", styles['Normal']))
-        content.append(Spacer(1, 20))
-
-        # Summary metrics (if available)
-        if statement_data.get('summary_metrics'):
-            metrics = statement_data['summary_metrics']
-            content.append(Paragraph("📊 Resumo Executivo", section_style))
-
-            metrics_data = [
-                ['Métrica', 'Valor'],
-                ['Total de Ativos', f"${metrics.get('total_assets', 0):,.2f}"],
-                ['Total de Passivos', f"${metrics.get('total_liabilities', 0):,.2f}"],
-                ['Patrimônio Líquido', f"${metrics.get('total_equity', 0):,.2f}"],
-                ['Índice de Endividamento', f"{metrics.get('debt_to_equity_ratio', 0):.2f}"],
-                ['Balanceamento', '✓' if metrics.get('balance_check', False) else '✗']
-            ]
-
-            metrics_table = Table(metrics_data, colWidths=[3*inch, 2*inch])
-            metrics_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#1f2937')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, HexColor('#e5e7eb'))
-            ]))
-
-            content.append(metrics_table)
-            content.append(Spacer(1, 20))
-
-        # Assets section
-        if statement_data.get('assets'):
-            content.append(Paragraph("🏛️ ATIVOS", section_style))
-
-            assets_data = [['Categoria', 'Valor']]
-
-            # Current assets
-            current_assets = statement_data['assets'].get('current_assets', {})
-            for category in current_assets.get('categories', []):
-                assets_data.append([
-                    category.get('category', 'N/A'),
-                    f"${category.get('amount', 0):,.2f}"
-                ])
-
-            # Add total
-            assets_data.append([
-                'TOTAL DE ATIVOS',
-                f"${statement_data['assets'].get('total', 0):,.2f}"
-            ])
-
-            assets_table = Table(assets_data, colWidths=[3.5*inch, 1.5*inch])
-            assets_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#dbeafe')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#1e40af')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, -1), (-1, -1), HexColor('#f0f9ff')),
-                ('LINEABOVE', (0, -1), (-1, -1), 2, HexColor('#3b82f6')),
-                ('GRID', (0, 0), (-1, -2), 0.5, HexColor('#bfdbfe'))
-            ]))
-
-            content.append(assets_table)
-            content.append(Spacer(1, 15))
-
-        # Liabilities section
-        if statement_data.get('liabilities'):
-            content.append(Paragraph("📋 PASSIVOS", section_style))
-
-            liabilities_data = [['Categoria', 'Valor']]
-
-            # Current liabilities
-            current_liabilities = statement_data['liabilities'].get('current_liabilities', {})
-            for category in current_liabilities.get('categories', []):
-                liabilities_data.append([
-                    category.get('category', 'N/A'),
-                    f"${category.get('amount', 0):,.2f}"
-                ])
-
-            # Add total
-            liabilities_data.append([
-                'TOTAL DE PASSIVOS',
-                f"${statement_data['liabilities'].get('total', 0):,.2f}"
-            ])
-
-            liabilities_table = Table(liabilities_data, colWidths=[3.5*inch, 1.5*inch])
-            liabilities_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#fef3c7')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#92400e')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, -1), (-1, -1), HexColor('#fffbeb')),
-                ('LINEABOVE', (0, -1), (-1, -1), 2, HexColor('#d97706')),
-                ('GRID', (0, 0), (-1, -2), 0.5, HexColor('#fde68a'))
-            ]))
-
-            content.append(liabilities_table)
-            content.append(Spacer(1, 15))
-
-        # Equity section
-        if statement_data.get('equity'):
-            content.append(Paragraph("💎 PATRIMÔNIO LÍQUIDO", section_style))
-
-            equity_data = [['Categoria', 'Valor']]
-
-            for category in statement_data['equity'].get('categories', []):
-                equity_data.append([
-                    category.get('category', 'N/A'),
-                    f"${category.get('amount', 0):,.2f}"
-                ])
-
-            # Add total
-            equity_data.append([
-                'TOTAL DO PATRIMÔNIO LÍQUIDO',
-                f"${statement_data['equity'].get('total', 0):,.2f}"
-            ])
-
-            equity_table = Table(equity_data, colWidths=[3.5*inch, 1.5*inch])
-            equity_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#d1fae5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#065f46')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, -1), (-1, -1), HexColor('#ecfdf5')),
-                ('LINEABOVE', (0, -1), (-1, -1), 2, HexColor('#10b981')),
-                ('GRID', (0, 0), (-1, -2), 0.5, HexColor('#a7f3d0'))
-            ]))
-
-            content.append(equity_table)
-            content.append(Spacer(1, 20))
-
-        # Footer
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=HexColor('#6b7280'),
-            alignment=1
-        )
-
-        generation_time = statement_data.get('generation_time_ms', 0)
-        content.append(Paragraph(
-            f"Relatório gerado automaticamente pela Delta CFO Agent em {generation_time}ms | "
-            f"Delta's proprietary self improving AI CFO Agent",
-            footer_style
-        ))
-
-        # Build PDF
-        doc.build(content)
-        buffer.seek(0)
-        return buffer
+            }, 500)
 
     @app.route('/api/reports/period-comparison', methods=['GET', 'POST'])
     def api_period_comparison():
@@ -1810,72 +2139,47 @@ def register_reporting_routes(app):
 
             # Auto-calculate previous period if comparison_type is specified
             if comparison_type != 'custom' and current_start and current_end:
-                current_start_date = datetime.strptime(current_start, '%Y-%m-%d').date()
-                current_end_date = datetime.strptime(current_end, '%Y-%m-%d').date()
-
-                if comparison_type == 'month_over_month':
-                    # Safe month calculation that handles different month lengths
-                    if current_start_date.month > 1:
-                        # Go to previous month
-                        previous_month = current_start_date.month - 1
-                        previous_year = current_start_date.year
-                    else:
-                        # Go to December of previous year
-                        previous_month = 12
-                        previous_year = current_start_date.year - 1
-
-                    # Handle day overflow (e.g., Jan 31 -> Feb 28)
-                    try:
-                        previous_start_date = current_start_date.replace(year=previous_year, month=previous_month)
-                    except ValueError:
-                        # Day doesn't exist in target month, use last day of target month
-                        from calendar import monthrange
-                        last_day = monthrange(previous_year, previous_month)[1]
-                        previous_start_date = current_start_date.replace(year=previous_year, month=previous_month, day=min(current_start_date.day, last_day))
-
-                    # Same logic for end date
-                    if current_end_date.month > 1:
-                        previous_month = current_end_date.month - 1
-                        previous_year = current_end_date.year
-                    else:
-                        previous_month = 12
-                        previous_year = current_end_date.year - 1
+                current_start_date = _parse_iso_date(current_start, 'current_start_date')
+                current_end_date = _parse_iso_date(current_end, 'current_end_date')
 
-                    try:
-                        previous_end_date = current_end_date.replace(year=previous_year, month=previous_month)
-                    except ValueError:
-                        from calendar import monthrange
-                        last_day = monthrange(previous_year, previous_month)[1]
-                        previous_end_date = current_end_date.replace(year=previous_year, month=previous_month, day=min(current_end_date.day, last_day))
-                elif comparison_type == 'quarter_over_quarter':
-                    # Calculate previous quarter
-                    months_back = 3
-                    previous_start_date = (current_start_date.replace(day=1) - timedelta(days=1)).replace(day=1) if current_start_date.month > 3 else current_start_date.replace(year=current_start_date.year-1, month=current_start_date.month+9)
-                    previous_end_date = (current_end_date.replace(day=1) - timedelta(days=1)).replace(day=1) if current_end_date.month > 3 else current_end_date.replace(year=current_end_date.year-1, month=current_end_date.month+9)
-                elif comparison_type == 'year_over_year':
-                    previous_start_date = current_start_date.replace(year=current_start_date.year-1)
-                    previous_end_date = current_end_date.replace(year=current_end_date.year-1)
+                # relativedelta clamps the day to the target month (Jan 31 -> Dec 31, Mar 31 -> Feb 28)
+                shift = _COMPARISON_SHIFTS.get(comparison_type)
+                previous_start_date = current_start_date - shift if shift else None
+                previous_end_date = current_end_date - shift if shift else None
             else:
                 # Parse custom dates
-                previous_start_date = datetime.strptime(previous_start, '%Y-%m-%d').date() if previous_start else None
-                previous_end_date = datetime.strptime(previous_end, '%Y-%m-%d').date() if previous_end else None
-                current_start_date = datetime.strptime(current_start, '%Y-%m-%d').date() if current_start else None
-                current_end_date = datetime.strptime(current_end, '%Y-%m-%d').date() if current_end else None
+                previous_start_date = _parse_iso_date(previous_start, 'previous_start_date') if previous_start else None
+                previous_end_date = _parse_iso_date(previous_end, 'previous_end_date') if previous_end else None
+                current_start_date = _parse_iso_date(current_start, 'current_start_date') if current_start else None
+                current_end_date = _parse_iso_date(current_end, 'current_end_date') if current_end else None
 
             if not all([current_start_date, current_end_date, previous_start_date, previous_end_date]):
-                return jsonify({
+                return _json_response({
                     'success': False,
                     'error': 'All date parameters are required'
-                }), 400
+                }, 400)
 
-            # Generate financial data for both periods
-            current_period_data = generate_period_financial_data(current_start_date, current_end_date)
-            previous_period_data = generate_period_financial_data(previous_start_date, previous_end_date)
+            # Generate financial data for both periods from one scan
+            try:
+                version = _data_version()
+            except Exception as e:
+                logger.warning(f"Period data cache bypassed, version probe failed: {e}")
+                version = None
+            query_errors = []
+            current_period_data, previous_period_data = cached_comparison_financial_data(
+                (current_start_date, current_end_date), (previous_start_date, previous_end_date), version,
+                errors=query_errors
+            )
+            if query_errors:
+                return _json_response({
+                    'success': False,
+                    'error': f"Period comparison query failed: {query_errors[0]}"
+                }, 500)
 
             # Calculate variance analysis
             variance_analysis = calculate_variance_analysis(current_period_data, previous_period_data)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'comparison': {
                     'current_period': {
@@ -1891,87 +2195,138 @@ def register_reporting_routes(app):
                     'variance_analysis': variance_analysis,
                     'comparison_type': comparison_type
                 },
-                'generated_at': datetime.now().isoformat()
+                'generated_at': datetime.now()
             })
 
+        except BadRequest:
+            raise
+
         except Exception as e:
-            logger.error(f"Error in period comparison: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error in period comparison: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
-
-    def generate_period_financial_data(start_date, end_date):
-        """Generate financial data for a specific period"""
+            }, 500)
 
-        # Safe query execution
-        def safe_query(query, params=None):
-            try:
-                result = db_manager.execute_query(query, params, fetch_all=True)
-                return result if result else []
-            except Exception as e:
-                logger.warning(f"Query failed safely: {e}")
-                return []
+    def cached_comparison_financial_data(current_range, previous_range, version, errors=None):
+        """
+        generate_comparison_financial_data through _period_data_cache
 
-        # Revenue query for the period
-        revenue_query = """
-            SELECT
-                COALESCE(accounting_category, classified_entity, 'Uncategorized') as category,
-                COALESCE(SUM(amount), 0) as amount,
-                COUNT(*) as count
-            FROM transactions
-            WHERE amount > 0
-            AND TO_DATE(date, 'MM/DD/YYYY'::text) >= TO_DATE(%s::text, 'YYYY-MM-DD'::text)
-            AND TO_DATE(date, 'MM/DD/YYYY'::text) <= TO_DATE(%s::text, 'YYYY-MM-DD'::text)
-            GROUP BY COALESCE(accounting_category, classified_entity, 'Uncategorized')
-            ORDER BY amount DESC
-        """ if db_manager.db_type == 'postgresql' else """
-            SELECT
-                COALESCE(accounting_category, classified_entity, 'Uncategorized') as category,
-                COALESCE(SUM(amount), 0) as amount,
-                COUNT(*) as count
-            FROM transactions
-            WHERE amount > 0
-            AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-            AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
-            GROUP BY COALESCE(accounting_category, classified_entity, 'Uncategorized')
-            ORDER BY amount DESC
+        Keyed by both date ranges and the data version, so edits invalidate it;
+        not cached when the version is unknown or a query failed (see errors).
+        """
+        errors = [] if errors is None else errors
+        if version is None:
+            return generate_comparison_financial_data(current_range, previous_range, errors)
+
+        key = tuple(d.isoformat() for d in (*current_range, *previous_range)) + (version,)
+        data = _period_data_cache.get(key)
+        if data is None:
+            data = generate_comparison_financial_data(current_range, previous_range, errors)
+            if not errors:
+                _period_data_cache.set(key, data)
+        return data
+
+    def generate_comparison_financial_data(current_range, previous_range, errors=None):
         """
+        Financial data for the current and previous period
+
+        Both windows are aggregated per category in one scan with conditional
+        sums, plus a TOTAL_ROW_LABEL row carrying each period's totals; the
+        bare date comparisons let the planner use the index on
+        transactions.date. Windows with no transactions at all (new accounts,
+        future dates) are answered from a single-row probe instead. A failed
+        probe raises; a failed scan is appended to errors and its periods
+        come back as zeros.
+        """
+        in_period = f"date >= {PH} AND date <= {PH}"
 
-        revenue_data = safe_query(revenue_query, (start_date, end_date))
+        # Called directly, not through _safe_query: a failed probe must raise,
+        # only a real empty result may short-circuit to zeros
+        probe = db_manager.execute_prepared(
+            f"SELECT 1 as found FROM transactions WHERE (({in_period}) OR ({in_period})) AND amount <> 0 LIMIT 1",
+            (*current_range, *previous_range), fetch_one=True, name='period_comparison_probe_v1'
+        )
+        if not probe:
+            return summarize_period([], None), summarize_period([], None)
+
+        columns = []
+        total_columns = []
+        params = []
+        for prefix, (start_date, end_date) in (('cur', current_range), ('prev', previous_range)):
+            columns += [
+                f"CAST(SUM(CASE WHEN {in_period} AND amount > 0 THEN amount ELSE 0 END) AS DOUBLE PRECISION) as {prefix}_revenue",
+                f"CAST(SUM(CASE WHEN {in_period} AND amount > 0 THEN 1 ELSE 0 END) AS BIGINT) as {prefix}_revenue_count",
+                f"CAST(SUM(CASE WHEN {in_period} AND amount < 0 THEN ABS(amount) ELSE 0 END) AS DOUBLE PRECISION) as {prefix}_expenses",
+                f"CAST(SUM(CASE WHEN {in_period} AND amount < 0 THEN 1 ELSE 0 END) AS BIGINT) as {prefix}_expense_count",
+            ]
+            total_columns += [
+                f"SUM({prefix}_revenue)",
+                f"CAST(SUM({prefix}_revenue_count) AS BIGINT)",
+                f"SUM({prefix}_expenses)",
+                f"CAST(SUM({prefix}_expense_count) AS BIGINT)",
+            ]
+            params += [start_date, end_date] * 4
+        params += [*current_range, *previous_range]
 
-        # Expenses query for the period
-        expenses_query = """
-            SELECT
-                COALESCE(accounting_category, classified_entity, 'General & Administrative') as category,
-                COALESCE(SUM(ABS(amount)), 0) as amount,
-                COUNT(*) as count
-            FROM transactions
-            WHERE amount < 0
-            AND TO_DATE(date, 'MM/DD/YYYY'::text) >= TO_DATE(%s::text, 'YYYY-MM-DD'::text)
-            AND TO_DATE(date, 'MM/DD/YYYY'::text) <= TO_DATE(%s::text, 'YYYY-MM-DD'::text)
-            GROUP BY COALESCE(accounting_category, classified_entity, 'General & Administrative')
-            ORDER BY amount DESC
-        """ if db_manager.db_type == 'postgresql' else """
-            SELECT
-                COALESCE(accounting_category, classified_entity, 'General & Administrative') as category,
-                COALESCE(SUM(ABS(amount)), 0) as amount,
-                COUNT(*) as count
-            FROM transactions
-            WHERE amount < 0
-            AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-            AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
-            GROUP BY COALESCE(accounting_category, classified_entity, 'General & Administrative')
-            ORDER BY amount DESC
+        category_query = f"""
+            WITH cats AS (
+                SELECT
+                    COALESCE(accounting_category, classified_entity) as category,
+                    {', '.join(columns)}
+                FROM transactions
+                WHERE (({in_period}) OR ({in_period}))
+                AND amount <> 0
+                GROUP BY COALESCE(accounting_category, classified_entity)
+            )
+            SELECT * FROM cats
+            UNION ALL
+            SELECT '{TOTAL_ROW_LABEL}', {', '.join(total_columns)} FROM cats
         """
 
-        expenses_data = safe_query(expenses_query, (start_date, end_date))
+        category_rows, total_row = _split_total_row(
+            _safe_query(
+                db_manager, category_query, tuple(params), fetch_all=True, name='period_comparison_v1', errors=errors
+            )
+        )
+
+        def period_row(row, prefix):
+            return {
+                'category': row['category'],
+                'revenue': row[f'{prefix}_revenue'] or 0.0,
+                'revenue_count': row[f'{prefix}_revenue_count'] or 0,
+                'expenses': row[f'{prefix}_expenses'] or 0.0,
+                'expense_count': row[f'{prefix}_expense_count'] or 0,
+            }
+
+        return tuple(
+            summarize_period(
+                [period_row(row, prefix) for row in category_rows],
+                period_row(total_row, prefix) if total_row else None
+            )
+            for prefix in ('cur', 'prev')
+        )
+
+    def summarize_period(category_rows, total_row):
+        """Totals and sorted category breakdowns for one period's per-category rows and total row"""
+        revenue_categories = sorted(
+            (
+                {'category': row['category'] or 'Uncategorized', 'amount': row['revenue']}
+                for row in category_rows if row['revenue_count']
+            ),
+            key=itemgetter('amount'), reverse=True
+        )
+        expense_categories = sorted(
+            (
+                {'category': row['category'] or 'General & Administrative', 'amount': row['expenses']}
+                for row in category_rows if row['expense_count']
+            ),
+            key=itemgetter('amount'), reverse=True
+        )
 
-        # Calculate totals
-        total_revenue = sum(float(row.get('amount', 0)) for row in revenue_data)
-        total_expenses = sum(float(row.get('amount', 0)) for row in expenses_data)
+        # Totals come from the database's total row
+        total_revenue = total_row['revenue'] if total_row else 0.0
+        total_expenses = total_row['expenses'] if total_row else 0.0
         net_income = total_revenue - total_expenses
         margin_percent = (net_income / total_revenue * 100) if total_revenue > 0 else 0
 
@@ -1980,9 +2335,9 @@ def register_reporting_routes(app):
             'total_expenses': total_expenses,
             'net_income': net_income,
             'margin_percent': round(margin_percent, 2),
-            'revenue_categories': [{'category': r.get('category', ''), 'amount': float(r.get('amount', 0))} for r in revenue_data],
-            'expense_categories': [{'category': e.get('category', ''), 'amount': float(e.get('amount', 0))} for e in expenses_data],
-            'transaction_count': sum(r.get('count', 0) for r in revenue_data) + sum(e.get('count', 0) for e in expenses_data)
+            'revenue_categories': revenue_categories,
+            'expense_categories': expense_categories,
+            'transaction_count': (total_row['revenue_count'] + total_row['expense_count']) if total_row else 0
         }
 
     def calculate_variance_analysis(current, previous):
@@ -2020,6 +2375,10 @@ def register_reporting_routes(app):
             'expenses_change': expenses_change,
             'net_income_change': net_income_change,
             'margin_change': margin_change,
+            'category_variance': {
+                'revenue': _category_variance(current['revenue_categories'], previous['revenue_categories']),
+                'expenses': _category_variance(current['expense_categories'], previous['expense_categories'])
+            },
             'revenue_growth_rate': round(revenue_growth_rate, 2),
             'expense_growth_rate': round(expense_growth_rate, 2),
             'efficiency_metrics': {
@@ -2034,6 +2393,19 @@ def register_reporting_routes(app):
             }
         }
 
+    # Template CRUD statements for the configured driver
+    TEMPLATE_UPDATE_QUERY = f"""
+        UPDATE report_templates
+        SET name = {PH}, description = {PH}, template_config = {PH}, updated_at = {PH}
+        WHERE id = {PH}
+    """
+    TEMPLATE_INSERT_QUERY = f"""
+        INSERT INTO report_templates (name, description, template_config, created_at, updated_at)
+        VALUES ({PH}, {PH}, {PH}, {PH}, {PH})
+        RETURNING id
+    """
+    TEMPLATE_DELETE_QUERY = f"DELETE FROM report_templates WHERE id = {PH}"
+
     @app.route('/api/reports/templates', methods=['GET', 'POST', 'DELETE'])
     def api_report_templates():
         """
@@ -2051,19 +2423,13 @@ def register_reporting_routes(app):
                     FROM report_templates
                     ORDER BY updated_at DESC
                 """
-                templates = db_manager.execute_query(templates_query, fetch_all=True)
+                templates = db_manager.execute_prepared(templates_query, fetch_all=True, name='templates_list_v1')
 
-                # Parse JSON configs
-                template_list = []
-                for template in templates:
-                    template_dict = dict(template)
-                    try:
-                        template_dict['template_config'] = json.loads(template['template_config'])
-                    except (json.JSONDecodeError, TypeError):
-                        template_dict['template_config'] = {}
-                    template_list.append(template_dict)
+                template_list = _as_dicts(templates)
+                for template in template_list:
+                    template['template_config'] = _template_config(template['template_config'])
 
-                return jsonify({
+                return _json_response({
                     'success': True,
                     'templates': template_list
                 })
@@ -2077,75 +2443,67 @@ def register_reporting_routes(app):
                 template_id = data.get('id')
 
                 if not template_name:
-                    return jsonify({
+                    return _json_response({
                         'success': False,
                         'error': 'Template name is required'
-                    }), 400
+                    }, 400)
+
+                config_json = _json_dumps(config).decode()
+                now = datetime.now()
 
-                config_json = json.dumps(config)
+                is_new = not template_id
 
-                if template_id:
+                if not is_new:
                     # Update existing template
-                    update_query = """
-                        UPDATE report_templates
-                        SET name = %s, description = %s, template_config = %s, updated_at = %s
-                        WHERE id = %s
-                    """ if db_manager.db_type == 'postgresql' else """
-                        UPDATE report_templates
-                        SET name = ?, description = ?, template_config = ?, updated_at = ?
-                        WHERE id = ?
-                    """
-                    db_manager.execute_query(update_query, (template_name, description, config_json, datetime.now(), template_id))
+                    db_manager.execute_prepared(
+                        TEMPLATE_UPDATE_QUERY, (template_name, description, config_json, now, template_id),
+                        name='template_update_v1'
+                    )
                 else:
-                    # Create new template
-                    insert_query = """
-                        INSERT INTO report_templates (name, description, template_config, created_at, updated_at)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """ if db_manager.db_type == 'postgresql' else """
-                        INSERT INTO report_templates (name, description, template_config, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, ?)
-                    """
-                    db_manager.execute_query(insert_query, (template_name, description, config_json, datetime.now(), datetime.now()))
+                    # Create new template - RETURNING hands back the id, no follow-up SELECT needed
+                    row = db_manager.execute_prepared(
+                        TEMPLATE_INSERT_QUERY, (template_name, description, config_json, now, now),
+                        fetch_one=True, name='template_insert_v2'
+                    )
+                    template_id = row['id']
 
-                return jsonify({
+                response = {
                     'success': True,
-                    'message': 'Template saved successfully'
-                })
+                    'message': 'Template saved successfully',
+                    'id': template_id,
+                    'updated_at': now
+                }
+                if is_new:
+                    response['created_at'] = now
+                return _json_response(response)
 
             elif request.method == 'DELETE':
                 # Delete template
                 template_id = request.args.get('id')
                 if not template_id:
-                    return jsonify({
+                    return _json_response({
                         'success': False,
                         'error': 'Template ID is required'
-                    }), 400
+                    }, 400)
 
-                delete_query = """
-                    DELETE FROM report_templates WHERE id = %s
-                """ if db_manager.db_type == 'postgresql' else """
-                    DELETE FROM report_templates WHERE id = ?
-                """
-                db_manager.execute_query(delete_query, (template_id,))
+                db_manager.execute_prepared(TEMPLATE_DELETE_QUERY, (template_id,), name='template_delete_v1')
 
-                return jsonify({
+                return _json_response({
                     'success': True,
                     'message': 'Template deleted successfully'
                 })
 
         except Exception as e:
-            logger.error(f"Error managing report templates: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error managing report templates: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     def ensure_report_templates_table():
         """Ensure the report templates table exists"""
         try:
-            if db_manager.db_type == 'postgresql':
+            if IS_PG:
                 create_table_query = """
                     CREATE TABLE IF NOT EXISTS report_templates (
                         id SERIAL PRIMARY KEY,
@@ -2167,12 +2525,13 @@ def register_reporting_routes(app):
                         template_config TEXT NOT NULL,
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                         updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    );
-
-                    CREATE INDEX IF NOT EXISTS idx_report_templates_name ON report_templates(name);
+                    )
                 """
 
             db_manager.execute_query(create_table_query)
+            if not IS_PG:
+                # sqlite3 runs one statement per execute
+                db_manager.execute_query("CREATE INDEX IF NOT EXISTS idx_report_templates_name ON report_templates(name)")
             logger.info("Report templates table ensured")
 
             # Create default templates if none exist
@@ -2226,26 +2585,22 @@ def register_reporting_routes(app):
             }
         ]
 
+        # One multi-row INSERT for all defaults
+        now = datetime.now()
+        row_placeholders = f"({PH}, {PH}, {PH}, {PH}, {PH})"
+        insert_query = f"""
+            INSERT INTO report_templates (name, description, template_config, created_at, updated_at)
+            VALUES {', '.join([row_placeholders] * len(default_templates))}
+        """
+        params = []
         for template in default_templates:
-            config_json = json.dumps(template['config'])
-            insert_query = """
-                INSERT INTO report_templates (name, description, template_config, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s)
-            """ if db_manager.db_type == 'postgresql' else """
-                INSERT INTO report_templates (name, description, template_config, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            db_manager.execute_query(insert_query, (
-                template['name'],
-                template['description'],
-                config_json,
-                datetime.now(),
-                datetime.now()
-            ))
+            params += [template['name'], template['description'], _json_dumps(template['config']).decode(), now, now]
+        db_manager.execute_query(insert_query, tuple(params))
 
         logger.info("Default report templates created")
 
     @app.route('/api/reports/cash-dashboard', methods=['GET'])
+    @cached_statement
     def api_cash_dashboard():
         """
         Get comprehensive cash dashboard data
@@ -2259,7 +2614,8 @@ def register_reporting_routes(app):
             JSON with cash position, trends, and entity breakdown
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             start_date_str = request.args.get('start_date')
@@ -2271,58 +2627,58 @@ def register_reporting_routes(app):
             end_date = None
 
             if start_date_str:
-                try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'error': 'Invalid start_date format. Use YYYY-MM-DD'}), 400
+                start_date = _parse_iso_date(start_date_str, 'start_date')
 
             if end_date_str:
-                try:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD'}), 400
+                end_date = _parse_iso_date(end_date_str, 'end_date')
 
             # Initialize Cash Dashboard
             cash_dashboard = CashDashboard()
 
-            # Get current cash position
-            cash_position = cash_dashboard.get_current_cash_position(entity=entity_filter)
-
-            # Get cash trend (7 and 30 days)
-            trend_7_days = cash_dashboard.get_cash_trend(days=7, entity=entity_filter)
-            trend_30_days = cash_dashboard.get_cash_trend(days=30, entity=entity_filter)
+            # Cash position, 7/30-day trends (one transactions scan) and entity
+            # comparison are independent queries - run them side by side
+            position_future = _report_pool.submit(cash_dashboard.get_current_cash_position, entity=entity_filter)
+            trends_future = _report_pool.submit(cash_dashboard.get_cash_trends_multi, windows=(7, 30), entity=entity_filter)
+            comparison_future = _report_pool.submit(cash_dashboard.get_entity_cash_comparison)
 
-            # Get entity comparison
-            entity_comparison = cash_dashboard.get_entity_cash_comparison()
+            try:
+                cash_position, trends, entity_comparison = _gather(position_future, trends_future, comparison_future)
+            except FutureTimeoutError:
+                logger.error(f"Cash dashboard exceeded {REPORT_TIMEOUT_SECONDS}s")
+                return _json_response({
+                    'success': False,
+                    'error': f'Cash dashboard generation timed out after {REPORT_TIMEOUT_SECONDS} seconds'
+                }, 504)
 
             # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'cash_position': cash_position,
                     'trends': {
-                        '7_days': trend_7_days,
-                        '30_days': trend_30_days
+                        '7_days': trends[7],
+                        '30_days': trends[30]
                     },
                     'entity_comparison': entity_comparison
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             })
 
+        except BadRequest:
+            raise
+
         except Exception as e:
-            logger.error(f"Error generating cash dashboard: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating cash dashboard: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/cash-trend', methods=['GET'])
+    @cached_statement
     def api_cash_trend():
         """
         Get detailed cash flow trend analysis
@@ -2336,7 +2692,8 @@ def register_reporting_routes(app):
             JSON with detailed cash flow trend data for charts
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             days = int(request.args.get('days', 30))
@@ -2345,10 +2702,10 @@ def register_reporting_routes(app):
 
             # Validate parameters
             if days < 1 or days > 365:
-                return jsonify({'error': 'Days must be between 1 and 365'}), 400
+                return _json_response({'error': 'Days must be between 1 and 365'}, 400)
 
             if granularity not in ['daily', 'weekly', 'monthly']:
-                return jsonify({'error': 'Granularity must be daily, weekly, or monthly'}), 400
+                return _json_response({'error': 'Granularity must be daily, weekly, or monthly'}, 400)
 
             # Initialize Cash Dashboard
             cash_dashboard = CashDashboard()
@@ -2360,45 +2717,21 @@ def register_reporting_routes(app):
             )
 
             # Format for Chart.js
+            points = trend_data.get('daily_points', [])
+            inflows_meta, outflows_meta, net_meta = _CASH_TREND_DATASETS
             chart_data = {
-                'labels': [],
+                'labels': [point.get('date', '') for point in points],
                 'datasets': [
-                    {
-                        'label': 'Inflows (+)',
-                        'data': [],
-                        'borderColor': '#10b981',
-                        'backgroundColor': 'rgba(16, 185, 129, 0.1)',
-                        'fill': True
-                    },
-                    {
-                        'label': 'Outflows (-)',
-                        'data': [],
-                        'borderColor': '#ef4444',
-                        'backgroundColor': 'rgba(239, 68, 68, 0.1)',
-                        'fill': True
-                    },
-                    {
-                        'label': 'Net Flow',
-                        'data': [],
-                        'borderColor': '#3b82f6',
-                        'backgroundColor': 'rgba(59, 130, 246, 0.1)',
-                        'fill': False,
-                        'type': 'line'
-                    }
+                    {**inflows_meta, 'data': [point.get('inflows', 0) for point in points]},
+                    {**outflows_meta, 'data': [abs(point.get('outflows', 0)) for point in points]},
+                    {**net_meta, 'data': [point.get('net_flow', 0) for point in points]}
                 ]
             }
 
-            for point in trend_data.get('daily_points', []):
-                chart_data['labels'].append(point.get('date', ''))
-                chart_data['datasets'][0]['data'].append(point.get('inflows', 0))
-                chart_data['datasets'][1]['data'].append(abs(point.get('outflows', 0)))
-                chart_data['datasets'][2]['data'].append(point.get('net_flow', 0))
-
             # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'trend_summary': trend_data,
@@ -2409,18 +2742,16 @@ def register_reporting_routes(app):
                         'granularity': granularity
                     }
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             })
 
         except Exception as e:
-            logger.error(f"Error generating cash trend: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating cash trend: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/entity-performance', methods=['GET'])
     def api_entity_performance():
@@ -2436,7 +2767,8 @@ def register_reporting_routes(app):
             JSON with entity performance metrics and comparisons
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             period = request.args.get('period', 'monthly')
@@ -2445,42 +2777,34 @@ def register_reporting_routes(app):
 
             # Validate parameters
             if period not in ['weekly', 'monthly', 'quarterly']:
-                return jsonify({'error': 'Period must be weekly, monthly, or quarterly'}), 400
+                return _json_response({'error': 'Period must be weekly, monthly, or quarterly'}, 400)
 
-            if metric not in ['revenue', 'profit', 'transactions']:
-                return jsonify({'error': 'Metric must be revenue, profit, or transactions'}), 400
+            if metric not in ENTITY_METRIC_COLUMNS:
+                return _json_response({'error': 'Metric must be revenue, profit, or transactions'}, 400)
 
             if top_n < 1 or top_n > 50:
-                return jsonify({'error': 'Top N must be between 1 and 50'}), 400
+                return _json_response({'error': 'Top N must be between 1 and 50'}, 400)
 
             # Initialize Cash Dashboard
             cash_dashboard = CashDashboard()
 
-            # Get entity comparison
-            entity_data = cash_dashboard.get_entity_cash_comparison()
-
-            # Sort entities by requested metric
-            if metric == 'revenue':
-                sorted_entities = sorted(
-                    entity_data.get('entities', []),
-                    key=lambda x: x.get('total_inflows', 0),
-                    reverse=True
-                )
-            elif metric == 'profit':
-                sorted_entities = sorted(
-                    entity_data.get('entities', []),
-                    key=lambda x: x.get('net_flow', 0),
-                    reverse=True
-                )
-            else:  # transactions
-                sorted_entities = sorted(
-                    entity_data.get('entities', []),
-                    key=lambda x: x.get('transaction_count', 0),
-                    reverse=True
-                )
+            # Entity comparison and the top-N ranking (sorted and cut by the
+            # database) are independent queries - run them side by side
+            comparison_future = _report_pool.submit(cash_dashboard.get_entity_cash_comparison)
+            ranking_future = _report_pool.submit(
+                cash_dashboard.get_entity_flow_ranking, ENTITY_METRIC_COLUMNS[metric], top_n
+            )
 
-            # Limit to top N
-            top_entities = sorted_entities[:top_n]
+            try:
+                comparison, ranking = _gather(comparison_future, ranking_future)
+                entity_data = {**comparison, **ranking}
+            except FutureTimeoutError:
+                logger.error(f"Entity performance exceeded {REPORT_TIMEOUT_SECONDS}s")
+                return _json_response({
+                    'success': False,
+                    'error': f'Entity performance generation timed out after {REPORT_TIMEOUT_SECONDS} seconds'
+                }, 504)
+            top_entities = entity_data.get('entities', [])
 
             # Format for charts
             chart_data = {
@@ -2501,18 +2825,17 @@ def register_reporting_routes(app):
 
             # Calculate performance metrics
             performance_metrics = {
-                'total_entities': len(entity_data.get('entities', [])),
-                'profitable_entities': len([e for e in entity_data.get('entities', []) if e.get('net_flow', 0) > 0]),
+                'total_entities': entity_data.get('total_entities', 0),
+                'profitable_entities': entity_data.get('profitable_entities', 0),
                 'top_performer': top_entities[0] if top_entities else None,
                 'period_analysis': period,
                 'metric_focus': metric
             }
 
             # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'entity_performance': {
@@ -2522,20 +2845,19 @@ def register_reporting_routes(app):
                     },
                     'summary': entity_data
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             })
 
         except Exception as e:
-            logger.error(f"Error generating entity performance: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating entity performance: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/monthly-pl', methods=['GET'])
+    @cached_statement(version_query=CHARTS_VERSION_QUERY, version_name='charts_version_v1')
     def api_monthly_pl():
         """
         Get Monthly P&L breakdown (Revenue vs Expenses vs Profit) - Simplified version
@@ -2549,7 +2871,8 @@ def register_reporting_routes(app):
             JSON with monthly P&L analysis ready for charts and dashboards
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters with support for 'all' data
             months_back_param = request.args.get('months_back', '12')
@@ -2559,24 +2882,14 @@ def register_reporting_routes(app):
             # Determine date range
             if start_date_param and end_date_param:
                 # Use custom date range
-                start_date = datetime.strptime(start_date_param, '%Y-%m-%d').date()
-                end_date = datetime.strptime(end_date_param, '%Y-%m-%d').date()
+                start_date = _parse_iso_date(start_date_param, 'start_date')
+                end_date = _parse_iso_date(end_date_param, 'end_date')
             elif months_back_param == 'all':
                 # Use all available data - find min/max dates
-                date_range_query = """
-                    SELECT
-                        MIN(date::date) as min_date,
-                        MAX(date::date) as max_date
-                    FROM (
-                        SELECT date::date as date FROM transactions WHERE date IS NOT NULL
-                        UNION ALL
-                        SELECT date::date as date FROM invoices WHERE date IS NOT NULL
-                    ) combined_dates
-                """
-                date_range_result = db_manager.execute_query(date_range_query, fetch_one=True)
-                if date_range_result and date_range_result.get('min_date'):
-                    start_date = date_range_result['min_date']
-                    end_date = date_range_result['max_date'] or date.today()
+                date_range = _data_date_range()
+                if date_range:
+                    start_date = date_range[0]
+                    end_date = date_range[1] or date.today()
                 else:
                     # Fallback if no data found
                     end_date = date.today()
@@ -2585,126 +2898,180 @@ def register_reporting_routes(app):
                 # Use months_back parameter
                 months_back = int(months_back_param)
                 if months_back < 1 or months_back > 36:
-                    return jsonify({'error': 'Months back must be between 1 and 36'}), 400
+                    return _json_response({'error': 'Months back must be between 1 and 36'}, 400)
 
                 end_date = date.today()
                 start_date = end_date - timedelta(days=months_back * 30)
 
-            # Consolidated query combining transactions + invoices - with NaN filtering
-            monthly_pl_query = """
-                WITH combined_data AS (
-                    -- Transactions data (can be revenue or expenses)
-                    SELECT
-                        date::date as transaction_date,
-                        CASE WHEN amount > 0 THEN amount ELSE 0 END as revenue,
-                        CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END as expenses,
-                        'transaction' as source_type
-                    FROM transactions
-                    WHERE date::date >= %s AND date::date <= %s
-                        AND amount::text != 'NaN' AND amount IS NOT NULL
-
-                    UNION ALL
-
-                    -- Invoices data (always revenue)
-                    SELECT
-                        date::date as transaction_date,
-                        CASE
-                            WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$'
-                            THEN total_amount::float
-                            ELSE 0
-                        END as revenue,
-                        0 as expenses,
-                        'invoice' as source_type
-                    FROM invoices
-                    WHERE date::date >= %s AND date::date <= %s
-                        AND total_amount IS NOT NULL
-                        AND total_amount::text != 'NaN'
-                        AND total_amount::text != ''
-                )
-                SELECT
-                    EXTRACT(YEAR FROM transaction_date) as year,
-                    EXTRACT(MONTH FROM transaction_date) as month_number,
-                    SUM(revenue) as total_revenue,
-                    SUM(expenses) as total_expenses,
-                    SUM(revenue) - SUM(expenses) as net_profit,
-                    COUNT(*) as transaction_count
-                FROM combined_data
-                GROUP BY EXTRACT(YEAR FROM transaction_date), EXTRACT(MONTH FROM transaction_date)
-                ORDER BY year, month_number
-            """
-
-            monthly_data = db_manager.execute_query(monthly_pl_query, (start_date, end_date, start_date, end_date), fetch_all=True)
-
-            # Process monthly data - simplified
-            monthly_pl = []
-            total_revenue = 0
-            total_expenses = 0
-            total_profit = 0
-
-            # Check if we have data
-            if monthly_data and len(monthly_data) > 0:
-                for row in monthly_data:
-                    try:
-                        # Safe conversion of values
-                        revenue = float(row.get('total_revenue', 0) or 0)
-                        expenses = float(row.get('total_expenses', 0) or 0)
-                        profit = float(row.get('net_profit', 0) or 0)
-                        year = int(row.get('year', 2024) or 2024)
-                        month_num = int(row.get('month_number', 1) or 1)
-
-                        # Create month display
-                        month_display = f"{calendar.month_abbr[month_num]} {year}"
-
-                        monthly_record = {
-                            'month': month_display,
-                            'year': year,
-                            'month_number': month_num,
-                            'revenue': revenue,
-                            'expenses': expenses,
-                            'profit': profit,
-                            'transaction_count': int(row.get('transaction_count', 0) or 0)
-                        }
-
-                        monthly_pl.append(monthly_record)
-
-                        # Accumulate totals
-                        total_revenue += revenue
-                        total_expenses += expenses
-                        total_profit += profit
+            # Closed months come pre-aggregated from monthly_pl_mv; only the
+            # partial months at the edges (and the current month) are scanned live
+            mv_range = _monthly_pl_split(start_date, end_date, date.today())
+            monthly_data = None
+            if mv_range:
+                try:
+                    if _has_monthly_pl_mv():
+                        mv_start, mv_end = mv_range
+                        monthly_data = db_manager.execute_prepared(
+                            MONTHLY_PL_MV_QUERY,
+                            (mv_start, mv_end, start_date, mv_start, mv_end, end_date,
+                             start_date, mv_start, mv_end, end_date),
+                            fetch_all=True, name='monthly_pl_mv_v1'
+                        )
+                except Exception as e:
+                    logger.warning(f"monthly_pl_mv unavailable, aggregating live: {e}")
+
+            if monthly_data is None:
+                if _has_column('invoices', 'total_amount_num'):
+                    monthly_data = db_manager.execute_prepared(
+                        MONTHLY_PL_QUERY, (start_date, end_date, start_date, end_date), fetch_all=True, name='monthly_pl_v2'
+                    )
+                else:
+                    monthly_data = db_manager.execute_prepared(
+                        MONTHLY_PL_LEGACY_QUERY, (start_date, end_date, start_date, end_date),
+                        fetch_all=True, name='monthly_pl_legacy_v1'
+                    )
 
-                    except Exception as row_error:
-                        logger.warning(f"Error processing monthly row: {row_error}")
-                        continue
+            # Process monthly data
+            monthly_pl, period_totals = _monthly_pl_rows(monthly_data or [])
 
             # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'monthly_pl': monthly_pl,
                     'summary': {
-                        'period_totals': {
-                            'total_revenue': round(total_revenue, 2),
-                            'total_expenses': round(total_expenses, 2),
-                            'total_profit': round(total_profit, 2),
-                        }
+                        'period_totals': period_totals
                     },
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
+        except BadRequest:
+            raise
+
         except Exception as e:
-            logger.error(f"Error generating monthly P&L: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating monthly P&L: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
-
+            }, 500)
+
+
+    # Date-range clause for api_entity_summary, and its entity and monthly
+    # trend queries with and without it
+    ENTITY_DATE_FILTER = """
+        AND date::date >= %s::date
+        AND date::date <= %s::date
+    """ if IS_PG else "AND date >= ? AND date <= ?"
+    # Per-entity metrics, ratios and classifications are all computed by the
+    # database; a TOTAL_ROW_LABEL row carries the system totals
+    ENTITY_SUMMARY_QUERIES = {
+        date_filter: f"""
+        WITH per_entity AS (
+            SELECT
+                COALESCE(classified_entity, accounting_category, 'Uncategorized') as entity,
+                CAST(COUNT(*) AS BIGINT) as total_transactions,
+                CAST(COUNT(CASE WHEN amount > 0 THEN 1 END) AS BIGINT) as revenue_transactions,
+                CAST(COUNT(CASE WHEN amount < 0 THEN 1 END) AS BIGINT) as expense_transactions,
+                CAST(SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) AS DOUBLE PRECISION) as total_revenue,
+                CAST(SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) AS DOUBLE PRECISION) as total_expenses,
+                CAST(SUM(amount) AS DOUBLE PRECISION) as net_profit,
+                CAST(COALESCE(AVG(CASE WHEN amount > 0 THEN amount END), 0) AS DOUBLE PRECISION) as avg_revenue_per_transaction,
+                CAST(COALESCE(AVG(CASE WHEN amount < 0 THEN ABS(amount) END), 0) AS DOUBLE PRECISION) as avg_expense_per_transaction,
+                CAST(COALESCE(MIN(CASE WHEN amount > 0 THEN amount END), 0) AS DOUBLE PRECISION) as min_revenue_transaction,
+                CAST(COALESCE(MAX(CASE WHEN amount > 0 THEN amount END), 0) AS DOUBLE PRECISION) as max_revenue_transaction,
+                CAST(COALESCE(MIN(CASE WHEN amount < 0 THEN ABS(amount) END), 0) AS DOUBLE PRECISION) as min_expense_transaction,
+                CAST(COALESCE(MAX(CASE WHEN amount < 0 THEN ABS(amount) END), 0) AS DOUBLE PRECISION) as max_expense_transaction
+            FROM transactions
+            WHERE CAST(amount AS TEXT) != 'NaN' AND amount IS NOT NULL
+            {date_filter}
+            GROUP BY COALESCE(classified_entity, accounting_category, 'Uncategorized')
+            HAVING COUNT(*) >= {PH}
+        ),
+        ratios AS (
+            SELECT
+                per_entity.*,
+                CASE WHEN total_revenue > 0 THEN net_profit * 100 / total_revenue ELSE 0 END as profit_margin,
+                CASE WHEN total_expenses > 0 THEN net_profit * 100 / total_expenses ELSE 0 END as roi,
+                CASE WHEN total_expenses > 0 THEN total_revenue / total_expenses ELSE 0 END as efficiency_ratio,
+                CAST(CASE WHEN total_transactions >= 100 THEN 100 ELSE total_transactions END AS DOUBLE PRECISION) as transaction_volume_score
+            FROM per_entity
+        )
+        SELECT
+            ratios.*,
+            CASE
+                WHEN net_profit > 0 AND profit_margin > 20 THEN 'High'
+                WHEN net_profit > 0 AND profit_margin > 10 THEN 'Medium'
+                WHEN net_profit > 0 THEN 'Low-Positive'
+                ELSE 'Low'
+            END as performance_tier,
+            CASE
+                WHEN net_profit < 0 THEN 'High'
+                WHEN profit_margin < 5 THEN 'Medium'
+                ELSE 'Low'
+            END as risk_level,
+            CASE WHEN net_profit > 0 THEN 'Profitable' ELSE 'Loss-making' END as profitability_status,
+            CASE
+                WHEN net_profit > 0 AND total_transactions > 50 THEN 'High'
+                WHEN net_profit > 0 THEN 'Medium'
+                ELSE 'Low'
+            END as growth_potential
+        FROM ratios
+        UNION ALL
+        SELECT
+            '{TOTAL_ROW_LABEL}',
+            CAST(COALESCE(SUM(total_transactions), 0) AS BIGINT),
+            CAST(COALESCE(SUM(revenue_transactions), 0) AS BIGINT),
+            CAST(COALESCE(SUM(expense_transactions), 0) AS BIGINT),
+            COALESCE(SUM(total_revenue), 0),
+            COALESCE(SUM(total_expenses), 0),
+            COALESCE(SUM(net_profit), 0),
+            0, 0, 0, 0, 0, 0,
+            CASE WHEN SUM(total_revenue) > 0 THEN SUM(net_profit) * 100 / SUM(total_revenue) ELSE 0 END,
+            0, 0, 0,
+            NULL, NULL, NULL, NULL
+        FROM per_entity
+        ORDER BY net_profit DESC
+        """
+        for date_filter in ('', ENTITY_DATE_FILTER)
+    }
+    # Monthly trends for the top ENTITY_TREND_COUNT entities in one grouped
+    # query; unused entity slots are bound as NULL, which matches nothing
+    ENTITY_TREND_COUNT = 5
+    ENTITY_TREND_IN = ', '.join([PH] * ENTITY_TREND_COUNT)
+    ENTITY_TREND_QUERIES = {
+        date_filter: f"""
+            SELECT
+                COALESCE(classified_entity, accounting_category, 'Uncategorized') as entity,
+                DATE_TRUNC('month', TO_DATE(date, 'MM/DD/YYYY')) as month,
+                SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as revenue,
+                SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) as expenses,
+                SUM(amount) as profit,
+                COUNT(*) as transactions
+            FROM transactions
+            WHERE COALESCE(classified_entity, accounting_category, 'Uncategorized') IN ({ENTITY_TREND_IN})
+            {date_filter}
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+        """ if IS_PG else f"""
+            SELECT
+                COALESCE(classified_entity, accounting_category, 'Uncategorized') as entity,
+                substr(date, 1, 7) || '-01' as month,
+                SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as revenue,
+                SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) as expenses,
+                SUM(amount) as profit,
+                COUNT(*) as transactions
+            FROM transactions
+            WHERE COALESCE(classified_entity, accounting_category, 'Uncategorized') IN ({ENTITY_TREND_IN})
+            {date_filter}
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+        """
+        for date_filter in ('', ENTITY_DATE_FILTER)
+    }
 
     @app.route('/api/reports/entity-summary', methods=['GET'])
     def api_entity_summary():
@@ -2722,7 +3089,8 @@ def register_reporting_routes(app):
             JSON with comprehensive entity performance analysis for Delta companies
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             period = request.args.get('period', 'all_time')
@@ -2733,23 +3101,20 @@ def register_reporting_routes(app):
 
             # Validate parameters
             if period not in ['monthly', 'quarterly', 'yearly', 'all_time', 'custom']:
-                return jsonify({'error': 'Period must be monthly, quarterly, yearly, all_time, or custom'}), 400
+                return _json_response({'error': 'Period must be monthly, quarterly, yearly, all_time, or custom'}, 400)
 
             if min_transactions < 1:
-                return jsonify({'error': 'Minimum transactions must be at least 1'}), 400
+                return _json_response({'error': 'Minimum transactions must be at least 1'}, 400)
 
             # Calculate date range based on period
             date_filter = ""
             params = []
 
             if start_date_str and end_date_str:
-                try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                    start_date_str = start_date.isoformat()
-                    end_date_str = end_date.isoformat()
-                except ValueError:
-                    return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+                start_date = _parse_iso_date(start_date_str, 'start_date')
+                end_date = _parse_iso_date(end_date_str, 'end_date')
+                start_date_str = start_date.isoformat()
+                end_date_str = end_date.isoformat()
             elif period != 'all_time' and period != 'custom':
                 end_date = date.today()
                 if period == 'monthly':
@@ -2763,156 +3128,57 @@ def register_reporting_routes(app):
                 end_date_str = end_date.isoformat()
 
             if period != 'all_time':
-                if db_manager.db_type == 'postgresql':
-                    date_filter = """
-                        AND date::date >= %s::date
-                        AND date::date <= %s::date
-                    """
-                    params = [start_date_str, end_date_str]
-                else:
-                    date_filter = """
-                        AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-                        AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
-                    """
-                    params = [start_date_str, end_date_str]
+                date_filter = ENTITY_DATE_FILTER
+                params = [start_date_str, end_date_str]
 
             # Entity performance query - comprehensive analysis
-            entity_query = f"""
-                SELECT
-                    COALESCE(classified_entity, accounting_category, 'Uncategorized') as entity,
-                    COUNT(*) as total_transactions,
-                    COUNT(CASE WHEN amount > 0 THEN 1 END) as revenue_transactions,
-                    COUNT(CASE WHEN amount < 0 THEN 1 END) as expense_transactions,
-                    SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as total_revenue,
-                    SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) as total_expenses,
-                    SUM(amount) as net_profit,
-                    AVG(CASE WHEN amount > 0 THEN amount END) as avg_revenue_per_transaction,
-                    AVG(CASE WHEN amount < 0 THEN ABS(amount) END) as avg_expense_per_transaction,
-                    MIN(CASE WHEN amount > 0 THEN amount END) as min_revenue_transaction,
-                    MAX(CASE WHEN amount > 0 THEN amount END) as max_revenue_transaction,
-                    MIN(CASE WHEN amount < 0 THEN ABS(amount) END) as min_expense_transaction,
-                    MAX(CASE WHEN amount < 0 THEN ABS(amount) END) as max_expense_transaction
-                FROM transactions
-                WHERE 1=1
-                AND amount::text != 'NaN' AND amount IS NOT NULL
-                {date_filter}
-                GROUP BY COALESCE(classified_entity, accounting_category, 'Uncategorized')
-                HAVING COUNT(*) >= {'%s' if db_manager.db_type == 'postgresql' else '?'}
-                ORDER BY SUM(amount) DESC
-            """
+            entity_query = ENTITY_SUMMARY_QUERIES[date_filter]
 
             entity_params = params + [min_transactions]
-            entity_data = db_manager.execute_query(entity_query, tuple(entity_params), fetch_all=True)
-
-            # Process entity data
-            entities = []
-            total_system_revenue = 0
-            total_system_expenses = 0
-            total_system_profit = 0
-            total_system_transactions = 0
-
-            for row in entity_data:
-                try:
-                    # Safe conversion of values
-                    revenue = float(row.get('total_revenue', 0) or 0)
-                    expenses = float(row.get('total_expenses', 0) or 0)
-                    profit = float(row.get('net_profit', 0) or 0)
-                    transactions = int(row.get('total_transactions', 0) or 0)
-
-                    # Calculate performance metrics
-                    profit_margin = (profit / revenue * 100) if revenue > 0 else 0
-                    roi = (profit / expenses * 100) if expenses > 0 else 0
-                    efficiency_ratio = revenue / expenses if expenses > 0 else 0
-
-                    # Transaction metrics
-                    avg_rev_per_trans = float(row.get('avg_revenue_per_transaction', 0) or 0)
-                    avg_exp_per_trans = float(row.get('avg_expense_per_transaction', 0) or 0)
-
-                    # Performance classification
-                    performance_tier = 'Low'
-                    if profit > 0 and profit_margin > 20:
-                        performance_tier = 'High'
-                    elif profit > 0 and profit_margin > 10:
-                        performance_tier = 'Medium'
-                    elif profit > 0:
-                        performance_tier = 'Low-Positive'
-
-                    # Risk assessment
-                    risk_level = 'Low'
-                    if profit < 0:
-                        risk_level = 'High'
-                    elif profit_margin < 5:
-                        risk_level = 'Medium'
-
-                    entity_record = {
-                        'entity': row.get('entity', 'Unknown'),
-                        'financial_metrics': {
-                            'total_revenue': revenue,
-                            'total_expenses': expenses,
-                            'net_profit': profit,
-                            'profit_margin_percent': round(profit_margin, 2),
-                            'roi_percent': round(roi, 2),
-                            'efficiency_ratio': round(efficiency_ratio, 2)
-                        },
-                        'transaction_metrics': {
-                            'total_transactions': transactions,
-                            'revenue_transactions': int(row.get('revenue_transactions', 0) or 0),
-                            'expense_transactions': int(row.get('expense_transactions', 0) or 0),
-                            'avg_revenue_per_transaction': round(avg_rev_per_trans, 2),
-                            'avg_expense_per_transaction': round(avg_exp_per_trans, 2),
-                            'transaction_volume_score': min(transactions / 100, 1.0) * 100  # Scale 0-100
-                        },
-                        'performance_analysis': {
-                            'performance_tier': performance_tier,
-                            'risk_level': risk_level,
-                            'profitability_status': 'Profitable' if profit > 0 else 'Loss-making',
-                            'growth_potential': 'High' if profit > 0 and transactions > 50 else 'Medium' if profit > 0 else 'Low'
-                        },
-                        'range_analysis': {
-                            'min_revenue_transaction': float(row.get('min_revenue_transaction', 0) or 0),
-                            'max_revenue_transaction': float(row.get('max_revenue_transaction', 0) or 0),
-                            'min_expense_transaction': float(row.get('min_expense_transaction', 0) or 0),
-                            'max_expense_transaction': float(row.get('max_expense_transaction', 0) or 0)
-                        }
-                    }
-
-                    entities.append(entity_record)
+            # Prepared per date-filter variant (statement name derives from the SQL)
+            entity_data = db_manager.execute_prepared(entity_query, tuple(entity_params), fetch_all=True)
 
-                    # Accumulate system totals
-                    total_system_revenue += revenue
-                    total_system_expenses += expenses
-                    total_system_profit += profit
-                    total_system_transactions += transactions
+            entity_rows, total_row = _split_total_row(entity_data, key='entity')
 
-                except Exception as row_error:
-                    logger.warning(f"Error processing entity row: {row_error}")
-                    continue
+            # One pass builds the records and every count the response needs
+            entities = []
+            tier_counts = Counter()
+            profitable_count = loss_count = 0
+            for row in entity_rows:
+                entities.append(_entity_summary_record(row))
+                tier_counts[row['performance_tier']] += 1
+                if row['net_profit'] > 0:
+                    profitable_count += 1
+                elif row['net_profit'] < 0:
+                    loss_count += 1
 
             # Calculate system-wide metrics
+            # (risk_level is 'High' exactly for the loss-making entities)
             system_metrics = {
                 'total_entities': len(entities),
-                'profitable_entities': len([e for e in entities if e['financial_metrics']['net_profit'] > 0]),
-                'loss_making_entities': len([e for e in entities if e['financial_metrics']['net_profit'] < 0]),
-                'high_performance_entities': len([e for e in entities if e['performance_analysis']['performance_tier'] == 'High']),
-                'high_risk_entities': len([e for e in entities if e['performance_analysis']['risk_level'] == 'High']),
+                'profitable_entities': profitable_count,
+                'loss_making_entities': loss_count,
+                'high_performance_entities': tier_counts['High'],
+                'high_risk_entities': loss_count,
                 'system_totals': {
-                    'total_revenue': round(total_system_revenue, 2),
-                    'total_expenses': round(total_system_expenses, 2),
-                    'total_profit': round(total_system_profit, 2),
-                    'total_transactions': total_system_transactions,
-                    'overall_margin_percent': round((total_system_profit / total_system_revenue * 100) if total_system_revenue > 0 else 0, 2)
+                    'total_revenue': round(total_row['total_revenue'], 2) if total_row else 0,
+                    'total_expenses': round(total_row['total_expenses'], 2) if total_row else 0,
+                    'total_profit': round(total_row['net_profit'], 2) if total_row else 0,
+                    'total_transactions': total_row['total_transactions'] if total_row else 0,
+                    'overall_margin_percent': round(total_row['profit_margin'], 2) if total_row else 0
                 }
             }
 
             # Entity rankings and comparisons
+            # (the query already orders by net profit, so both profit rankings are
+            # slices; the rest are top 5 by heap selection - O(N log 5))
             rankings = {
-                'top_revenue_entities': sorted(entities, key=lambda x: x['financial_metrics']['total_revenue'], reverse=True)[:5],
-                'top_profit_entities': sorted(entities, key=lambda x: x['financial_metrics']['net_profit'], reverse=True)[:5],
-                'top_margin_entities': sorted([e for e in entities if e['financial_metrics']['total_revenue'] > 0],
-                                             key=lambda x: x['financial_metrics']['profit_margin_percent'], reverse=True)[:5],
-                'top_transaction_volume_entities': sorted(entities, key=lambda x: x['transaction_metrics']['total_transactions'], reverse=True)[:5],
-                'underperforming_entities': sorted([e for e in entities if e['financial_metrics']['net_profit'] < 0],
-                                                  key=lambda x: x['financial_metrics']['net_profit'])[:5]
+                'top_revenue_entities': heapq.nlargest(5, entities, key=lambda x: x['financial_metrics']['total_revenue']),
+                'top_profit_entities': entities[:5],
+                'top_margin_entities': heapq.nlargest(5, (e for e in entities if e['financial_metrics']['total_revenue'] > 0),
+                                                      key=lambda x: x['financial_metrics']['profit_margin_percent']),
+                'top_transaction_volume_entities': heapq.nlargest(5, entities, key=lambda x: x['transaction_metrics']['total_transactions']),
+                'underperforming_entities': [e for e in reversed(entities[-5:]) if e['financial_metrics']['net_profit'] < 0]
             }
 
             # Chart data for visualizations
@@ -2931,12 +3197,7 @@ def register_reporting_routes(app):
                 },
                 'performance_distribution': {
                     'labels': ['High Performance', 'Medium Performance', 'Low-Positive', 'Loss-making'],
-                    'data': [
-                        len([e for e in entities if e['performance_analysis']['performance_tier'] == 'High']),
-                        len([e for e in entities if e['performance_analysis']['performance_tier'] == 'Medium']),
-                        len([e for e in entities if e['performance_analysis']['performance_tier'] == 'Low-Positive']),
-                        len([e for e in entities if e['performance_analysis']['performance_tier'] == 'Low'])
-                    ],
+                    'data': [tier_counts['High'], tier_counts['Medium'], tier_counts['Low-Positive'], tier_counts['Low']],
                     'backgroundColor': ['#10b981', '#3b82f6', '#f59e0b', '#ef4444']
                 }
             }
@@ -2944,13 +3205,12 @@ def register_reporting_routes(app):
             # Trend analysis if requested
             trend_data = {}
             if include_trends and period != 'all_time':
-                trend_data = get_entity_trend_analysis(date_filter, params, entities[:5])  # Top 5 for trends
+                trend_data = get_entity_trend_analysis(date_filter, params, entities[:ENTITY_TREND_COUNT])
 
             # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'entities': entities,
@@ -2968,76 +3228,59 @@ def register_reporting_routes(app):
                         }
                     }
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             })
 
+        except BadRequest:
+            raise
+
         except Exception as e:
-            logger.error(f"Error generating entity summary: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating entity summary: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     def get_entity_trend_analysis(date_filter, base_params, top_entities):
-        """Get trend analysis for top entities over time"""
+        """
+        Get trend analysis for top entities over time
+
+        One query returns the monthly rows of every entity (at most
+        ENTITY_TREND_COUNT); they're bucketed per entity here.
+        """
         try:
             trends = {}
 
-            for entity in top_entities:
-                entity_name = entity['entity']
+            entity_names = [entity['entity'] for entity in top_entities[:ENTITY_TREND_COUNT]]
+            if not entity_names:
+                return trends
 
-                # Monthly trends for this entity
-                if db_manager.db_type == 'postgresql':
-                    trend_query = f"""
-                        SELECT
-                            DATE_TRUNC('month', TO_DATE(date, 'MM/DD/YYYY')) as month,
-                            SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as revenue,
-                            SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) as expenses,
-                            SUM(amount) as profit,
-                            COUNT(*) as transactions
-                        FROM transactions
-                        WHERE COALESCE(classified_entity, accounting_category, 'Uncategorized') = %s
-                        {date_filter}
-                        GROUP BY DATE_TRUNC('month', TO_DATE(date, 'MM/DD/YYYY'))
-                        ORDER BY month
-                    """
-                else:
-                    trend_query = f"""
-                        SELECT
-                            substr(date, 7, 4) || '-' ||
-                            CASE WHEN length(substr(date, 1, 2)) = 1 THEN '0' || substr(date, 1, 1) ELSE substr(date, 1, 2) END || '-01' as month,
-                            SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END) as revenue,
-                            SUM(CASE WHEN amount < 0 THEN ABS(amount) ELSE 0 END) as expenses,
-                            SUM(amount) as profit,
-                            COUNT(*) as transactions
-                        FROM transactions
-                        WHERE COALESCE(classified_entity, accounting_category, 'Uncategorized') = ?
-                        {date_filter}
-                        GROUP BY substr(date, 7, 4), substr(date, 1, 2)
-                        ORDER BY month
-                    """
+            entity_slots = entity_names + [None] * (ENTITY_TREND_COUNT - len(entity_names))
+            trend_result = db_manager.execute_prepared(
+                ENTITY_TREND_QUERIES[date_filter], tuple(entity_slots + list(base_params)), fetch_all=True
+            )
 
-                trend_params = [entity_name] + base_params
-                trend_result = db_manager.execute_query(trend_query, tuple(trend_params), fetch_all=True)
+            rows_by_entity = {entity_name: [] for entity_name in entity_names}
+            for row in trend_result or []:
+                rows_by_entity[row['entity']].append(row)
 
+            for entity_name, entity_rows in rows_by_entity.items():
                 monthly_trends = []
-                for row in trend_result:
+                for row in entity_rows:
                     try:
-                        revenue = float(row.get('revenue', 0) or 0)
-                        expenses = float(row.get('expenses', 0) or 0)
-                        profit = float(row.get('profit', 0) or 0)
+                        revenue = float(row['revenue'] or 0)
+                        expenses = float(row['expenses'] or 0)
+                        profit = float(row['profit'] or 0)
 
                         # Format month display
                         month_display = 'Unknown'
-                        if row.get('month'):
-                            if db_manager.db_type == 'postgresql' and hasattr(row['month'], 'strftime'):
+                        if row['month']:
+                            if IS_PG and hasattr(row['month'], 'strftime'):
                                 month_display = row['month'].strftime('%b %Y')
                             elif isinstance(row['month'], str):
                                 try:
-                                    month_obj = datetime.strptime(row['month'][:10], '%Y-%m-%d')
+                                    month_obj = date.fromisoformat(row['month'][:10])
                                     month_display = month_obj.strftime('%b %Y')
                                 except:
                                     month_display = row['month'][:7]
@@ -3047,7 +3290,7 @@ def register_reporting_routes(app):
                             'revenue': revenue,
                             'expenses': expenses,
                             'profit': profit,
-                            'transactions': int(row.get('transactions', 0) or 0),
+                            'transactions': int(row['transactions'] or 0),
                             'margin_percent': round((profit / revenue * 100) if revenue > 0 else 0, 2)
                         })
                     except Exception as trend_row_error:
@@ -3089,7 +3332,8 @@ def register_reporting_routes(app):
             JSON with Sankey diagram nodes and links for D3.js
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             start_date_str = request.args.get('start_date')
@@ -3102,24 +3346,18 @@ def register_reporting_routes(app):
             params = []
 
             if start_date_str and end_date_str:
-                try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-
-                    if db_manager.db_type == 'postgresql':
-                        date_filter = """
-                            AND TO_DATE(date, 'MM/DD/YYYY') >= TO_DATE(%s, 'YYYY-MM-DD')
-                            AND TO_DATE(date, 'MM/DD/YYYY') <= TO_DATE(%s, 'YYYY-MM-DD')
-                        """
-                        params = [start_date_str, end_date_str]
-                    else:
-                        date_filter = """
-                            AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) >= date(?)
-                            AND date(substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2)) <= date(?)
-                        """
-                        params = [start_date_str, end_date_str]
-                except ValueError:
-                    return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+                _parse_iso_date(start_date_str, 'start_date')
+                _parse_iso_date(end_date_str, 'end_date')
+
+                if IS_PG:
+                    date_filter = """
+                        AND TO_DATE(date, 'MM/DD/YYYY') >= TO_DATE(%s, 'YYYY-MM-DD')
+                        AND TO_DATE(date, 'MM/DD/YYYY') <= TO_DATE(%s, 'YYYY-MM-DD')
+                    """
+                    params = [start_date_str, end_date_str]
+                else:
+                    date_filter = "AND date >= ? AND date <= ?"
+                    params = [start_date_str, end_date_str]
 
             # Get revenue categories (sources)
             revenue_query = f"""
@@ -3131,9 +3369,9 @@ def register_reporting_routes(app):
                 WHERE amount > 0
                 {date_filter}
                 GROUP BY COALESCE(accounting_category, classified_entity, 'Other Revenue')
-                HAVING SUM(amount) >= {'%s' if db_manager.db_type == 'postgresql' else '?'}
+                HAVING SUM(amount) >= {PH}
                 ORDER BY total_amount DESC
-                LIMIT {'%s' if db_manager.db_type == 'postgresql' else '?'}
+                LIMIT {PH}
             """
 
             revenue_params = params + [min_amount, max_categories]
@@ -3149,9 +3387,9 @@ def register_reporting_routes(app):
                 WHERE amount < 0
                 {date_filter}
                 GROUP BY COALESCE(accounting_category, classified_entity, 'Other Expenses')
-                HAVING SUM(ABS(amount)) >= {'%s' if db_manager.db_type == 'postgresql' else '?'}
+                HAVING SUM(ABS(amount)) >= {PH}
                 ORDER BY total_amount DESC
-                LIMIT {'%s' if db_manager.db_type == 'postgresql' else '?'}
+                LIMIT {PH}
             """
 
             expense_params = params + [min_amount, max_categories]
@@ -3240,10 +3478,9 @@ def register_reporting_routes(app):
             }
 
             # Calculate generation time
-            end_time = datetime.now()
-            generation_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'sankey': {
@@ -3256,18 +3493,19 @@ def register_reporting_routes(app):
                         'max_categories': max_categories
                     }
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             })
 
+        except BadRequest:
+            raise
+
         except Exception as e:
-            logger.error(f"Error generating Sankey flow data: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating Sankey flow data: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # CFO Financial Ratios & KPIs Report
@@ -3287,7 +3525,8 @@ def register_reporting_routes(app):
             JSON with comprehensive financial ratios and KPIs for CFO analysis
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             period = request.args.get('period', 'all_time')
@@ -3298,6 +3537,7 @@ def register_reporting_routes(app):
             # Build filters
             date_filter = ""
             entity_filter_clause = ""
+            invoice_entity_clause = ""
             params = []
 
             if start_date_str and end_date_str:
@@ -3317,9 +3557,12 @@ def register_reporting_routes(app):
 
             if entity_filter:
                 entity_filter_clause = "AND (classified_entity = %s OR accounting_category = %s)"
+                # Same two parameters, matched against the invoice vendor
+                invoice_entity_clause = "AND (vendor_name = %s OR vendor_name = %s)"
                 params.extend([entity_filter, entity_filter])
 
             # Get comprehensive financial data for ratio calculations
+            invoice_amount = _invoice_amount_sql()
             financial_data_query = f"""
                 WITH combined_financial_data AS (
                     -- Transaction data
@@ -3339,26 +3582,16 @@ def register_reporting_routes(app):
 
                     -- Invoice data (always revenue)
                     SELECT
-                        CASE
-                            WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$'
-                            THEN total_amount::float
-                            ELSE 0
-                        END as revenue,
+                        {invoice_amount}::float8 as revenue,
                         0 as expenses,
-                        CASE
-                            WHEN total_amount::text ~ '^[0-9]+\.?[0-9]*$'
-                            THEN total_amount::float
-                            ELSE 0
-                        END as net_amount,
+                        {invoice_amount}::float8 as net_amount,
                         vendor_name as classified_entity,
                         'INVOICE_REVENUE' as accounting_category,
                         date::date as transaction_date
                     FROM invoices
-                    WHERE total_amount IS NOT NULL
-                        AND total_amount::text != 'NaN'
-                        AND total_amount::text != ''
+                    WHERE {invoice_amount} IS NOT NULL
                         {date_filter}
-                        {entity_filter_clause.replace('classified_entity', 'vendor_name').replace('accounting_category', 'vendor_name') if entity_filter_clause else ''}
+                        {invoice_entity_clause}
                 ),
                 financial_summary AS (
                     SELECT
@@ -3413,7 +3646,7 @@ def register_reporting_routes(app):
             cash_conversion_efficiency = (current_cash / total_revenue * 100) if total_revenue > 0 else 0
 
             # Compile comprehensive CFO report
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
             cfo_report = {
                 'report_type': 'CFO_Financial_Ratios_KPIs',
@@ -3450,23 +3683,21 @@ def register_reporting_routes(app):
                     'operational_efficiency': 'High' if expense_ratio < 50 else 'Moderate' if expense_ratio < 80 else 'Low',
                     'profitability': 'Excellent' if gross_margin > 30 else 'Good' if gross_margin > 10 else 'Poor' if gross_margin > 0 else 'Loss'
                 },
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             }
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': cfo_report
             })
 
         except Exception as e:
-            logger.error(f"Error generating CFO financial ratios report: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating CFO financial ratios report: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # CFO Executive Summary Report
@@ -3479,7 +3710,8 @@ def register_reporting_routes(app):
         Provides high-level overview with key metrics and insights
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Get current period data (last 30 days)
             end_date = date.today()
@@ -3527,7 +3759,7 @@ def register_reporting_routes(app):
             expense_change = ((current_expenses - prev_expenses) / prev_expenses * 100) if prev_expenses > 0 else 0
             net_change = ((current_net - prev_net) / abs(prev_net) * 100) if prev_net != 0 else 0
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
             executive_summary = {
                 'report_type': 'CFO_Executive_Summary',
@@ -3561,21 +3793,21 @@ def register_reporting_routes(app):
                     f"Net income shows {'positive' if current_net > 0 else 'negative'} performance with {abs(net_change):.1f}% change",
                     f"Operating efficiency: {((current_revenue - current_expenses) / current_revenue * 100):.1f}% profit margin" if current_revenue > 0 else "Revenue generation needs attention"
                 ],
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': now,
                 'generation_time_ms': generation_time_ms
             }
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': executive_summary
             })
 
         except Exception as e:
             logger.error(f"Error generating executive summary: {e}")
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # Cash Flow Statement (Operating, Investing, Financing Activities)
@@ -3598,7 +3830,8 @@ def register_reporting_routes(app):
             JSON with Cash Flow Statement broken down by activity type
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             start_date_str = request.args.get('start_date')
@@ -3773,9 +4006,9 @@ def register_reporting_routes(app):
             beginning_balance = Decimal(str(beginning_result['balance'] or 0)) if beginning_result else Decimal('0')
             ending_balance = beginning_balance + net_cash_flow
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'statement': {
                     'statement_type': 'CashFlowStatement',
@@ -3814,19 +4047,17 @@ def register_reporting_routes(app):
                         'free_cash_flow': float(operating_total + investing_total),
                         'cash_flow_adequacy': float(operating_total / abs(investing_total)) if investing_total < 0 else 0
                     },
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating cash flow statement: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating cash flow statement: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # Budget vs Actual Analysis
@@ -3850,7 +4081,8 @@ def register_reporting_routes(app):
             JSON with variance analysis showing budget vs actual performance
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             if request.method == 'POST':
@@ -4018,9 +4250,9 @@ def register_reporting_routes(app):
             net_income_budget = total_revenue_budget - total_expense_budget
             net_income_variance = net_income_actual - net_income_budget
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'report': {
                     'report_type': 'BudgetVsActual',
@@ -4061,19 +4293,17 @@ def register_reporting_routes(app):
                         'expense_control': 'Under Budget' if total_expense_variance < 0 else 'Over Budget' if total_expense_variance > 0 else 'On Budget',
                         'overall_performance': 'Exceeding Expectations' if net_income_variance > 0 else 'Below Expectations' if net_income_variance < 0 else 'Meeting Expectations'
                     },
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating budget vs actual report: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating budget vs actual report: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # Comprehensive Trend Analysis with Forecasting
@@ -4097,7 +4327,8 @@ def register_reporting_routes(app):
             JSON with trend analysis data and insights
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             metric = request.args.get('metric', 'all')
@@ -4242,9 +4473,9 @@ def register_reporting_routes(app):
                 revenue_trend_direction = expense_trend_direction = profit_trend_direction = 'insufficient_data'
                 forecast_periods = []
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'analysis': {
                     'report_type': 'TrendAnalysis',
@@ -4281,19 +4512,17 @@ def register_reporting_routes(app):
                         f"Profit trend is {profit_trend_direction} with average {abs(avg_profit_growth):.1f}% change per period",
                         f"Overall financial health is {profit_trend_direction}"
                     ],
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating trend analysis: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating trend analysis: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # Risk Assessment Dashboard
@@ -4314,7 +4543,8 @@ def register_reporting_routes(app):
             JSON with comprehensive risk assessment and mitigation recommendations
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             entity_filter = request.args.get('entity', '')
@@ -4501,9 +4731,9 @@ def register_reporting_routes(app):
                     ]
                 })
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'assessment': {
                     'report_type': 'RiskAssessment',
@@ -4562,19 +4792,17 @@ def register_reporting_routes(app):
                         'transaction_count': transaction_count,
                         'active_months': active_months
                     },
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating risk assessment: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating risk assessment: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # Working Capital Analysis
@@ -4595,7 +4823,8 @@ def register_reporting_routes(app):
             JSON with working capital metrics and analysis
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             entity_filter = request.args.get('entity', '')
@@ -4814,9 +5043,9 @@ def register_reporting_routes(app):
                     'recommendation': 'Continue current growth trajectory while maintaining operational efficiency.'
                 })
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'report': {
                     'report_type': 'WorkingCapitalAnalysis',
@@ -4864,19 +5093,17 @@ def register_reporting_routes(app):
                         'asset_efficiency': round((current_assets / current_liabilities * 100) if current_liabilities > 0 else 0, 2)
                     },
                     'insights': insights,
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating working capital analysis: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating working capital analysis: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # ============================================================================
     # Financial Forecast & Projections
@@ -4900,7 +5127,8 @@ def register_reporting_routes(app):
             JSON with historical data and future projections
         """
         try:
-            start_time = datetime.now()
+            now = datetime.now()
+            start_time = time.perf_counter_ns()
 
             # Parse parameters
             forecast_periods = int(request.args.get('forecast_periods', 6))
@@ -5045,9 +5273,9 @@ def register_reporting_routes(app):
             else:
                 forecast_accuracy = 50
 
-            generation_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time_ms = _elapsed_ms(start_time)
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'forecast': {
                     'report_type': 'FinancialForecast',
@@ -5088,19 +5316,17 @@ def register_reporting_routes(app):
                         f"Forecast confidence: {avg_confidence:.1f}%",
                         f"Accuracy indicator: {forecast_accuracy:.1f}%"
                     ],
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': now,
                     'generation_time_ms': generation_time_ms
                 }
             })
 
         except Exception as e:
-            logger.error(f"Error generating financial forecast: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating financial forecast: {e}")
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/dre-pdf', methods=['GET'])
     def api_generate_dre_pdf():
@@ -5127,21 +5353,22 @@ def register_reporting_routes(app):
             if not start_date_str:
                 start_date = date(datetime.now().year, 1, 1)
             else:
-                start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+                start_date = _parse_iso_date(start_date_str, 'start_date')
 
             if not end_date_str:
                 end_date = date.today()
             else:
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+                end_date = _parse_iso_date(end_date_str, 'end_date')
 
             # Validate dates
             if start_date > end_date:
-                return jsonify({
+                return _json_response({
                     'success': False,
                     'error': 'Start date cannot be after end date'
-                }), 400
+                }, 400)
 
             # Create DRE report
+            from .pdf_reports import DREReport
             dre_report = DREReport(
                 company_name=company_name,
                 start_date=start_date,
@@ -5152,29 +5379,21 @@ def register_reporting_routes(app):
             # Generate PDF
             pdf_content = dre_report.generate_dre_report()
 
-            # Create response
-            pdf_buffer = io.BytesIO(pdf_content)
-            pdf_buffer.seek(0)
-
             # Generate filename
             entity_suffix = f"_{entity_filter}" if entity_filter else ""
             filename = f"DRE_{company_name.replace(' ', '_')}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}{entity_suffix}.pdf"
 
-            return send_file(
-                pdf_buffer,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/pdf'
-            )
+            return _pdf_response(pdf_content, filename)
+
+        except BadRequest:
+            raise
 
         except Exception as e:
-            logger.error(f"Error generating DRE PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating DRE PDF: {e}")
+            return _json_response({
                 'success': False,
                 'error': f'Error generating DRE PDF: {str(e)}'
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/balance-sheet-pdf', methods=['GET'])
     def api_generate_balance_sheet_pdf():
@@ -5199,9 +5418,10 @@ def register_reporting_routes(app):
             if not end_date_str:
                 end_date = date.today()
             else:
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+                end_date = _parse_iso_date(end_date_str, 'end_date')
 
             # Create Balance Sheet report
+            from .pdf_reports import BalanceSheetReport
             balance_sheet_report = BalanceSheetReport(
                 company_name=company_name,
                 end_date=end_date,
@@ -5211,26 +5431,20 @@ def register_reporting_routes(app):
             # Generate PDF
             pdf_content = balance_sheet_report.generate_balance_sheet_report()
 
-            # Create response
-            pdf_buffer = io.BytesIO(pdf_content)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"BalancoPatrimonial_{company_name.replace(' ', '_')}_{timestamp}.pdf"
 
-            return send_file(
-                pdf_buffer,
-                as_attachment=True,
-                download_name=filename,
-                mimetype='application/pdf'
-            )
+            return _pdf_response(pdf_content, filename)
+
+        except BadRequest:
+            raise
 
         except Exception as e:
-            logger.error(f"Error generating Balance Sheet PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating Balance Sheet PDF: {e}")
+            return _json_response({
                 'success': False,
                 'error': f'Error generating Balance Sheet PDF: {str(e)}'
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/cash-flow-pdf', methods=['GET'])
     def api_generate_cash_flow_pdf():
@@ -5258,24 +5472,17 @@ def register_reporting_routes(app):
             end_date = None
 
             if start_date_str:
-                try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        start_date = datetime.strptime(start_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        return jsonify({'error': 'Invalid start_date format. Use YYYY-MM-DD or MM/DD/YYYY'}), 400
+                start_date = _parse_date(start_date_str)
+                if start_date is None:
+                    return _json_response({'error': 'Invalid start_date format. Use YYYY-MM-DD or MM/DD/YYYY'}, 400)
 
             if end_date_str:
-                try:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        end_date = datetime.strptime(end_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD or MM/DD/YYYY'}), 400
+                end_date = _parse_date(end_date_str)
+                if end_date is None:
+                    return _json_response({'error': 'Invalid end_date format. Use YYYY-MM-DD or MM/DD/YYYY'}, 400)
 
             # Create Cash Flow report
+            from .cash_flow_report_new import CashFlowReport
             cash_flow_report = CashFlowReport(
                 company_name=company_name,
                 start_date=start_date,
@@ -5299,21 +5506,14 @@ def register_reporting_routes(app):
             filename = f"demonstracao_fluxo_caixa{period_str}.pdf"
 
             # Return PDF as download
-            response = make_response(pdf_content)
-            response.headers['Content-Type'] = 'application/pdf'
-            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-            response.headers['Content-Length'] = len(pdf_content)
-
-            return response
+            return _pdf_response(pdf_content, filename)
 
         except Exception as e:
-            logger.error(f"Error generating Cash Flow PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating Cash Flow PDF: {e}")
+            return _json_response({
                 'success': False,
                 'error': f'Error generating Cash Flow PDF: {str(e)}'
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/dmpl-pdf', methods=['GET'])
     def api_generate_dmpl_pdf():
@@ -5341,24 +5541,17 @@ def register_reporting_routes(app):
             end_date = None
 
             if start_date_str:
-                try:
-                    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        start_date = datetime.strptime(start_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        return jsonify({'error': 'Invalid start_date format. Use YYYY-MM-DD or MM/DD/YYYY'}), 400
+                start_date = _parse_date(start_date_str)
+                if start_date is None:
+                    return _json_response({'error': 'Invalid start_date format. Use YYYY-MM-DD or MM/DD/YYYY'}, 400)
 
             if end_date_str:
-                try:
-                    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        end_date = datetime.strptime(end_date_str, '%m/%d/%Y').date()
-                    except ValueError:
-                        return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD or MM/DD/YYYY'}), 400
+                end_date = _parse_date(end_date_str)
+                if end_date is None:
+                    return _json_response({'error': 'Invalid end_date format. Use YYYY-MM-DD or MM/DD/YYYY'}, 400)
 
             # Create DMPL report
+            from .dmpl_report_new import DMPLReport
             dmpl_report = DMPLReport(
                 company_name=company_name,
                 start_date=start_date,
@@ -5382,21 +5575,14 @@ def register_reporting_routes(app):
             filename = f"dmpl_patrimonio_liquido{period_str}.pdf"
 
             # Return PDF as download
-            response = make_response(pdf_content)
-            response.headers['Content-Type'] = 'application/pdf'
-            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-            response.headers['Content-Length'] = len(pdf_content)
-
-            return response
+            return _pdf_response(pdf_content, filename)
 
         except Exception as e:
-            logger.error(f"Error generating DMPL PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception(f"Error generating DMPL PDF: {e}")
+            return _json_response({
                 'success': False,
                 'error': f'Error generating DMPL PDF: {str(e)}'
-            }), 500
+            }, 500)
 
     @app.route('/api/reports/pdf-reports-list', methods=['GET'])
     def api_pdf_reports_list():
@@ -5460,7 +5646,7 @@ def register_reporting_routes(app):
                 }
             ]
 
-            return jsonify({
+            return _json_response({
                 'success': True,
                 'data': {
                     'reports': reports,
@@ -5470,10 +5656,10 @@ def register_reporting_routes(app):
 
         except Exception as e:
             logger.error(f"Error getting PDF reports list: {e}")
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': str(e)
-            }), 500
+            }, 500)
 
     # Ensure templates table exists
     ensure_report_templates_table()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Statement PDF rendering for the reporting API
+
+ReportLab layout for the simplified income statement and balance sheet
+exports. Kept apart from reporting_api, and free of any database import, so
+the PDF worker processes only load what rendering needs.
+"""
+
+import io
+import functools
+from collections import namedtuple
+from datetime import datetime
+from types import SimpleNamespace
+
+
+@functools.lru_cache(maxsize=None)
+def _reportlab():
+    """
+    reportlab names used by the statement PDFs, imported on first use
+
+    reportlab is only needed for PDF exports, so workers that never render
+    one don't pay for importing it.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+    from reportlab.lib.colors import HexColor
+
+    return SimpleNamespace(
+        A4=A4, getSampleStyleSheet=getSampleStyleSheet, ParagraphStyle=ParagraphStyle, inch=inch,
+        SimpleDocTemplate=SimpleDocTemplate, Paragraph=Paragraph, Spacer=Spacer, Table=Table,
+        TableStyle=TableStyle, colors=colors, HexColor=HexColor
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _hex_color(hex_code):
+    """reportlab Color for a '#rrggbb' string, parsed once and shared by every style using it"""
+    return _reportlab().HexColor(hex_code)
+
+
+@functools.lru_cache(maxsize=None)
+def _pdf_styles():
+    """
+    Stylesheet shared by the statement PDFs
+
+    Built on first use and then reused for every export in this process.
+
+    Returns:
+        (styles, title_style, subtitle_style, section_style, footer_style)
+    """
+    rl = _reportlab()
+    styles = rl.getSampleStyleSheet()
+    title_style = rl.ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=_hex_color('#2563eb'),
+        spaceAfter=30,
+        alignment=1  # Center alignment
+    )
+
+    subtitle_style = rl.ParagraphStyle(
+        'CustomSubtitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=_hex_color('#374151'),
+        spaceAfter=20,
+        alignment=1
+    )
+
+    section_style = rl.ParagraphStyle(
+        'SectionHeader',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=_hex_color('#1f2937'),
+        spaceAfter=10,
+        spaceBefore=15
+    )
+
+    footer_style = rl.ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=_hex_color('#6b7280'),
+        alignment=1
+    )
+
+    return styles, title_style, subtitle_style, section_style, footer_style
+
+
+@functools.lru_cache(maxsize=None)
+def _pdf_table_styles():
+    """
+    Table styles for the summary metrics and net-income tables
+
+    Built on first use, like _pdf_styles(), and shared by every table of that
+    kind in this process. Category sections are drawn by _section_rows_class().
+    """
+    rl = _reportlab()
+    return {
+        'metrics': rl.TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), _hex_color('#f3f4f6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), _hex_color('#1f2937')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, _hex_color('#e5e7eb'))
+        ]),
+        'result': rl.TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BACKGROUND', (0, -2), (-1, -1), _hex_color('#eff6ff')),
+            ('TEXTCOLOR', (0, -2), (-1, -1), _hex_color('#1e40af')),
+            ('LINEABOVE', (0, -2), (-1, -2), 2, _hex_color('#3b82f6')),
+            ('GRID', (0, 0), (-1, -3), 0.5, _hex_color('#e5e7eb'))
+        ])
+    }
+
+
+# Currency / percent cell formatters for the statement PDFs
+_money = "${:,.2f}".format
+_pct = "{:.1f}%".format
+
+
+# Colors of a category section table: header row, total row, and the
+# accent line / grid between them
+_PdfTheme = namedtuple('_PdfTheme', 'header_bg header_fg total_bg accent_line grid_color')
+
+REVENUE_THEME = _PdfTheme('#dcfce7', '#166534', '#f0fdf4', '#16a34a', '#bbf7d0')
+EXPENSES_THEME = _PdfTheme('#fee2e2', '#991b1b', '#fef2f2', '#dc2626', '#fecaca')
+ASSETS_THEME = _PdfTheme('#dbeafe', '#1e40af', '#f0f9ff', '#3b82f6', '#bfdbfe')
+LIABILITIES_THEME = _PdfTheme('#fef3c7', '#92400e', '#fffbeb', '#d97706', '#fde68a')
+EQUITY_THEME = _PdfTheme('#d1fae5', '#065f46', '#ecfdf5', '#10b981', '#a7f3d0')
+
+
+@functools.lru_cache(maxsize=None)
+def _section_rows_class():
+    """
+    Flowable drawing a category section's rows straight onto the canvas
+
+    Sections have two fixed-width columns and one-line rows, so the rows are
+    drawn in a single pass instead of going through Table's layout. Rows that
+    don't fit are split onto the next page with the header row repeated.
+    Defined on first use because reportlab is imported lazily.
+    """
+    from reportlab.platypus import Flowable
+
+    class SectionRows(Flowable):
+        row_height = 18
+        padding = 6
+        font_size = 9
+
+        def __init__(self, rows, col_widths, theme, has_total=True):
+            super().__init__()
+            self.rows = rows  # header row first, total row last when has_total
+            self.col_widths = col_widths
+            self.theme = theme
+            self.has_total = has_total
+            self.hAlign = 'CENTER'  # same placement as a default Table
+
+        def wrap(self, avail_width, avail_height):
+            self.width = sum(self.col_widths)
+            self.height = len(self.rows) * self.row_height
+            return self.width, self.height
+
+        def split(self, avail_width, avail_height):
+            fit = int(avail_height // self.row_height)
+            if fit < 2 or fit >= len(self.rows):
+                return []
+            return [
+                SectionRows(self.rows[:fit], self.col_widths, self.theme, has_total=False),
+                SectionRows(self.rows[:1] + self.rows[fit:], self.col_widths, self.theme, self.has_total),
+            ]
+
+        def draw(self):
+            canvas = self.canv
+            theme = self.theme
+            row_height = self.row_height
+            width = sum(self.col_widths)
+            last = len(self.rows) - 1
+            text_offset = (row_height - self.font_size) / 2 + 2
+
+            for i, (label, value) in enumerate(self.rows):
+                y = self.height - (i + 1) * row_height
+                is_header = i == 0
+                is_total = self.has_total and i == last
+                if is_header or is_total:
+                    canvas.setFillColor(_hex_color(theme.header_bg if is_header else theme.total_bg))
+                    canvas.rect(0, y, width, row_height, stroke=0, fill=1)
+                canvas.setFillColor(_hex_color(theme.header_fg) if is_header else _reportlab().colors.black)
+                canvas.setFont('Helvetica-Bold' if is_header or is_total else 'Helvetica', self.font_size)
+                canvas.drawString(self.padding, y + text_offset, str(label))
+                canvas.drawRightString(width - self.padding, y + text_offset, str(value))
+
+            # Grid over every row but the total, then the accent line above the total
+            grid_rows = last if self.has_total else last + 1
+            bottom = self.height - grid_rows * row_height
+            canvas.setStrokeColor(_hex_color(theme.grid_color))
+            canvas.setLineWidth(0.5)
+            for k in range(grid_rows + 1):
+                y = self.height - k * row_height
+                canvas.line(0, y, width, y)
+            x = 0
+            for col_width in (0, *self.col_widths):
+                x += col_width
+                canvas.line(x, bottom, x, self.height)
+            if self.has_total:
+                canvas.setStrokeColor(_hex_color(theme.accent_line))
+                canvas.setLineWidth(2)
+                canvas.line(0, row_height, width, row_height)
+
+    return SectionRows
+
+
+def _section_table(section_title, categories, total_label, total_value, theme, section_style, space_after=15):
+    """
+    Flowables for one statement section: heading, category/amount rows and a total row
+
+    Returns:
+        [Paragraph, SectionRows, Spacer] to extend the PDF content with
+    """
+    rl = _reportlab()
+    rows = [['Categoria', 'Valor']]
+    rows.extend([
+        [category.get('category', 'N/A'), _money(category.get('amount') or 0)]
+        for category in categories
+    ])
+    rows.append([total_label, _money(total_value or 0)])
+
+    section_rows = _section_rows_class()(rows, [3.5*rl.inch, 1.5*rl.inch], theme)
+
+    return [rl.Paragraph(section_title, section_style), section_rows, rl.Spacer(1, space_after)]
+
+
+def _pdf_header(statement_name, styles, title_style, subtitle_style):
+    """Title, statement name and generation timestamp flowables"""
+    rl = _reportlab()
+    generated_at = datetime.now().strftime('%d/%m/%Y às %H:%M')
+    return [
+        rl.Paragraph("Delta CFO Agent", title_style),
+        rl.Paragraph(statement_name, subtitle_style),
+        rl.Paragraph(f"Gerado em: {generated_at}", styles['Normal']),
+        rl.Spacer(1, 20),
+    ]
+
+
+def _summary_table(section_title, rows, col_widths, table_style, section_style):
+    """Heading, fixed-size summary table (metrics or net income) and spacer flowables"""
+    rl = _reportlab()
+    table = rl.Table(rows, colWidths=col_widths)
+    table.setStyle(table_style)
+    return [rl.Paragraph(section_title, section_style), table, rl.Spacer(1, 20)]
+
+
+def _pdf_footer(generation_time, footer_style):
+    """Closing attribution paragraph"""
+    return _reportlab().Paragraph(
+        f"Relatório gerado automaticamente pela Delta CFO Agent em {generation_time}ms | "
+        f"Delta's proprietary self improving AI CFO Agent",
+        footer_style
+    )
+
+
+def generate_income_statement_pdf(statement_data):
+    """Generate a professional PDF for income statement (returns the PDF bytes)"""
+    rl = _reportlab()
+
+    # Create a buffer to hold the PDF data
+    buffer = io.BytesIO()
+
+    # Create the PDF document
+    doc = rl.SimpleDocTemplate(
+        buffer,
+        pagesize=rl.A4,
+        rightMargin=0.75*rl.inch,
+        leftMargin=0.75*rl.inch,
+        topMargin=1*rl.inch,
+        bottomMargin=0.75*rl.inch
+    )
+
+    # Define styles
+    styles, title_style, subtitle_style, section_style, footer_style = _pdf_styles()
+    table_styles = _pdf_table_styles()
+
+    # Header and generation info
+    content = _pdf_header(
+        statement_data.get('statement_name', 'Demonstração de Resultado'),
+        styles, title_style, subtitle_style
+    )
+
+    # Summary metrics (if available)
+    metrics = statement_data.get('summary_metrics')
+    if metrics:
+        content.extend(_summary_table("📊 Resumo Executivo", [
+            ['Métrica', 'Valor'],
+            ['Receita Total', _money(metrics.get('total_revenue') or 0)],
+            ['Lucro Operacional', _money(metrics.get('operating_income') or 0)],
+            ['Lucro Líquido', _money(metrics.get('net_income') or 0)],
+            ['Margem Líquida', _pct(metrics.get('net_margin_percent') or 0)],
+            ['Total de Transações', f"{metrics.get('transaction_count', 0):,}"]
+        ], [3*rl.inch, 2*rl.inch], table_styles['metrics'], section_style))
+
+    # Revenue section
+    revenue = statement_data.get('revenue')
+    if revenue:
+        content.extend(_section_table(
+            "💰 RECEITAS", revenue.get('categories', []),
+            'TOTAL DE RECEITAS', revenue.get('total', 0),
+            REVENUE_THEME, section_style
+        ))
+
+    # Operating expenses section
+    expenses = statement_data.get('operating_expenses')
+    if expenses:
+        content.extend(_section_table(
+            "💸 DESPESAS OPERACIONAIS", expenses.get('categories', []),
+            'TOTAL DE DESPESAS OPERACIONAIS', expenses.get('total', 0),
+            EXPENSES_THEME, section_style
+        ))
+
+    # Net income section
+    net_income = statement_data.get('net_income')
+    if net_income:
+        content.extend(_summary_table("📈 RESULTADO LÍQUIDO", [
+            ['Lucro Operacional', _money(statement_data.get('operating_income', {}).get('amount') or 0)],
+            ['Outras Receitas/Despesas', _money(statement_data.get('other_income_expenses', {}).get('total') or 0)],
+            ['LUCRO LÍQUIDO', _money(net_income.get('amount') or 0)],
+            ['Margem Líquida', _pct(net_income.get('margin_percent') or 0)]
+        ], [3.5*rl.inch, 1.5*rl.inch], table_styles['result'], section_style))
+
+    # Footer
+    content.append(_pdf_footer(statement_data.get('generation_time_ms', 0), footer_style))
+
+    # Build PDF - return the raw bytes so the result pickles cheaply out of the worker pool
+    doc.build(content)
+    return buffer.getvalue()
+
+
+def generate_balance_sheet_pdf(statement_data):
+    """Generate a professional PDF for balance sheet (returns the PDF bytes)"""
+    rl = _reportlab()
+
+    # Create a buffer to hold the PDF data
+    buffer = io.BytesIO()
+
+    # Create the PDF document
+    doc = rl.SimpleDocTemplate(
+        buffer,
+        pagesize=rl.A4,
+        rightMargin=0.75*rl.inch,
+        leftMargin=0.75*rl.inch,
+        topMargin=1*rl.inch,
+        bottomMargin=0.75*rl.inch
+    )
+
+    # Define styles
+    styles, title_style, subtitle_style, section_style, footer_style = _pdf_styles()
+    table_styles = _pdf_table_styles()
+
+    # Header and generation info
+    content = _pdf_header(
+        statement_data.get('statement_name', 'Balanço Patrimonial'),
+        styles, title_style, subtitle_style
+    )
+
+    # Summary metrics (if available)
+    metrics = statement_data.get('summary_metrics')
+    if metrics:
+        content.extend(_summary_table("📊 Resumo Executivo", [
+            ['Métrica', 'Valor'],
+            ['Total de Ativos', _money(metrics.get('total_assets') or 0)],
+            ['Total de Passivos', _money(metrics.get('total_liabilities') or 0)],
+            ['Patrimônio Líquido', _money(metrics.get('total_equity') or 0)],
+            ['Índice de Endividamento', f"{metrics.get('debt_to_equity_ratio', 0):.2f}"],
+            ['Balanceamento', '✓' if metrics.get('balance_check', False) else '✗']
+        ], [3*rl.inch, 2*rl.inch], table_styles['metrics'], section_style))
+
+    # Assets section (current assets)
+    assets = statement_data.get('assets')
+    if assets:
+        content.extend(_section_table(
+            "🏛️ ATIVOS", assets.get('current_assets', {}).get('categories', []),
+            'TOTAL DE ATIVOS', assets.get('total', 0),
+            ASSETS_THEME, section_style
+        ))
+
+    # Liabilities section (current liabilities)
+    liabilities = statement_data.get('liabilities')
+    if liabilities:
+        content.extend(_section_table(
+            "📋 PASSIVOS", liabilities.get('current_liabilities', {}).get('categories', []),
+            'TOTAL DE PASSIVOS', liabilities.get('total', 0),
+            LIABILITIES_THEME, section_style
+        ))
+
+    # Equity section
+    equity = statement_data.get('equity')
+    if equity:
+        content.extend(_section_table(
+            "💎 PATRIMÔNIO LÍQUIDO", equity.get('categories', []),
+            'TOTAL DO PATRIMÔNIO LÍQUIDO', equity.get('total', 0),
+            EQUITY_THEME, section_style, space_after=20
+        ))
+
+    # Footer
+    content.append(_pdf_footer(statement_data.get('generation_time_ms', 0), footer_style))
+
+    # Build PDF - return the raw bytes so the result pickles cheaply out of the worker pool
+    doc.build(content)
+    return buffer.getvalue()